@@ -0,0 +1,58 @@
+# cython: language_level=3, boundscheck=False, wraparound=False, cdivision=True
+"""
+Cython kernel for gradient interpolation.
+
+Lightweight alternative to the Numba kernel for small boards (Pi Zero W)
+where LLVM is too heavy to install. Optional: app.gradient falls back to
+Numba/NumPy when this extension is not built.
+
+Build in place with:
+    make build-ext
+"""
+
+
+cdef inline void _interpolate(
+    const double[:] positions,
+    const double[:, :] rgb,
+    const double[:] t,
+    unsigned char[:, :] out,
+) noexcept nogil:
+    cdef Py_ssize_t last = positions.shape[0] - 1
+    cdef Py_ssize_t i, j, c, left, right
+    cdef double ti, span, factor, value
+
+    for i in range(t.shape[0]):
+        ti = t[i]
+
+        # Find surrounding stops (fallback: first and last)
+        left = 0
+        right = last
+        for j in range(last):
+            if positions[j] <= ti <= positions[j + 1]:
+                left = j
+                right = j + 1
+                break
+
+        span = positions[right] - positions[left]
+        factor = 0.0 if span == 0.0 else (ti - positions[left]) / span
+
+        # Linear interpolate, clamp and cast
+        for c in range(3):
+            value = rgb[left, c] + (rgb[right, c] - rgb[left, c]) * factor
+            if value <= 0.0:
+                out[i, c] = 0
+            elif value >= 255.0:
+                out[i, c] = 255
+            else:
+                out[i, c] = <unsigned char>value
+
+
+def interpolate_stops(
+    const double[:] positions,
+    const double[:, :] rgb,
+    const double[:] t,
+    unsigned char[:, :] out,
+):
+    """Interpolate stop colors at positions t into out (N, 3) uint8."""
+    with nogil:
+        _interpolate(positions, rgb, t, out)
@@ -4,13 +4,13 @@ High-level lighting animations.
 All animations:
 - Are blocking
 - Must run in a background thread
-- Are protected by anim_lock
+- Hold anim_active for their whole run (one animation at a time)
+- Hold anim_lock only while writing a frame (released during sleep)
 - Support cancellation via threading.Event
 """
 
-import time
 import threading
-from app.lighting_math import smoothstep, lerp, SmoothNoise
+from app.lighting_math import cloudy_frame, FrameClock
 from app.season_profiles import SEASONS
 from app.config import ANIMATION_FPS
 from app.logger import logger
@@ -22,39 +22,40 @@ def cloudy_sunrise(leds, duration: int, season: str, cancel_event: threading.Eve
     logger.info(f"Starting cloudy_sunrise: duration={duration}s, season={season}")
 
     profile = SEASONS[season]["sunrise"]
-    max_v = SEASONS[season]["max_v"]
-    noise = SmoothNoise(SEASONS[season]["cloud_intensity"])
-
-    with leds.anim_lock:
+    max_v = float(SEASONS[season]["max_v"])
+    intensity = float(SEASONS[season]["cloud_intensity"])
+    h0, h1 = float(profile["h_start"]), float(profile["h_end"])
+    s0, s1 = float(profile["s_start"]), float(profile["s_end"])
+    phase = 0.0
+
+    # Loop-invariant locals (avoid per-frame division and attribute lookups)
+    dt = 1.0 / FPS
+    is_cancelled = cancel_event.is_set
+    set_hsv = leds.set_hsv
+    anim_lock = leds.anim_lock
+
+    with leds.anim_active:
         steps = duration * FPS
+        inv_steps = 1.0 / steps
+        clock = FrameClock(FPS)
         for i in range(steps + 1):
             # Check for cancellation
-            if cancel_event.is_set():
+            if is_cancelled():
                 logger.info("Animation cancelled: cloudy_sunrise")
                 return
 
-            t = smoothstep(i / steps)
-
-            h = lerp(profile["h_start"], profile["h_end"], t)
-            s = lerp(profile["s_start"], profile["s_end"], t)
-
-            base_v = lerp(0.01, max_v, t)
-
-            # Disable clouds when very dark (human eye is sensitive here)
-            if base_v < 0.15:
-                v = base_v
-            else:
-                v = base_v + noise.step(1 / FPS)
-
-            v = max(0.01, min(max_v, v))
+            h, s, v, phase = cloudy_frame(
+                i * inv_steps, h0, h1, s0, s1, 0.01, max_v, max_v, phase, dt, intensity
+            )
 
             try:
-                leds.set_hsv(h, s, v)
+                with anim_lock:
+                    set_hsv(h, s, v)
             except Exception as e:
                 logger.error("Error setting LED color", exc_info=True)
                 raise
 
-            time.sleep(1 / FPS)
+            clock.sleep()
 
     logger.info("Animation completed: cloudy_sunrise")
 
@@ -63,38 +64,40 @@ def cloudy_sunset(leds, duration: int, season: str, cancel_event: threading.Even
     logger.info(f"Starting cloudy_sunset: duration={duration}s, season={season}")
 
     profile = SEASONS[season]["sunset"]
-    max_v = SEASONS[season]["max_v"]
-    noise = SmoothNoise(SEASONS[season]["cloud_intensity"])
-
-    with leds.anim_lock:
+    max_v = float(SEASONS[season]["max_v"])
+    intensity = float(SEASONS[season]["cloud_intensity"])
+    h0, h1 = float(profile["h_start"]), float(profile["h_end"])
+    s0, s1 = float(profile["s_start"]), float(profile["s_end"])
+    phase = 0.0
+
+    # Loop-invariant locals (avoid per-frame division and attribute lookups)
+    dt = 1.0 / FPS
+    is_cancelled = cancel_event.is_set
+    set_hsv = leds.set_hsv
+    anim_lock = leds.anim_lock
+
+    with leds.anim_active:
         steps = duration * FPS
+        inv_steps = 1.0 / steps
+        clock = FrameClock(FPS)
         for i in range(steps + 1):
             # Check for cancellation
-            if cancel_event.is_set():
+            if is_cancelled():
                 logger.info("Animation cancelled: cloudy_sunset")
                 return
 
-            t = smoothstep(i / steps)
-
-            h = lerp(profile["h_start"], profile["h_end"], t)
-            s = lerp(profile["s_start"], profile["s_end"], t)
-
-            base_v = lerp(max_v, 0.01, t)
-
-            if base_v < 0.15:
-                v = base_v
-            else:
-                v = base_v + noise.step(1 / FPS)
-
-            v = max(0.01, min(max_v, v))
+            h, s, v, phase = cloudy_frame(
+                i * inv_steps, h0, h1, s0, s1, max_v, 0.01, max_v, phase, dt, intensity
+            )
 
             try:
-                leds.set_hsv(h, s, v)
+                with anim_lock:
+                    set_hsv(h, s, v)
             except Exception as e:
                 logger.error("Error setting LED color", exc_info=True)
                 raise
 
-            time.sleep(1 / FPS)
+            clock.sleep()
 
     logger.info("Animation completed: cloudy_sunset")
 
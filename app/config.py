@@ -6,23 +6,141 @@ Automatically loads .env file if present.
 """
 
 import os
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Literal
 from dotenv import load_dotenv
 
 # Load .env file from project root (one level up from app/)
 env_path = Path(__file__).parent.parent / ".env"
-load_dotenv(dotenv_path=env_path)
 
-# Logging configuration
-LOG_LEVEL: Literal["DEBUG", "INFO", "WARNING", "ERROR"] = os.getenv("LOG_LEVEL", "INFO")
 
-# Mock hardware mode (for testing without physical devices)
-MOCK_MODE: bool = os.getenv("MOCK_MODE", "false").lower() == "true"
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() == "true"
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Environment-derived settings, parsed once at startup.
+
+    Invalid numeric values raise ValueError when the config is built,
+    so typos fail at import instead of on first use.
+    """
+
+    # Logging configuration
+    log_level: Literal["DEBUG", "INFO", "WARNING", "ERROR"]
+
+    # Mock hardware mode (for testing without physical devices)
+    mock_mode: bool
+
+    # LED hardware configuration
+    led_count: int
+    led_pin: int
+
+    # MQTT configuration
+    mqtt_enabled: bool
+    mqtt_broker: str
+    mqtt_port: int
+    mqtt_username: str | None
+    mqtt_password: str | None
+    mqtt_client_id: str
+
+    # Gradient configuration
+    gradient_presets_file: str
+
+    # Temperature sensor configuration (DS18B20)
+    temp_enabled: bool
+    temp_sensor_ids: str  # Comma-separated list, empty = auto-detect
+    temp_update_interval: int  # seconds
+    temp_publish_epsilon: float  # degrees C change needed to republish
+    temp_unit: Literal["celsius", "fahrenheit"]
+    temp_w1_base_dir: str
+
+    # Relay configuration
+    relay_enabled: bool
+    relay_config: str
+    relay_publish_state: bool
+    relay_watchdog_enabled: bool
+    relay_watchdog_interval: int
+
+    # Water level sensor configuration
+    water_level_enabled: bool
+    water_level_pin: int
+    water_level_active_high: bool
+    water_level_debounce_time: float
+
+    # Pump automation configuration
+    pump_automation_enabled: bool
+    pump_relay_id: str
+    pump_on_interval: int
+    pump_off_interval: int
+    pump_max_runtime: int
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        """Build config from environment variables (with defaults)."""
+        return cls(
+            log_level=os.getenv("LOG_LEVEL", "INFO"),
+            mock_mode=_env_bool("MOCK_MODE", "false"),
+            led_count=int(os.getenv("LED_COUNT", "30")),
+            led_pin=int(os.getenv("LED_PIN", "18")),
+            mqtt_enabled=_env_bool("MQTT_ENABLED", "false"),
+            mqtt_broker=os.getenv("MQTT_BROKER", "localhost"),
+            mqtt_port=int(os.getenv("MQTT_PORT", "1883")),
+            mqtt_username=os.getenv("MQTT_USERNAME"),
+            mqtt_password=os.getenv("MQTT_PASSWORD"),
+            mqtt_client_id=os.getenv("MQTT_CLIENT_ID", "led_strip"),
+            gradient_presets_file=os.getenv(
+                "GRADIENT_PRESETS_FILE",
+                "/home/deploy/hydrosense/data/gradient_presets.json"  # Updated for user's home
+            ),
+            temp_enabled=_env_bool("TEMP_ENABLED", "true"),
+            temp_sensor_ids=os.getenv("TEMP_SENSOR_IDS", ""),
+            temp_update_interval=int(os.getenv("TEMP_UPDATE_INTERVAL", "60")),
+            temp_publish_epsilon=float(os.getenv("TEMP_PUBLISH_EPSILON", "0.1")),
+            temp_unit=os.getenv("TEMP_UNIT", "celsius"),
+            temp_w1_base_dir=os.getenv("TEMP_W1_BASE_DIR", "/sys/bus/w1/devices/"),
+            # Relay configuration format: "id:name:pin:active_low:default_state:max_on_time,..."
+            # Example: "pump:Aquarium Pump:17:true:OFF:60,heater:Heater:27:true:OFF:0"
+            relay_enabled=_env_bool("RELAY_ENABLED", "false"),
+            relay_config=os.getenv("RELAY_CONFIG", ""),
+            relay_publish_state=_env_bool("RELAY_PUBLISH_STATE", "true"),
+            relay_watchdog_enabled=_env_bool("RELAY_WATCHDOG_ENABLED", "true"),
+            relay_watchdog_interval=int(os.getenv("RELAY_WATCHDOG_INTERVAL", "30")),
+            water_level_enabled=_env_bool("WATER_LEVEL_ENABLED", "false"),
+            water_level_pin=int(os.getenv("WATER_LEVEL_PIN", "23")),  # GPIO 23 for float switch
+            water_level_active_high=_env_bool("WATER_LEVEL_ACTIVE_HIGH", "true"),
+            water_level_debounce_time=float(os.getenv("WATER_LEVEL_DEBOUNCE_TIME", "0.5")),  # 500ms debounce
+            pump_automation_enabled=_env_bool("PUMP_AUTOMATION_ENABLED", "false"),
+            pump_relay_id=os.getenv("PUMP_RELAY_ID", "pump"),  # Which relay controls the pump
+            pump_on_interval=int(os.getenv("PUMP_ON_INTERVAL", "30")),  # Pump ON time in seconds
+            pump_off_interval=int(os.getenv("PUMP_OFF_INTERVAL", "30")),  # Pump OFF time in seconds
+            pump_max_runtime=int(os.getenv("PUMP_MAX_RUNTIME", "300")),  # Max continuous runtime (5 min)
+        )
+
+    def relay_configs(self) -> list:
+        """Parsed RELAY_CONFIG (see parse_relay_config), computed once per value."""
+        return list(_parse_relay_config(self.relay_config))
+
+
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load .env and build the Config (once per process)."""
+    load_dotenv(dotenv_path=env_path)
+    return Config.from_env()
+
+
+CONFIG = get_config()
+
+# Module-level names kept for existing `from app.config import X` callers
+LOG_LEVEL = CONFIG.log_level
+MOCK_MODE = CONFIG.mock_mode
 
 # LED hardware configuration
-LED_COUNT: int = int(os.getenv("LED_COUNT", "30"))
-LED_PIN: int = int(os.getenv("LED_PIN", "18"))
+LED_COUNT = CONFIG.led_count
+LED_PIN = CONFIG.led_pin
 LED_FREQ_HZ: int = 800000
 LED_DMA: int = 10
 LED_CHANNEL: int = 0
@@ -32,47 +150,43 @@ LED_GAMMA: float = 2.2
 ANIMATION_FPS: int = 25
 
 # MQTT configuration
-MQTT_ENABLED: bool = os.getenv("MQTT_ENABLED", "false").lower() == "true"
-MQTT_BROKER: str = os.getenv("MQTT_BROKER", "localhost")
-MQTT_PORT: int = int(os.getenv("MQTT_PORT", "1883"))
-MQTT_USERNAME: str | None = os.getenv("MQTT_USERNAME")
-MQTT_PASSWORD: str | None = os.getenv("MQTT_PASSWORD")
-MQTT_CLIENT_ID: str = os.getenv("MQTT_CLIENT_ID", "led_strip")
+MQTT_ENABLED = CONFIG.mqtt_enabled
+MQTT_BROKER = CONFIG.mqtt_broker
+MQTT_PORT = CONFIG.mqtt_port
+MQTT_USERNAME = CONFIG.mqtt_username
+MQTT_PASSWORD = CONFIG.mqtt_password
+MQTT_CLIENT_ID = CONFIG.mqtt_client_id
 
 # Gradient configuration
-GRADIENT_PRESETS_FILE: str = os.getenv(
-    "GRADIENT_PRESETS_FILE",
-    "/home/deploy/hydrosense/data/gradient_presets.json"  # Updated for user's home
-)
+GRADIENT_PRESETS_FILE = CONFIG.gradient_presets_file
 
 # Temperature sensor configuration (DS18B20)
-TEMP_ENABLED: bool = os.getenv("TEMP_ENABLED", "true").lower() == "true"
-TEMP_SENSOR_IDS: str = os.getenv("TEMP_SENSOR_IDS", "")  # Comma-separated list, empty = auto-detect
-TEMP_UPDATE_INTERVAL: int = int(os.getenv("TEMP_UPDATE_INTERVAL", "60"))  # seconds
-TEMP_UNIT: Literal["celsius", "fahrenheit"] = os.getenv("TEMP_UNIT", "celsius")
-TEMP_W1_BASE_DIR: str = os.getenv("TEMP_W1_BASE_DIR", "/sys/bus/w1/devices/")
+TEMP_ENABLED = CONFIG.temp_enabled
+TEMP_SENSOR_IDS = CONFIG.temp_sensor_ids
+TEMP_UPDATE_INTERVAL = CONFIG.temp_update_interval
+TEMP_PUBLISH_EPSILON = CONFIG.temp_publish_epsilon
+TEMP_UNIT = CONFIG.temp_unit
+TEMP_W1_BASE_DIR = CONFIG.temp_w1_base_dir
 
 # Relay configuration
-RELAY_ENABLED: bool = os.getenv("RELAY_ENABLED", "false").lower() == "true"
-# Relay configuration format: "id:name:pin:active_low:default_state:max_on_time,..."
-# Example: "pump:Aquarium Pump:17:true:OFF:60,heater:Heater:27:true:OFF:0"
-RELAY_CONFIG: str = os.getenv("RELAY_CONFIG", "")
-RELAY_PUBLISH_STATE: bool = os.getenv("RELAY_PUBLISH_STATE", "true").lower() == "true"
-RELAY_WATCHDOG_ENABLED: bool = os.getenv("RELAY_WATCHDOG_ENABLED", "true").lower() == "true"
-RELAY_WATCHDOG_INTERVAL: int = int(os.getenv("RELAY_WATCHDOG_INTERVAL", "30"))
+RELAY_ENABLED = CONFIG.relay_enabled
+RELAY_CONFIG = CONFIG.relay_config
+RELAY_PUBLISH_STATE = CONFIG.relay_publish_state
+RELAY_WATCHDOG_ENABLED = CONFIG.relay_watchdog_enabled
+RELAY_WATCHDOG_INTERVAL = CONFIG.relay_watchdog_interval
 
 # Water level sensor configuration
-WATER_LEVEL_ENABLED: bool = os.getenv("WATER_LEVEL_ENABLED", "false").lower() == "true"
-WATER_LEVEL_PIN: int = int(os.getenv("WATER_LEVEL_PIN", "23"))  # GPIO 23 for float switch
-WATER_LEVEL_ACTIVE_HIGH: bool = os.getenv("WATER_LEVEL_ACTIVE_HIGH", "true").lower() == "true"
-WATER_LEVEL_DEBOUNCE_TIME: float = float(os.getenv("WATER_LEVEL_DEBOUNCE_TIME", "0.5"))  # 500ms debounce
+WATER_LEVEL_ENABLED = CONFIG.water_level_enabled
+WATER_LEVEL_PIN = CONFIG.water_level_pin
+WATER_LEVEL_ACTIVE_HIGH = CONFIG.water_level_active_high
+WATER_LEVEL_DEBOUNCE_TIME = CONFIG.water_level_debounce_time
 
 # Pump automation configuration
-PUMP_AUTOMATION_ENABLED: bool = os.getenv("PUMP_AUTOMATION_ENABLED", "false").lower() == "true"
-PUMP_RELAY_ID: str = os.getenv("PUMP_RELAY_ID", "pump")  # Which relay controls the pump
-PUMP_ON_INTERVAL: int = int(os.getenv("PUMP_ON_INTERVAL", "30"))  # Pump ON time in seconds
-PUMP_OFF_INTERVAL: int = int(os.getenv("PUMP_OFF_INTERVAL", "30"))  # Pump OFF time in seconds
-PUMP_MAX_RUNTIME: int = int(os.getenv("PUMP_MAX_RUNTIME", "300"))  # Max continuous runtime (5 min)
+PUMP_AUTOMATION_ENABLED = CONFIG.pump_automation_enabled
+PUMP_RELAY_ID = CONFIG.pump_relay_id
+PUMP_ON_INTERVAL = CONFIG.pump_on_interval
+PUMP_OFF_INTERVAL = CONFIG.pump_off_interval
+PUMP_MAX_RUNTIME = CONFIG.pump_max_runtime
 
 
 def parse_relay_config():
@@ -84,13 +198,18 @@ def parse_relay_config():
     Returns:
         List of RelayConfig objects
     """
+    return CONFIG.relay_configs()
+
+
+@lru_cache(maxsize=4)
+def _parse_relay_config(relay_config: str) -> tuple:
     from app.relay import RelayConfig, RelayState
 
-    if not RELAY_CONFIG:
-        return []
+    if not relay_config:
+        return ()
 
     configs = []
-    for relay_str in RELAY_CONFIG.split(","):
+    for relay_str in relay_config.split(","):
         parts = relay_str.strip().split(":")
         if len(parts) not in [5, 6]:  # Support both old (5) and new (6) formats
             continue
@@ -112,4 +231,4 @@ def parse_relay_config():
             print(f"Warning: Invalid relay config '{relay_str}': {e}")
             continue
 
-    return configs
+    return tuple(configs)
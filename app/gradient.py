@@ -8,15 +8,30 @@ Supports:
 """
 
 import time
-import colorsys
 import math
 import threading
+from functools import lru_cache
 from typing import Literal
+
+import numpy as np
 from pydantic import BaseModel, Field
 
 from app.config import ANIMATION_FPS
+from app.lighting_math import FrameClock
 from app.logger import logger
 
+try:
+    from app._gradient_c import interpolate_stops as _interpolate_stops_c
+    CYTHON_AVAILABLE = True
+except ImportError:
+    CYTHON_AVAILABLE = False
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 
 # ============================================================================
 # Data Structures
@@ -48,6 +63,217 @@ class GradientConfig(BaseModel):
 # Gradient Rendering
 # ============================================================================
 
+@lru_cache(maxsize=32)
+def _stop_arrays(stops: tuple[ColorStop, ...]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Sort stops by position and stack them into NumPy arrays (cached).
+
+    ColorStop is frozen (hashable), so a tuple of stops is a valid cache key.
+    Animations render the same stops every frame; this keeps the sort and
+    array construction out of the frame loop.
+
+    Returns:
+        (positions, rgb): float64 arrays of shape (K,) and (K, 3), read-only
+    """
+    sorted_stops = sorted(stops, key=lambda s: s.position)
+    positions = np.array([s.position for s in sorted_stops], dtype=np.float64)
+    rgb = np.array([[s.r, s.g, s.b] for s in sorted_stops], dtype=np.float64)
+
+    # Shared between callers - must not be mutated
+    positions.setflags(write=False)
+    rgb.setflags(write=False)
+    return positions, rgb
+
+
+def render_gradient_array(
+    stops: list[ColorStop], pixel_count: int, offset: float = 0.0, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Render gradient to an (N, 3) uint8 array with linear interpolation.
+
+    Vectorized form of render_gradient(); every pixel is interpolated in
+    one pass with NumPy instead of a Python loop per pixel.
+
+    Args:
+        stops: List of ColorStop objects (must be at least 2)
+        pixel_count: Number of pixels to generate
+        offset: Position offset for animation (0.0-1.0, wraps around)
+        out: Optional (pixel_count, 3) uint8 array to render into in place
+            instead of allocating a new frame
+
+    Returns:
+        ndarray of shape (pixel_count, 3), dtype uint8, one RGB row per pixel
+        (out itself when given)
+
+    Algorithm:
+        1. Sort stops by position
+        2. Calculate positions t = (i / (pixel_count - 1) + offset) % 1.0
+        3. Find surrounding stops for every t with np.searchsorted
+        4. Linear interpolate RGB between stops, clamp and cast to uint8
+    """
+    if len(stops) < 2:
+        raise ValueError("At least 2 color stops required")
+
+    if pixel_count <= 0:
+        return np.empty((0, 3), dtype=np.uint8) if out is None else out
+
+    # Sorted stop positions/colors (cached per stop set)
+    positions, rgb = _stop_arrays(tuple(stops))
+
+    # Calculate positions with offset (wraps around)
+    t = _pixel_ramp(pixel_count)
+    # Only wrap if offset is non-zero (for animations)
+    if offset != 0.0 and pixel_count > 1:
+        t = np.mod(t + offset, 1.0)
+
+    return _interpolate_stops(positions, rgb, t, out)
+
+
+def _pixel_ramp(pixel_count: int) -> np.ndarray:
+    """Base gradient position i / (pixel_count - 1) of every pixel (0.0 for a single pixel)."""
+    if pixel_count == 1:
+        return np.zeros(1)
+    return np.arange(pixel_count) / (pixel_count - 1)
+
+
+def _interpolate_stops(
+    positions: np.ndarray, rgb: np.ndarray, t: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    Interpolate stop colors at gradient positions t.
+
+    Uses the Cython extension when it has been built, then the Numba
+    kernel when numba is installed, otherwise the NumPy implementation.
+    All produce identical output.
+
+    Args:
+        positions: Sorted stop positions, shape (K,)
+        rgb: Stop colors matching positions, shape (K, 3)
+        t: Gradient position of every pixel, shape (N,)
+        out: Optional (N, 3) uint8 array to write into instead of a new one
+
+    Returns:
+        ndarray of shape (N, 3), dtype uint8 (out itself when given)
+    """
+    if CYTHON_AVAILABLE or NUMBA_AVAILABLE:
+        if out is None:
+            out = np.empty((len(t), 3), dtype=np.uint8)
+        if CYTHON_AVAILABLE:
+            _interpolate_stops_c(positions, rgb, t, out)
+        else:
+            _interpolate_stops_nb(positions, rgb, t, out)
+        return out
+    return _interpolate_stops_np(positions, rgb, t, out)
+
+
+def _cast_colors(colors: np.ndarray, out: np.ndarray | None) -> np.ndarray:
+    """Cast clamped float colors to uint8, into out when given."""
+    if out is None:
+        return colors.astype(np.uint8)
+    np.copyto(out, colors, casting="unsafe")
+    return out
+
+
+def _interpolate_stops_np(
+    positions: np.ndarray, rgb: np.ndarray, t: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """NumPy implementation of _interpolate_stops()."""
+    if len(positions) == 2:
+        return _interpolate_two_stops_np(positions, rgb, t, out)
+
+    # Find surrounding stops: first pair with left.position <= t <= right.position.
+    # Positions outside the stop range fall back to (first, last) stops.
+    last = len(positions) - 1
+    left = np.clip(np.searchsorted(positions, t, side="left") - 1, 0, last - 1)
+    in_range = (t >= positions[0]) & (t <= positions[last])
+    left = np.where(in_range, left, 0)
+    right = np.where(in_range, left + 1, last)
+
+    # Calculate interpolation factor (0.0 when stops share a position)
+    span = positions[right] - positions[left]
+    factor = np.divide(t - positions[left], span, out=np.zeros_like(t), where=span != 0)
+
+    # Linear interpolate RGB in one scratch buffer, clamp in place, cast once
+    start = rgb[left]
+    colors = rgb[right]
+    colors -= start
+    colors *= factor[:, None]
+    colors += start
+    np.clip(colors, 0, 255, out=colors)
+    return _cast_colors(colors, out)
+
+
+def _interpolate_two_stops_np(
+    positions: np.ndarray, rgb: np.ndarray, t: np.ndarray, out: np.ndarray | None = None
+) -> np.ndarray:
+    """
+    _interpolate_stops_np() for the common two-stop gradient.
+
+    Every pixel (in range or not) uses the only stop pair, so the stop
+    search and per-pixel gathers drop out. Same float operations, same output.
+    """
+    span = positions[1] - positions[0]
+    if span == 0:
+        factor = np.zeros_like(t)
+    else:
+        factor = t - positions[0]
+        factor /= span
+
+    colors = np.multiply.outer(factor, rgb[1] - rgb[0])
+    colors += rgb[0]
+    np.clip(colors, 0, 255, out=colors)
+    return _cast_colors(colors, out)
+
+
+if NUMBA_AVAILABLE:
+    # No fastmath: keeps float rounding identical to the NumPy path
+    @njit(cache=True)
+    def _interpolate_stops_nb(positions, rgb, t, out):
+        """Compiled per-pixel form of _interpolate_stops(), writes into out (N, 3) uint8."""
+        last = positions.shape[0] - 1
+        for i in range(t.shape[0]):
+            ti = t[i]
+
+            # Find surrounding stops (fallback: first and last)
+            left = 0
+            right = last
+            for j in range(last):
+                if positions[j] <= ti <= positions[j + 1]:
+                    left = j
+                    right = j + 1
+                    break
+
+            span = positions[right] - positions[left]
+            factor = 0.0 if span == 0.0 else (ti - positions[left]) / span
+
+            # Linear interpolate, clamp and cast
+            for c in range(3):
+                value = rgb[left, c] + (rgb[right, c] - rgb[left, c]) * factor
+                if value <= 0.0:
+                    out[i, c] = 0
+                elif value >= 255.0:
+                    out[i, c] = 255
+                else:
+                    out[i, c] = int(value)
+
+
+def warm_up() -> None:
+    """
+    Compile (or load from cache) the Numba gradient kernel ahead of time.
+
+    Without this the first gradient request pays the JIT compile. No-op
+    when the Cython extension is built or numba isn't installed. Stop
+    arrays are read-only like those from _stop_arrays(), since Numba
+    compiles a separate signature for read-only arrays.
+    """
+    if NUMBA_AVAILABLE and not CYTHON_AVAILABLE:
+        positions = np.array([0.0, 1.0])
+        rgb = np.zeros((2, 3))
+        positions.setflags(write=False)
+        rgb.setflags(write=False)
+        _interpolate_stops_nb(positions, rgb, np.zeros(1), np.empty((1, 3), dtype=np.uint8))
+
+
 def render_gradient(stops: list[ColorStop], pixel_count: int, offset: float = 0.0) -> list[tuple[int, int, int]]:
     """
     Render gradient to pixel array with linear interpolation.
@@ -60,12 +286,8 @@ def render_gradient(stops: list[ColorStop], pixel_count: int, offset: float = 0.
     Returns:
         List of (r, g, b) tuples, one per pixel
 
-    Algorithm:
-        1. Sort stops by position
-        2. For each pixel i:
-           - Calculate position t = (i / (pixel_count - 1) + offset) % 1.0
-           - Find surrounding stops
-           - Linear interpolate RGB between stops
+    See render_gradient_array() for the algorithm; this wrapper converts
+    the result to plain Python ints (JSON-serializable for state/MQTT).
 
     Example:
         stops = [
@@ -73,58 +295,103 @@ def render_gradient(stops: list[ColorStop], pixel_count: int, offset: float = 0.
             ColorStop(position=1.0, r=0, g=0, b=255)    # Blue
         ]
         colors = render_gradient(stops, 10)
-        # Returns: [(255,0,0), (227,0,28), ..., (0,0,255)]
+        # Returns: [(255,0,0), (226,0,28), ..., (0,0,255)]
+
+    Interpolation is cached, see render_gradient_frame().
     """
-    if len(stops) < 2:
-        raise ValueError("At least 2 color stops required")
+    return list(map(tuple, render_gradient_frame(stops, pixel_count, offset).tolist()))
 
-    if pixel_count <= 0:
-        return []
 
-    # Sort stops by position
-    sorted_stops = sorted(stops, key=lambda s: s.position)
+def render_gradient_frame(stops: list[ColorStop], pixel_count: int, offset: float = 0.0) -> np.ndarray:
+    """
+    Render gradient to a shared, read-only (N, 3) uint8 frame (cached).
 
-    colors = []
+    For static gradients and presets: the frame goes straight to
+    LedStrip.set_pixel_ndarray() with no list of tuples in between, and
+    re-applying the same stops doesn't interpolate again. The cache key is
+    the stop values themselves, so saving or deleting presets needs no
+    invalidation.
 
-    for i in range(pixel_count):
-        # Calculate position with offset (wraps around)
-        if pixel_count == 1:
-            t = 0.0
-        else:
-            t = i / (pixel_count - 1) + offset
-            # Only wrap if offset is non-zero (for animations)
-            if offset != 0.0:
-                t = t % 1.0
-
-        # Find surrounding stops
-        left_stop = sorted_stops[0]
-        right_stop = sorted_stops[-1]
-
-        for j in range(len(sorted_stops) - 1):
-            if sorted_stops[j].position <= t <= sorted_stops[j + 1].position:
-                left_stop = sorted_stops[j]
-                right_stop = sorted_stops[j + 1]
-                break
-
-        # Calculate interpolation factor
-        if right_stop.position == left_stop.position:
-            factor = 0.0
-        else:
-            factor = (t - left_stop.position) / (right_stop.position - left_stop.position)
+    Args:
+        stops: List of ColorStop objects (must be at least 2)
+        pixel_count: Number of pixels to generate
+        offset: Position offset (0.0-1.0, wraps around)
 
-        # Linear interpolate RGB
-        r = int(left_stop.r + (right_stop.r - left_stop.r) * factor)
-        g = int(left_stop.g + (right_stop.g - left_stop.g) * factor)
-        b = int(left_stop.b + (right_stop.b - left_stop.b) * factor)
+    Returns:
+        ndarray of shape (pixel_count, 3), dtype uint8, must not be mutated
+    """
+    return _render_gradient_cached(tuple(stops), pixel_count, offset)
+
+
+@lru_cache(maxsize=64)
+def _render_gradient_cached(stops: tuple[ColorStop, ...], pixel_count: int, offset: float) -> np.ndarray:
+    """Cached body of render_gradient_frame()."""
+    frame = render_gradient_array(stops, pixel_count, offset)
+    frame.setflags(write=False)
+    return frame
+
+
+# HSV sector (int(h * 6) % 6) -> (r, g, b) source: 0=v, 1=p, 2=q, 3=t (see colorsys.hsv_to_rgb)
+_HSV_SECTORS = np.array([
+    [0, 3, 1],
+    [2, 0, 1],
+    [1, 0, 3],
+    [1, 2, 0],
+    [3, 1, 0],
+    [0, 1, 2],
+])
+
+
+def _hue_to_rgb_array(hues: np.ndarray) -> np.ndarray:
+    """
+    Convert hues at full saturation and value to RGB (vectorized).
+
+    Same result as int(x * 255) over colorsys.hsv_to_rgb(h, 1.0, 1.0)
+    for every hue, without a Python loop.
+
+    Args:
+        hues: Hue of every pixel (0.0-1.0), shape (N,)
+
+    Returns:
+        ndarray of shape (N, 3), dtype uint8
+    """
+    h6 = hues * 6.0
+    sector = h6.astype(np.int64)
+    f = h6 - sector
+
+    # With s=v=1: v=1, p=0, q=1-f, t=1-(1-f) (kept in colorsys order for identical rounding)
+    channels = np.empty((4, len(hues)))
+    channels[0] = 1.0
+    channels[1] = 0.0
+    channels[2] = 1.0 - f
+    channels[3] = 1.0 - channels[2]
+
+    rgb = channels[_HSV_SECTORS[sector % 6], np.arange(len(hues))[:, None]]
+    rgb *= 255
+    return rgb.astype(np.uint8)
 
-        # Clamp to valid range
-        r = max(0, min(255, r))
-        g = max(0, min(255, g))
-        b = max(0, min(255, b))
 
-        colors.append((r, g, b))
+def _build_hue_lut(size: int) -> np.ndarray:
+    """Generate hue -> RGB lookup table (full saturation/value), one row per hue step."""
+    lut = _hue_to_rgb_array(np.arange(size) / size)
+    lut.setflags(write=False)
+    return lut
 
-    return colors
+
+# Rainbow lookup table: hue index (hue * HUE_LUT_SIZE) -> (r, g, b), 12 KB
+HUE_LUT_SIZE = 4096
+HUE_LUT = _build_hue_lut(HUE_LUT_SIZE)
+
+# Pre-rendered samples per pixel step for the shift animation ring
+SHIFT_OVERSAMPLE = 16
+
+# Animation rates per second at speed 1.0 (same visual speed as the former
+# per-frame steps of 0.01 offset and 0.05 rad at ANIMATION_FPS)
+OFFSET_RATE = 0.01 * ANIMATION_FPS
+PULSE_RATE = 0.05 * ANIMATION_FPS
+
+# Precomputed samples per period of the pulse brightness wave
+PULSE_SAMPLES = 256
 
 
 # ============================================================================
@@ -158,128 +425,141 @@ def animate_gradient(leds, config: GradientConfig, duration: int, cancel_event:
         logger.warning(f"Unknown animation type: {config.animation}")
 
 
-def _animate_shift(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
-    """Shift gradient position along LED strip."""
-    start_time = time.time()
-    frame = 0
+def _run_frames(leds, duration: int, cancel_event: threading.Event, name: str, render_frame):
+    """
+    Shared frame loop for gradient animations.
+
+    Handles exclusivity, cancellation, duration, frame writes and pacing;
+    render_frame(elapsed) returns (brightness, colors) for the given number
+    of seconds since start. Driving animations by elapsed time rather than a
+    frame counter keeps visual speed correct when frames are late or dropped.
+
+    Frames are copied into one packed RGB bytearray allocated up front and
+    written with leds.set_pixel_bytes(). Frames identical to the previous
+    one (same brightness and pixels) are not written again.
+    """
+    start_time = time.monotonic()
+
+    # Reused frame buffer and its (N, 3) uint8 view
+    buf = bytearray(3 * leds.count)
+    frame_view = np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+    last_brightness = None
 
-    with leds.anim_lock:
+    with leds.anim_active:
+        clock = FrameClock(ANIMATION_FPS)
         while True:
             # Check cancellation
             if cancel_event.is_set():
-                logger.info("Gradient shift animation cancelled")
+                logger.info(f"Gradient {name} animation cancelled")
                 return
 
             # Check duration
-            if duration > 0 and (time.time() - start_time) >= duration:
-                logger.info("Gradient shift animation completed")
+            elapsed = time.monotonic() - start_time
+            if duration > 0 and elapsed >= duration:
+                logger.info(f"Gradient {name} animation completed")
                 return
 
-            # Calculate offset (0.0-1.0, wraps around)
-            offset = (frame * config.speed * 0.01) % 1.0
-
-            # Reverse direction if needed
-            if config.direction == "backward":
-                offset = 1.0 - offset
-
-            # Render gradient with offset
-            colors = render_gradient(config.stops, leds.count, offset)
-
             # Apply to LEDs
             try:
-                leds.set_brightness(config.brightness)
-                leds.set_pixel_array(colors)
+                brightness, colors = render_frame(elapsed)
+                if brightness != last_brightness or not np.array_equal(frame_view, colors):
+                    frame_view[:] = colors
+                    with leds.anim_lock:
+                        leds.set_brightness(brightness)
+                        leds.set_pixel_bytes(buf)
+                    last_brightness = brightness
             except Exception as e:
-                logger.error("Error rendering gradient shift", exc_info=True)
+                logger.error(f"Error rendering gradient {name}", exc_info=True)
                 raise
 
             # Sleep for frame timing
-            time.sleep(1 / ANIMATION_FPS)
-            frame += 1
-
-
-def _animate_pulse(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
-    """Pulse gradient brightness with sine wave."""
-    start_time = time.time()
-    frame = 0
+            clock.sleep()
 
-    # Pre-render static gradient
-    colors = render_gradient(config.stops, leds.count)
 
-    with leds.anim_lock:
-        while True:
-            # Check cancellation
-            if cancel_event.is_set():
-                logger.info("Gradient pulse animation cancelled")
-                return
+def _animate_shift(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
+    """
+    Shift gradient position along LED strip.
 
-            # Check duration
-            if duration > 0 and (time.time() - start_time) >= duration:
-                logger.info("Gradient pulse animation completed")
-                return
+    A shifted frame is a cyclic rotation of the static gradient, so the
+    gradient is rendered once at SHIFT_OVERSAMPLE samples per pixel step and
+    each frame is a strided view into it starting at the current offset.
+    """
+    # Static frame (offset 0 keeps the last pixel at position 1.0)
+    pixel_count = leds.count
+    base = render_gradient_array(config.stops, pixel_count)
 
-            # Calculate brightness multiplier (sine wave 0.3-1.0)
-            t = frame * config.speed * 0.05
-            brightness_mult = 0.3 + 0.7 * (math.sin(t) * 0.5 + 0.5)
-            brightness = config.brightness * brightness_mult
+    # Master ring covering one period [0, 1), stored twice so every frame
+    # is a contiguous range: pixel i of shift k is ring[k + i * SHIFT_OVERSAMPLE]
+    ring_size = max(pixel_count - 1, 0) * SHIFT_OVERSAMPLE
+    if ring_size:
+        positions, rgb = _stop_arrays(tuple(config.stops))
+        master = _interpolate_stops(positions, rgb, np.arange(ring_size) / ring_size)
+        ring = np.concatenate((master, master))
 
-            # Apply to LEDs
-            try:
-                leds.set_brightness(brightness)
-                leds.set_pixel_array(colors)
-            except Exception as e:
-                logger.error("Error rendering gradient pulse", exc_info=True)
-                raise
+    def render_frame(elapsed: float):
+        # Calculate offset (0.0-1.0, wraps around)
+        offset = (elapsed * config.speed * OFFSET_RATE) % 1.0
 
-            # Sleep for frame timing
-            time.sleep(1 / ANIMATION_FPS)
-            frame += 1
+        # Reverse direction if needed
+        if config.direction == "backward":
+            offset = 1.0 - offset
 
+        # Rotate gradient by offset (same wrapping rules as render_gradient)
+        if offset != 0.0 and ring_size:
+            shift = round(offset * ring_size) % ring_size
+            return config.brightness, ring[shift:shift + ring_size + 1:SHIFT_OVERSAMPLE]
+        return config.brightness, base
 
-def _animate_rainbow(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
-    """Rotate hue values over time (rainbow effect)."""
-    start_time = time.time()
-    frame = 0
+    _run_frames(leds, duration, cancel_event, "shift", render_frame)
 
-    with leds.anim_lock:
-        while True:
-            # Check cancellation
-            if cancel_event.is_set():
-                logger.info("Gradient rainbow animation cancelled")
-                return
 
-            # Check duration
-            if duration > 0 and (time.time() - start_time) >= duration:
-                logger.info("Gradient rainbow animation completed")
-                return
-
-            # Generate rainbow gradient
-            colors = []
-            hue_offset = (frame * config.speed * 0.01) % 1.0
+def _animate_pulse(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
+    """Pulse gradient brightness with sine wave."""
+    # Pre-render static gradient once; only brightness changes per frame
+    colors = render_gradient_array(config.stops, leds.count)
 
-            for i in range(leds.count):
-                # Calculate hue (0.0-1.0)
-                hue = (i / leds.count + hue_offset) % 1.0
+    # One period of the brightness wave (sine 0.3-1.0), scaled by config brightness
+    phase = np.arange(PULSE_SAMPLES) * (2 * math.pi / PULSE_SAMPLES)
+    wave = (config.brightness * (0.3 + 0.7 * (np.sin(phase) * 0.5 + 0.5))).tolist()
+    samples_per_second = config.speed * PULSE_RATE * PULSE_SAMPLES / (2 * math.pi)
 
-                # Reverse direction if needed
-                if config.direction == "backward":
-                    hue = 1.0 - hue
+    def render_frame(elapsed: float):
+        return wave[round(elapsed * samples_per_second) % PULSE_SAMPLES], colors
 
-                # Convert HSV to RGB
-                r, g, b = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-                colors.append((int(r * 255), int(g * 255), int(b * 255)))
+    _run_frames(leds, duration, cancel_event, "pulse", render_frame)
 
-            # Apply to LEDs
-            try:
-                leds.set_brightness(config.brightness)
-                leds.set_pixel_array(colors)
-            except Exception as e:
-                logger.error("Error rendering gradient rainbow", exc_info=True)
-                raise
 
-            # Sleep for frame timing
-            time.sleep(1 / ANIMATION_FPS)
-            frame += 1
+def _animate_rainbow(leds, config: GradientConfig, duration: int, cancel_event: threading.Event):
+    """Rotate hue values over time (rainbow effect)."""
+    # Loop-invariant inputs: only the hue offset changes between frames
+    pixel_count = leds.count
+    hue_base = np.arange(pixel_count) / max(pixel_count, 1)
+    hues = np.empty_like(hue_base)
+    backward = config.direction == "backward"
+
+    # Per-frame scratch: LUT indices and the looked-up frame
+    index = np.empty(pixel_count, dtype=np.int64)
+    frame = np.empty((pixel_count, 3), dtype=np.uint8)
+
+    def render_frame(elapsed: float):
+        # Generate rainbow gradient
+        hue_offset = (elapsed * config.speed * OFFSET_RATE) % 1.0
+
+        # Calculate hue LUT index of every pixel (wraps around)
+        np.add(hue_base, hue_offset, out=hues)
+        np.multiply(hues, HUE_LUT_SIZE, out=hues)
+        np.copyto(index, hues, casting="unsafe")
+        np.bitwise_and(index, HUE_LUT_SIZE - 1, out=index)
+
+        # Reverse direction if needed (hue -> 1.0 - hue)
+        if backward:
+            np.negative(index, out=index)
+            np.bitwise_and(index, HUE_LUT_SIZE - 1, out=index)
+
+        np.take(HUE_LUT, index, axis=0, out=frame)
+        return config.brightness, frame
+
+    _run_frames(leds, duration, cancel_event, "rainbow", render_frame)
 
 
 # ============================================================================
@@ -5,11 +5,13 @@ Presets are stored as JSON file for persistence across restarts.
 Includes built-in default presets for common use cases.
 """
 
-import json
+import os
 from pathlib import Path
 from typing import Optional
 
-from pydantic import BaseModel, Field
+import orjson
+
+from pydantic import BaseModel, Field, PrivateAttr
 from app.gradient import GradientConfig, ColorStop
 from app.config import GRADIENT_PRESETS_FILE
 from app.logger import logger
@@ -21,6 +23,15 @@ class GradientPreset(BaseModel):
     config: GradientConfig
     description: str = Field("", max_length=200, description="Optional description")
 
+    # config.dict(), built on first use; presets are cached and never modified in place
+    _config_dict: Optional[dict] = PrivateAttr(None)
+
+    def config_dict(self) -> dict:
+        """Return config as a dict, serialized once per preset (treat as read-only)."""
+        if self._config_dict is None:
+            self._config_dict = self.config.dict()
+        return self._config_dict
+
 
 # ============================================================================
 # Default Presets
@@ -223,6 +234,16 @@ DEFAULT_PRESETS = {
 # Storage Functions
 # ============================================================================
 
+# Presets parsed from the file, keyed by (path, mtime_ns, size) of that file
+_preset_cache: tuple[tuple[str, int, int], dict[str, GradientPreset]] | None = None
+
+
+def _file_key(path: Path) -> tuple[str, int, int]:
+    """Identify the current version of a file for cache validation."""
+    st = path.stat()
+    return str(path), st.st_mtime_ns, st.st_size
+
+
 def get_presets_path() -> Path:
     """Get path to presets file, create directory if needed."""
     path = Path(GRADIENT_PRESETS_FILE)
@@ -238,17 +259,26 @@ def load_presets() -> dict[str, GradientPreset]:
         dict: Preset name -> GradientPreset object
 
     If file doesn't exist, returns default presets and creates the file.
+    Parsed presets are cached until the file's mtime or size changes.
     """
+    global _preset_cache
     path = get_presets_path()
 
     if not path.exists():
         logger.info(f"Presets file not found, creating with defaults: {path}")
-        save_all_presets(DEFAULT_PRESETS)
+        try:
+            save_all_presets(DEFAULT_PRESETS)
+        except OSError as e:
+            # Defaults are still usable in memory
+            logger.warning(f"Failed to create presets file {path}: {e}")
         return DEFAULT_PRESETS.copy()
 
     try:
-        with open(path, 'r') as f:
-            data = json.load(f)
+        key = _file_key(path)
+        if _preset_cache is not None and _preset_cache[0] == key:
+            return _preset_cache[1].copy()
+
+        data = orjson.loads(path.read_bytes())
 
         presets = {}
         for name, preset_data in data.items():
@@ -258,10 +288,11 @@ def load_presets() -> dict[str, GradientPreset]:
                 logger.warning(f"Failed to load preset '{name}': {e}")
                 continue
 
+        _preset_cache = (key, presets)
         logger.info(f"Loaded {len(presets)} gradient presets from {path}")
-        return presets
+        return presets.copy()
 
-    except json.JSONDecodeError as e:
+    except orjson.JSONDecodeError as e:
         logger.error(f"Invalid JSON in presets file: {e}")
         return DEFAULT_PRESETS.copy()
     except Exception as e:
@@ -286,9 +317,12 @@ def save_preset(preset: GradientPreset) -> None:
     if '/' in preset.name or '\\' in preset.name or '..' in preset.name:
         raise ValueError("Invalid preset name (contains path separators)")
 
-    presets = load_presets()
-    presets[preset.name] = preset
-    save_all_presets(presets)
+    # Update the raw file data directly instead of re-validating every preset
+    path = get_presets_path()
+    cached = _cached_presets(path)
+    raw = _load_raw_presets(path)
+    raw[preset.name] = preset.dict()
+    _write_raw(path, raw, None if cached is None else {**cached, preset.name: preset})
 
     logger.info(f"Saved gradient preset: {preset.name}")
 
@@ -297,18 +331,69 @@ def save_all_presets(presets: dict[str, GradientPreset]) -> None:
     """
     Save all presets to JSON file.
 
+    Written atomically (temp file + os.replace) so a crash mid-write can't
+    leave a truncated file. Skips the write if the content is unchanged.
+
     Args:
         presets: dict of preset name -> GradientPreset
     """
     path = get_presets_path()
+    data = {name: preset.dict() for name, preset in presets.items()}
+    _write_raw(path, data, dict(presets))
+
+
+def _cached_presets(path: Path) -> Optional[dict[str, GradientPreset]]:
+    """Cached parsed presets if they still match the file, else None."""
+    try:
+        if _preset_cache is not None and _preset_cache[0] == _file_key(path):
+            return _preset_cache[1]
+    except OSError:
+        pass
+    return None
+
+
+def _load_raw_presets(path: Path) -> dict[str, dict]:
+    """
+    Load presets file as raw dicts, without building GradientPreset objects.
 
+    Falls back to the default presets when the file is missing or unreadable,
+    matching load_presets().
+    """
     try:
-        data = {name: preset.dict() for name, preset in presets.items()}
+        if path.exists():
+            return orjson.loads(path.read_bytes())
+    except (orjson.JSONDecodeError, OSError) as e:
+        logger.error(f"Failed to read presets file, using defaults: {e}")
+    return {name: preset.dict() for name, preset in DEFAULT_PRESETS.items()}
 
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2)
 
-        logger.info(f"Saved {len(presets)} presets to {path}")
+def _write_raw(path: Path, data: dict[str, dict], presets: Optional[dict[str, GradientPreset]] = None) -> None:
+    """
+    Write raw preset dicts to the presets file.
+
+    Args:
+        path: Presets file
+        data: Preset name -> preset dict
+        presets: Parsed form of data to cache, if the caller has it
+    """
+    global _preset_cache
+
+    try:
+        blob = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+
+        if path.exists() and path.read_bytes() == blob:
+            logger.debug("Presets unchanged, skipping write: %s", path)
+        else:
+            tmp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp_path, 'wb') as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            logger.info(f"Saved {len(data)} presets to {path}")
+
+        # We just wrote these presets; no need to parse them back
+        _preset_cache = None if presets is None else (_file_key(path), presets)
 
     except Exception as e:
         logger.error(f"Failed to save presets: {e}", exc_info=True)
@@ -339,13 +424,17 @@ def delete_preset(name: str) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    presets = load_presets()
+    path = get_presets_path()
+    cached = _cached_presets(path)
+    raw = _load_raw_presets(path)
 
-    if name not in presets:
+    if name not in raw:
         return False
 
-    del presets[name]
-    save_all_presets(presets)
+    del raw[name]
+    if cached is not None:
+        cached = {key: preset for key, preset in cached.items() if key != name}
+    _write_raw(path, raw, cached)
 
     logger.info(f"Deleted gradient preset: {name}")
     return True
@@ -7,20 +7,26 @@ Features:
 - Global brightness
 - Gamma correction
 - Thread-safe access
+- Single writer thread for show() (coalesces bursts of updates)
 - Animation mutex (only one animation at a time)
 """
 
-from rpi_ws281x import PixelStrip, Color
+from rpi_ws281x import PixelStrip
+import ctypes
 import threading
-import colorsys
+
+import numpy as np
 
 from app.config import LED_PIN, LED_FREQ_HZ, LED_DMA, LED_CHANNEL, LED_GAMMA
+from app.lighting_math import build_gamma_table, hsv_to_rgb8
+from app.led_kernels import pack_frame, warm_up
 from app.logger import logger
 
-
-def build_gamma_table(gamma: float):
-    """Generate gamma correction lookup table."""
-    return [int(pow(i / 255.0, gamma) * 255.0 + 0.5) for i in range(256)]
+# Low-level SWIG bindings, used to map the driver's LED buffer directly
+try:
+    from rpi_ws281x import ws
+except ImportError:
+    ws = None
 
 
 class LedStrip:
@@ -30,6 +36,14 @@ class LedStrip:
             self.count = count
             self.brightness = 1.0
             self.gamma = build_gamma_table(LED_GAMMA)
+            self._build_lut()
+
+            # Per-frame LUT output scratch, reused by every frame write
+            # instead of allocating temporaries
+            self._pixel_scratch = np.empty((count, 3), dtype=np.uint8)
+
+            # Compile the frame packing kernel now, not on the first frame
+            warm_up()
 
             self.strip = PixelStrip(
                 count,
@@ -41,52 +55,173 @@ class LedStrip:
                 LED_CHANNEL,
             )
             self.strip.begin()
+            self._led_buffer = self._map_led_buffer(count)
             logger.info("LED strip initialized successfully")
 
         except Exception as e:
             logger.error("Failed to initialize LED hardware", exc_info=True)
             raise
 
-        # Prevent concurrent hardware access
+        # Guards the staged frame (_front) and LUT; held only while staging
         self.lock = threading.Lock()
 
-        # Ensure only ONE animation runs at a time
+        # Guards the driver (LED buffer + show()); taken by the writer only
+        self._show_lock = threading.Lock()
+
+        # Ensure only ONE animation runs at a time (held for the whole animation)
+        self.anim_active = threading.Lock()
+
+        # Guards animation frame writes (held per frame, released while sleeping)
         self.anim_lock = threading.Lock()
 
+        # show() runs on one writer thread: callers stage packed pixels in
+        # _front under self.lock and signal _dirty; the writer copies the
+        # changed range into the driver under self.lock, then runs show()
+        # under _show_lock only, so callers never wait for a DMA transfer
+        # and the driver never sees a half-written frame. Bursts of updates
+        # coalesce into a single show() per DMA round.
+        self._front = np.zeros(count, dtype=np.uint32)
+        self._dirty_lo = count
+        self._dirty_hi = 0
+        self._dirty = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._closed = False
+        self._writer = threading.Thread(target=self._pump, name="led-writer", daemon=True)
+        self._writer.start()
+
     # -------------------------------------------------------------
 
     def set_brightness(self, level: float):
         with self.lock:
             self.brightness = max(0.0, min(1.0, level))
+            self._build_lut()
+
+    def _build_lut(self):
+        """Fuse brightness and gamma into one 256-entry lookup table."""
+        self._lut = self.gamma[(np.arange(256) * self.brightness).astype(np.intp)]
+        self._lut_list = self._lut.tolist()
+
+    def _pack(self, r: int, g: int, b: int) -> int:
+        """One color through brightness/gamma, packed as 0xRRGGBB."""
+        lut = self._lut_list
+        return (lut[r] << 16) | (lut[g] << 8) | lut[b]
+
+    def _map_led_buffer(self, count: int):
+        """
+        Map the ws2811 channel LED array as a uint32 NumPy view.
+
+        Lets frames be copied straight into the driver's buffer instead of
+        one setPixelColor() call per pixel. Returns None (setPixelColor
+        fallback) if the driver buffer can't be resolved or doesn't match
+        the strip length. The array is owned by the driver and stays valid
+        until the strip is torn down.
+        """
+        if ws is None:
+            return None
+
+        try:
+            channel = self.strip._channel
+            if ws.ws2811_channel_t_count_get(channel) != count:
+                return None
+            address = int(ws.ws2811_channel_t_leds_get(channel))
+            return np.ctypeslib.as_array((ctypes.c_uint32 * count).from_address(address))
+        except Exception:
+            logger.warning("Direct LED buffer unavailable, using setPixelColor", exc_info=True)
+            return None
+
+    def _pump(self):
+        """Writer thread: push the staged pixels whenever they change."""
+        while True:
+            self._dirty.wait()
+            with self._show_lock:
+                with self.lock:
+                    if self._closed:
+                        self._idle.set()
+                        return
+                    self._dirty.clear()
+                    lo, hi = self._dirty_lo, self._dirty_hi
+                    self._dirty_lo, self._dirty_hi = self.count, 0
+                    if self._led_buffer is not None:
+                        # Single memcpy of the changed range into the driver's LED array
+                        self._led_buffer[lo:hi] = self._front[lo:hi]
+                        changed = None
+                    else:
+                        changed = self._front[lo:hi].tolist()
+
+                try:
+                    if changed is not None:
+                        for i, color in enumerate(changed, lo):
+                            self.strip.setPixelColor(i, color)
+                    self.strip.show()
+                except Exception:
+                    logger.error("Failed to push LED frame", exc_info=True)
+
+                # Idle only if nothing was staged during show()
+                with self.lock:
+                    if not self._dirty.is_set():
+                        self._idle.set()
 
-    def _apply_pipeline(self, r: int, g: int, b: int) -> Color:
-        r = self.gamma[int(r * self.brightness)]
-        g = self.gamma[int(g * self.brightness)]
-        b = self.gamma[int(b * self.brightness)]
-        return Color(r, g, b)
+    def _request_show(self, lo: int, hi: int):
+        """Schedule a show() of staged pixels lo..hi-1. Caller must hold self.lock."""
+        self._dirty_lo = min(self._dirty_lo, lo)
+        self._dirty_hi = max(self._dirty_hi, hi)
+        self._idle.clear()
+        self._dirty.set()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """
+        Wait until all staged pixels have been pushed to the strip.
+
+        Returns:
+            False if the timeout expired first
+        """
+        return self._idle.wait(timeout)
+
+    def close(self):
+        """Push any pending frame and stop the writer thread."""
+        self.flush(timeout=1.0)
+        with self.lock:
+            self._closed = True
+            self._dirty.set()
+        self._writer.join(timeout=1.0)
+
+    def _write_pixels(self, colors: np.ndarray):
+        """
+        Apply brightness/gamma LUT to (N, 3) uint8 pixels and stage them.
+
+        Caller must hold self.lock. Pixels beyond the strip length are ignored.
+        """
+        n = min(len(colors), self.count)
+        pack_frame(colors[:n], self._lut, self._front[:n], self._pixel_scratch[:n])
+        self._request_show(0, n)
+
+    def _fill_pixels(self, r: int, g: int, b: int):
+        """
+        Set every pixel to one color (after brightness/gamma) and stage it.
+
+        A single C-level fill of the packed uint32 frame. Caller must hold
+        self.lock.
+        """
+        self._front[:] = self._pack(r, g, b)
+        self._request_show(0, self.count)
 
     # -------------------------------------------------------------
 
     def set_rgb(self, r: int, g: int, b: int):
         with self.lock:
-            color = self._apply_pipeline(r, g, b)
-            for i in range(self.strip.numPixels()):
-                self.strip.setPixelColor(i, color)
-            self.strip.show()
+            self._fill_pixels(r, g, b)
 
     def set_hsv(self, h: float, s: float, v: float):
-        h = (h % 360) / 360.0
         s = max(0.0, min(1.0, s))
         v = max(0.0, min(1.0, v))
-
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        self.set_rgb(int(r * 255), int(g * 255), int(b * 255))
+        self.set_rgb(*hsv_to_rgb8(h, s, v))
 
     def off(self):
         with self.lock:
-            for i in range(self.strip.numPixels()):
-                self.strip.setPixelColor(i, Color(0, 0, 0))
-            self.strip.show()
+            self._fill_pixels(0, 0, 0)
+        # Callers turn the strip off on shutdown: make sure it reaches the LEDs
+        self.flush(timeout=1.0)
 
     def set_pixel_array(self, colors: list[tuple[int, int, int]]):
         """
@@ -101,12 +236,34 @@ class LedStrip:
             leds.set_pixel_array(colors)
         """
         with self.lock:
-            for i, (r, g, b) in enumerate(colors):
-                if i >= self.strip.numPixels():
-                    break
-                color = self._apply_pipeline(r, g, b)
-                self.strip.setPixelColor(i, color)
-            self.strip.show()
+            self._write_pixels(np.asarray(colors, dtype=np.uint8).reshape(-1, 3))
+
+    def set_pixel_ndarray(self, colors: np.ndarray):
+        """
+        Set individual pixel colors from an (N, 3) uint8 array.
+
+        Same as set_pixel_array(), but takes the array produced by
+        render_gradient_array() directly so animations can keep a
+        pre-rendered frame without rebuilding a list of tuples.
+
+        Args:
+            colors: ndarray of shape (N, 3), one (r, g, b) row per pixel
+        """
+        with self.lock:
+            self._write_pixels(colors)
+
+    def set_pixel_bytes(self, buf: bytes | bytearray):
+        """
+        Set individual pixel colors from a packed RGB byte buffer.
+
+        The buffer is viewed as an (N, 3) array without copying.
+
+        Args:
+            buf: r, g, b bytes for each pixel (3 * N bytes)
+        """
+        pixels = np.frombuffer(buf, dtype=np.uint8, count=len(buf) // 3 * 3).reshape(-1, 3)
+        with self.lock:
+            self._write_pixels(pixels)
 
     def set_pixel(self, index: int, r: int, g: int, b: int):
         """
@@ -122,8 +279,7 @@ class LedStrip:
             leds.set_pixel(0, 255, 0, 0)  # First pixel red
         """
         with self.lock:
-            if 0 <= index < self.strip.numPixels():
-                color = self._apply_pipeline(r, g, b)
-                self.strip.setPixelColor(index, color)
-                self.strip.show()
+            if 0 <= index < self.count:
+                self._front[index] = self._pack(r, g, b)
+                self._request_show(index, index + 1)
 
@@ -0,0 +1,69 @@
+"""
+Per-frame LED kernels.
+
+Fused brightness/gamma LUT lookup and 0xRRGGBB packing for frame writes.
+Compiled with Numba when it is installed (one pass over the pixels, no
+intermediate arrays), NumPy otherwise.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def pack_frame(rgb: np.ndarray, lut: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> None:
+    """
+    Map (N, 3) uint8 pixels through lut and pack them into out as 0xRRGGBB.
+
+    Args:
+        rgb: Pixels, shape (N, 3), dtype uint8
+        lut: Fused brightness/gamma table, shape (256,), dtype uint8
+        out: Packed colors, shape (N,), dtype uint32 (written in place)
+        scratch: Work array for the NumPy path, shape (N, 3), dtype uint8
+    """
+    if NUMBA_AVAILABLE:
+        _pack_frame_nb(rgb, lut, out)
+    else:
+        _pack_frame_np(rgb, lut, out, scratch)
+
+
+def _pack_frame_np(rgb: np.ndarray, lut: np.ndarray, out: np.ndarray, scratch: np.ndarray) -> None:
+    """NumPy implementation of pack_frame()."""
+    np.take(lut, rgb, out=scratch, mode="clip")
+    np.copyto(out, scratch[:, 0])
+    out <<= 8
+    out |= scratch[:, 1]
+    out <<= 8
+    out |= scratch[:, 2]
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _pack_frame_nb(rgb, lut, out):
+        """Compiled form of pack_frame()."""
+        for i in range(rgb.shape[0]):
+            out[i] = (
+                (np.uint32(lut[rgb[i, 0]]) << 16)
+                | (np.uint32(lut[rgb[i, 1]]) << 8)
+                | np.uint32(lut[rgb[i, 2]])
+            )
+
+
+def warm_up() -> None:
+    """
+    Compile (or load from cache) the Numba kernel before the first frame.
+
+    Cached static gradient frames are read-only, which Numba treats as a
+    separate signature, so the kernel is compiled for both forms of rgb.
+    """
+    if NUMBA_AVAILABLE:
+        rgb = np.zeros((1, 3), dtype=np.uint8)
+        lut = np.zeros(256, dtype=np.uint8)
+        out = np.zeros(1, dtype=np.uint32)
+        _pack_frame_nb(rgb, lut, out)
+        rgb.setflags(write=False)
+        _pack_frame_nb(rgb, lut, out)
@@ -3,6 +3,15 @@ Mathematical helpers for smooth, non-flickering light behavior.
 """
 
 import math
+import time
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 
 def smoothstep(t: float) -> float:
@@ -15,6 +24,38 @@ def lerp(a: float, b: float, t: float) -> float:
     return a + (b - a) * t
 
 
+def build_gamma_table(gamma: float) -> np.ndarray:
+    """Generate gamma correction lookup table (256 entries, uint8)."""
+    return (np.power(np.arange(256) / 255.0, gamma) * 255.0 + 0.5).astype(np.uint8)
+
+
+def hsv_to_rgb(h: float, s: float, v: float) -> tuple[float, float, float]:
+    """
+    HSV to RGB (all 0.0-1.0), same result as colorsys.hsv_to_rgb().
+
+    Picks the channel order for the hue sextant from a table instead of
+    colorsys' if-ladder (s == 0 falls out of the same formulas as v, v, v).
+    """
+    h6 = h * 6.0
+    i = int(h6)
+    f = h6 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    return ((v, t, p), (q, v, p), (p, v, t), (p, q, v), (t, p, v), (v, p, q))[i % 6]
+
+
+def hsv_to_rgb8(h: float, s: float, v: float) -> tuple[int, int, int]:
+    """
+    HSV (hue in degrees, s and v 0.0-1.0) to 0-255 RGB ints.
+
+    int(c * 255) per channel, as set_hsv() has always used. Plain float
+    math: for a single color it is cheaper than a round trip through NumPy.
+    """
+    r, g, b = hsv_to_rgb((h % 360) / 360.0, s, v)
+    return int(r * 255), int(g * 255), int(b * 255)
+
+
 class SmoothNoise:
     """
     Very low-frequency noise generator.
@@ -31,3 +72,71 @@ class SmoothNoise:
         self.phase += dt * 0.05
         return math.sin(self.phase) * self.intensity
 
+
+def cloudy_frame(
+    progress: float,
+    h0: float, h1: float,
+    s0: float, s1: float,
+    v0: float, v1: float,
+    max_v: float,
+    phase: float,
+    dt: float,
+    intensity: float,
+) -> tuple[float, float, float, float]:
+    """
+    Compute one frame of a cloudy sunrise/sunset.
+
+    Fuses smoothstep, the h/s/v lerps, SmoothNoise and the final clamp into
+    a single scalar routine (compiled with Numba when available). The noise
+    phase is passed in and returned instead of living on a SmoothNoise object.
+
+    Args:
+        progress: Linear progress of the frame, i / steps (0.0-1.0)
+
+    Returns:
+        (h, s, v, phase) for the frame
+    """
+    t = progress * progress * (3 - 2 * progress)
+    h = h0 + (h1 - h0) * t
+    s = s0 + (s1 - s0) * t
+    base_v = v0 + (v1 - v0) * t
+
+    # Disable clouds when very dark (human eye is sensitive here)
+    if base_v < 0.15:
+        v = base_v
+    else:
+        phase += dt * 0.05
+        v = base_v + math.sin(phase) * intensity
+
+    v = max(0.01, min(max_v, v))
+    return h, s, v, phase
+
+
+if NUMBA_AVAILABLE:
+    cloudy_frame = njit(cache=True)(cloudy_frame)
+
+
+class FrameClock:
+    """
+    Drift-correcting frame pacing for animation loops.
+
+    Sleeps until the next frame deadline on the monotonic clock instead of
+    a fixed 1/FPS, so time spent rendering doesn't accumulate as drift.
+    If a frame overruns by more than a whole frame, the schedule resyncs
+    to now instead of rushing through frames to catch up.
+    """
+
+    __slots__ = ("dt", "deadline")
+
+    def __init__(self, fps: int):
+        self.dt = 1.0 / fps
+        self.deadline = time.monotonic()
+
+    def sleep(self) -> None:
+        """Sleep until the next frame deadline."""
+        self.deadline += self.dt
+        delay = self.deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        elif delay < -self.dt:
+            self.deadline = time.monotonic()
@@ -7,19 +7,35 @@ Log level is configurable via LOG_LEVEL environment variable.
 
 import logging
 import sys
+import time
 from app.config import LOG_LEVEL
 
+# Skip per-record work the log format never uses: thread/process lookups
+# and the findCaller() stack walk (funcName/lineno are not logged).
+# These are process-wide: they apply to every logger (uvicorn's included),
+# whose records then carry no thread/process/caller details either.
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logging._srcfile = None
 
-class LevelFilter(logging.Filter):
-    """Filter log records by level range."""
 
-    def __init__(self, level_min: int, level_max: int):
-        super().__init__()
-        self.level_min = level_min
-        self.level_max = level_max
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders asctime once per wall-clock second."""
 
-    def filter(self, record: logging.LogRecord) -> bool:
-        return self.level_min <= record.levelno <= self.level_max
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, text) swapped as one tuple: the stdout and stderr handlers
+        # share this formatter under separate locks and may format concurrently
+        self._cache: tuple[int | None, str] = (None, "")
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        second = int(record.created)
+        cached_second, text = self._cache
+        if second != cached_second:
+            text = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cache = (second, text)
+        return text
 
 
 def setup_logging() -> logging.Logger:
@@ -39,19 +55,22 @@ def setup_logging() -> logging.Logger:
     # Remove any existing handlers (for reload safety)
     logger.handlers.clear()
 
-    # INFO and DEBUG to stdout
+    # INFO and DEBUG to stdout (handler level is the lower bound,
+    # a plain callable filter the upper bound)
     stdout_handler = logging.StreamHandler(sys.stdout)
     stdout_handler.setLevel(logging.DEBUG)
-    stdout_handler.addFilter(LevelFilter(logging.DEBUG, logging.INFO))
+    stdout_handler.addFilter(lambda record, _max=logging.INFO: record.levelno <= _max)
 
     # WARNING and ERROR to stderr
     stderr_handler = logging.StreamHandler(sys.stderr)
     stderr_handler.setLevel(logging.WARNING)
 
     # Format: "2025-01-15 14:30:45 - hydrosense - INFO - Message"
-    formatter = logging.Formatter(
+    formatter = _CachedTimeFormatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         datefmt="%Y-%m-%d %H:%M:%S",
+        style="%",
+        validate=False,
     )
     stdout_handler.setFormatter(formatter)
     stderr_handler.setFormatter(formatter)
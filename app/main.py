@@ -8,13 +8,15 @@ IMPORTANT:
 
 from fastapi import FastAPI, HTTPException, APIRouter
 from pydantic import BaseModel, Field
-from typing import Literal
-from contextlib import asynccontextmanager
+from typing import Literal, TYPE_CHECKING
+from contextlib import asynccontextmanager, suppress
+import importlib
+import inspect
 import threading
 import signal
 import sys
+import time
 import asyncio
-from datetime import datetime
 
 from app.animations import cloudy_sunrise, cloudy_sunset
 from app.solar_time import get_sun_times
@@ -27,12 +29,14 @@ from app.config import (
 )
 from app.logger import logger
 from app.state import led_state
+from app.lighting_math import hsv_to_rgb8
 from app.gradient import (
     ColorStop,
     GradientConfig,
-    render_gradient,
+    render_gradient_frame,
     animate_gradient,
-    validate_gradient_config
+    validate_gradient_config,
+    warm_up as warm_up_gradient,
 )
 from app.gradient_presets import (
     GradientPreset,
@@ -42,65 +46,79 @@ from app.gradient_presets import (
     delete_preset,
     list_preset_names
 )
-from app.mqtt_client import init_mqtt_service, publish_state_to_mqtt
+from app.mqtt_client import (
+    init_mqtt_service,
+    publish_state_to_mqtt,
+    publish_relay_state_to_mqtt,
+    publish_water_level_to_mqtt,
+    publish_pump_automation_to_mqtt,
+)
 from app.config import MQTT_ENABLED, TEMP_ENABLED, TEMP_SENSOR_IDS, TEMP_UNIT, TEMP_UPDATE_INTERVAL
 from typing import Optional
 
-# Conditional imports based on MOCK_MODE
-if MOCK_MODE:
-    logger.info("🎭 MOCK MODE ENABLED - Using simulated hardware")
-    from app.mock_hardware import MockLedStrip as LedStrip
-    from app.mock_hardware import MockTemperatureSensorManager as TemperatureSensorManager
-    from app.mock_hardware import MockTemperatureReading as TemperatureReading
-    from app.mock_hardware import MockRelayManager as RelayManager
-    from app.mock_hardware import MockWaterLevelSensor as WaterLevelSensor
-else:
+# Import pump automation and relay state (not hardware-dependent)
+from app.pump_automation import PumpAutomation, AutomationMode
+from app.relay import RelayState
+
+if TYPE_CHECKING:
     from app.led import LedStrip
-    from app.temperature import TemperatureSensorManager, TemperatureReading
+    from app.temperature import TemperatureSensorManager
     from app.relay import RelayManager
     from app.water_level import WaterLevelSensor
 
-# Import pump automation (not hardware-dependent)
-from app.pump_automation import PumpAutomation, AutomationMode
-
 
 # ============================================================================
 # Hardware and state initialization
 # ============================================================================
 
-leds = LedStrip(count=LED_COUNT)
+# Hardware classes per MOCK_MODE: (module, attribute), imported on demand so
+# only the selected implementation is loaded
+_HARDWARE_CLASSES = {
+    True: {
+        "LedStrip": ("app.mock_hardware", "MockLedStrip"),
+        "TemperatureSensorManager": ("app.mock_hardware", "MockTemperatureSensorManager"),
+        "RelayManager": ("app.mock_hardware", "MockRelayManager"),
+        "WaterLevelSensor": ("app.mock_hardware", "MockWaterLevelSensor"),
+    },
+    False: {
+        "LedStrip": ("app.led", "LedStrip"),
+        "TemperatureSensorManager": ("app.temperature", "TemperatureSensorManager"),
+        "RelayManager": ("app.relay", "RelayManager"),
+        "WaterLevelSensor": ("app.water_level", "WaterLevelSensor"),
+    },
+}
+
+
+def _hardware_class(name: str):
+    """Import and return the real or mock hardware class for MOCK_MODE."""
+    module_name, attribute = _HARDWARE_CLASSES[bool(MOCK_MODE)][name]
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+# Max time to wait for background tasks (MQTT, temperature polling) on shutdown
+BACKGROUND_TASK_SHUTDOWN_TIMEOUT = 5.0
+
+# Min spacing between LED state publishes; bursts (color-picker drags) coalesce
+STATE_PUBLISH_MIN_INTERVAL = 0.05
+
+# Flush window for batched MQTT state publishes (relays, pump automation)
+MQTT_PUBLISH_BATCH_WINDOW = 0.1
+
+# Hardware handles, created by initialize_hardware() on application startup
+leds: Optional["LedStrip"] = None
+temp_manager: Optional["TemperatureSensorManager"] = None
+relay_manager: Optional["RelayManager"] = None
+water_sensor: Optional["WaterLevelSensor"] = None
+pump_automation: Optional[PumpAutomation] = None
 
-# Thread management
+# Thread management (registry changes guarded by _active_threads_lock)
 active_threads: dict[str, tuple[threading.Thread, threading.Event]] = {}
+_active_threads_lock = threading.Lock()
 shutdown_event = threading.Event()
 
-# Temperature sensor manager
-temp_manager: Optional[TemperatureSensorManager] = None
-if TEMP_ENABLED:
-    try:
-        sensor_ids = [s.strip() for s in TEMP_SENSOR_IDS.split(',') if s.strip()] if TEMP_SENSOR_IDS else []
-        temp_manager = TemperatureSensorManager(sensor_ids=sensor_ids if sensor_ids else None)
-        logger.info(f"Temperature sensor manager initialized")
-    except Exception as e:
-        logger.error(f"Failed to initialize temperature sensors: {e}", exc_info=True)
-        temp_manager = None
-
-# Relay manager
-relay_manager: Optional[RelayManager] = None
-if RELAY_ENABLED:
-    try:
-        relay_configs = parse_relay_config()
-        if relay_configs:
-            relay_manager = RelayManager(relay_configs=relay_configs)
-            logger.info(f"Relay manager initialized with {len(relay_configs)} relays")
-        else:
-            logger.warning("RELAY_ENABLED=true but RELAY_CONFIG is empty")
-    except Exception as e:
-        logger.error(f"Failed to initialize relay manager: {e}", exc_info=True)
-        relay_manager = None
-
-# Water level sensor
-water_sensor: Optional[WaterLevelSensor] = None
+# Set once release_hardware() has run for the current hardware handles
+hardware_released = threading.Event()
+_release_lock = threading.Lock()
 
 
 def water_level_changed_callback(new_level, water_info: dict):
@@ -117,7 +135,7 @@ def water_level_changed_callback(new_level, water_info: dict):
     when the global water_sensor is still None. We skip MQTT publish in that case
     since the initial state will be published anyway during MQTT discovery.
     """
-    logger.debug(f"water_level_changed_callback START: level={new_level}, MQTT_ENABLED={MQTT_ENABLED}")
+    logger.debug("water_level_changed_callback START: level=%s, MQTT_ENABLED=%s", new_level, MQTT_ENABLED)
 
     if not MQTT_ENABLED:
         logger.debug("Callback exit: MQTT not enabled")
@@ -126,16 +144,13 @@ def water_level_changed_callback(new_level, water_info: dict):
     # During __init__, water_sensor global is None - skip for now
     # Initial state will be published during MQTT discovery
     if water_sensor is None:
-        logger.debug(f"Water level callback during init (level={new_level}) - initial state will be published by MQTT discovery")
+        logger.debug("Water level callback during init (level=%s) - initial state will be published by MQTT discovery", new_level)
         return
 
     try:
-        logger.debug("Importing publish_water_level_to_mqtt...")
-        from app.mqtt_client import publish_water_level_to_mqtt
-
-        logger.info(f"Water level callback: publishing state {water_info['current_level']} to MQTT")
+        logger.info("Water level callback: publishing state %s to MQTT", water_info['current_level'])
 
-        logger.debug(f"Scheduling async task with main_event_loop={main_event_loop}...")
+        logger.debug("Scheduling async task with main_event_loop=%s...", main_event_loop)
         schedule_async_task(publish_water_level_to_mqtt(water_info))
 
         logger.debug("water_level_changed_callback COMPLETED")
@@ -143,46 +158,306 @@ def water_level_changed_callback(new_level, water_info: dict):
         logger.error(f"Error in water level callback: {e}", exc_info=True)
 
 
-if WATER_LEVEL_ENABLED:
+def initialize_hardware(app: FastAPI) -> None:
+    """
+    Create LED strip, sensors, relays and pump automation.
+
+    Called from the FastAPI lifespan instead of at import time, so importing
+    app.main (tests, --reload) does not touch hardware. Handles are kept in
+    the module globals used by endpoints and MQTT, and mirrored on app.state.
+    """
+    global leds, temp_manager, relay_manager, water_sensor, pump_automation
+
+    hardware_released.clear()
+
+    if MOCK_MODE:
+        logger.info("🎭 MOCK MODE ENABLED - Using simulated hardware")
+
+    leds = _hardware_class("LedStrip")(count=LED_COUNT)
+
+    # Temperature sensor manager
+    if TEMP_ENABLED:
+        try:
+            TemperatureSensorManager = _hardware_class("TemperatureSensorManager")
+            sensor_ids = [s.strip() for s in TEMP_SENSOR_IDS.split(',') if s.strip()] if TEMP_SENSOR_IDS else []
+            temp_manager = TemperatureSensorManager(sensor_ids=sensor_ids if sensor_ids else None)
+            logger.info(f"Temperature sensor manager initialized")
+        except Exception as e:
+            logger.error(f"Failed to initialize temperature sensors: {e}", exc_info=True)
+            temp_manager = None
+
+    # Relay manager
+    if RELAY_ENABLED:
+        try:
+            relay_configs = parse_relay_config()
+            if relay_configs:
+                relay_manager = _hardware_class("RelayManager")(relay_configs=relay_configs)
+                logger.info(f"Relay manager initialized with {len(relay_configs)} relays")
+            else:
+                logger.warning("RELAY_ENABLED=true but RELAY_CONFIG is empty")
+        except Exception as e:
+            logger.error(f"Failed to initialize relay manager: {e}", exc_info=True)
+            relay_manager = None
+
+    # Water level sensor
+    if WATER_LEVEL_ENABLED:
+        try:
+            water_sensor = _hardware_class("WaterLevelSensor")(
+                gpio_pin=WATER_LEVEL_PIN,
+                active_high=WATER_LEVEL_ACTIVE_HIGH,
+                debounce_time=WATER_LEVEL_DEBOUNCE_TIME,
+                on_state_change=water_level_changed_callback
+            )
+            logger.info(f"Water level sensor initialized on GPIO {WATER_LEVEL_PIN}")
+        except Exception as e:
+            logger.error(f"Failed to initialize water level sensor: {e}", exc_info=True)
+            water_sensor = None
+
+    # Pump automation
+    if PUMP_AUTOMATION_ENABLED and relay_manager and water_sensor:
+        try:
+            pump_automation = PumpAutomation(
+                relay_manager=relay_manager,
+                water_sensor=water_sensor,
+                pump_relay_id=PUMP_RELAY_ID,
+                on_interval=PUMP_ON_INTERVAL,
+                off_interval=PUMP_OFF_INTERVAL,
+                max_runtime=PUMP_MAX_RUNTIME
+            )
+            pump_automation.start()
+            logger.info("Pump automation started")
+        except Exception as e:
+            logger.error(f"Failed to initialize pump automation: {e}", exc_info=True)
+            pump_automation = None
+    elif PUMP_AUTOMATION_ENABLED:
+        if not relay_manager:
+            logger.warning("PUMP_AUTOMATION_ENABLED=true but relay manager not initialized")
+        if not water_sensor:
+            logger.warning("PUMP_AUTOMATION_ENABLED=true but water level sensor not initialized")
+
+    app.state.leds = leds
+    app.state.temp_manager = temp_manager
+    app.state.relay_manager = relay_manager
+    app.state.water_sensor = water_sensor
+    app.state.pump_automation = pump_automation
+
+
+# ============================================================================
+# MQTT Command Bridge
+# ============================================================================
+
+# MQTT light effect -> (preset name, animation override, animation name)
+EFFECT_TABLE: dict[str, tuple[str, Optional[str], str]] = {
+    "gradient_shift": ("rainbow", "shift", "gradient_shift"),
+    "gradient_pulse": ("aurora", None, "gradient_pulse"),
+    "rainbow": ("rainbow", None, "gradient_rainbow"),
+}
+
+
+async def _handle_light_command(command: dict):
+    """Handle HA light command: {"state": "ON"/"OFF", "brightness", "color", "effect"}."""
+    state = command.get("state")
+
+    if state == "OFF":
+        # Turn off LEDs
+        logger.info("MQTT command: Turn off")
+        await asyncio.to_thread(_off_sync)
+        led_state.update(mode="off", rgb=(0, 0, 0), brightness=0.0)
+        return
+
+    if state != "ON":
+        return
+
+    # Get parameters
+    brightness = command.get("brightness", 255) / 255.0  # HA uses 0-255
+    color = command.get("color", {})
+    effect = command.get("effect", "none")
+
+    # Handle effects first
+    if effect and effect != "none":
+        logger.info("MQTT command: Effect %s", effect)
+        await _handle_effect(effect, brightness)
+
+    # Handle RGB color
+    elif color and "r" in color:
+        r = color.get("r", 0)
+        g = color.get("g", 0)
+        b = color.get("b", 0)
+
+        logger.info("MQTT command: RGB (%s, %s, %s), brightness=%s", r, g, b, brightness)
+        # LED writes only stage pixels for the strip's writer thread: run inline
+        leds.set_brightness(brightness)
+        leds.set_rgb(r, g, b)
+
+        led_state.update(
+            mode="rgb",
+            rgb=(r, g, b),
+            brightness=brightness
+        )
+
+    # Just brightness change (no color or effect)
+    else:
+        logger.info("MQTT command: Brightness %s", brightness)
+        leds.set_brightness(brightness)
+
+        # Re-apply current color with new brightness
+        # (brightness is global multiplier, need to refresh LEDs)
+        current_rgb = led_state.rgb
+        leds.set_rgb(current_rgb[0], current_rgb[1], current_rgb[2])
+
+        led_state.update(brightness=brightness)
+
+
+async def _handle_effect(effect: str, brightness: float):
+    """Start the preset animation mapped to an HA light effect (see EFFECT_TABLE)."""
+    entry = EFFECT_TABLE.get(effect)
+    if entry is None:
+        return
+
+    preset_name, animation, animation_name = entry
+    preset = get_preset(preset_name)
+    if not preset:
+        return
+
+    # Copy: presets are cached and shared, don't modify them in place
+    update = {"brightness": brightness}
+    if animation:
+        update["animation"] = animation
+    config = preset.config.copy(update=update)
+
+    run_async(
+        animation_name,
+        animate_gradient,
+        leds,
+        config,
+        0
+    )
+    led_state.update(
+        mode="gradient_animated",
+        gradient_config=config.dict(),
+        active_animation=animation_name,
+        brightness=brightness
+    )
+
+
+async def _gradient_load_preset(command: dict):
+    """Gradient action: apply a saved preset (static or animated)."""
+    preset_name = command.get("preset_name")
+    logger.info("MQTT command: Load gradient preset %s", preset_name)
+
+    preset = get_preset(preset_name)
+    if not preset:
+        return
+
+    if preset.config.animation:
+        run_async(
+            f"gradient_{preset.config.animation}",
+            animate_gradient,
+            leds,
+            preset.config,
+            0
+        )
+        led_state.update(
+            mode="gradient_animated",
+            gradient_config=preset.config_dict(),
+            active_animation=f"gradient_{preset.config.animation}",
+            brightness=preset.config.brightness
+        )
+    else:
+        frame = render_gradient_frame(preset.config.stops, LED_COUNT)
+        leds.set_brightness(preset.config.brightness)
+        leds.set_pixel_ndarray(frame)
+        led_state.update(
+            mode="gradient_static",
+            gradient_config=preset.config_dict(),
+            brightness=preset.config.brightness,
+            rgb=tuple(frame[0].tolist()) if len(frame) else (0, 0, 0)
+        )
+
+
+async def _gradient_static(command: dict):
+    """Gradient action: apply static gradient from MQTT."""
+    config_data = command.get("config", {})
+    logger.info("MQTT command: Static gradient with %s stops", len(config_data.get('stops', [])))
+
     try:
-        water_sensor = WaterLevelSensor(
-            gpio_pin=WATER_LEVEL_PIN,
-            active_high=WATER_LEVEL_ACTIVE_HIGH,
-            debounce_time=WATER_LEVEL_DEBOUNCE_TIME,
-            on_state_change=water_level_changed_callback
+        config = GradientConfig(**config_data)
+        validate_gradient_config(config)
+
+        frame = render_gradient_frame(config.stops, LED_COUNT)
+        leds.set_brightness(config.brightness)
+        leds.set_pixel_ndarray(frame)
+
+        led_state.update(
+            mode="gradient_static",
+            gradient_config=config.dict(),
+            brightness=config.brightness,
+            rgb=tuple(frame[0].tolist()) if len(frame) else (0, 0, 0)
         )
-        logger.info(f"Water level sensor initialized on GPIO {WATER_LEVEL_PIN}")
     except Exception as e:
-        logger.error(f"Failed to initialize water level sensor: {e}", exc_info=True)
-        water_sensor = None
+        logger.error(f"Failed to apply static gradient: {e}")
+
+
+async def _gradient_animated(command: dict):
+    """Gradient action: start animated gradient from MQTT."""
+    config_data = command.get("config", {})
+    duration = command.get("duration", 0)
+    logger.info("MQTT command: Animated gradient (%s), duration=%ss", config_data.get('animation'), duration)
 
-# Pump automation
-pump_automation: Optional[PumpAutomation] = None
-if PUMP_AUTOMATION_ENABLED and relay_manager and water_sensor:
     try:
-        pump_automation = PumpAutomation(
-            relay_manager=relay_manager,
-            water_sensor=water_sensor,
-            pump_relay_id=PUMP_RELAY_ID,
-            on_interval=PUMP_ON_INTERVAL,
-            off_interval=PUMP_OFF_INTERVAL,
-            max_runtime=PUMP_MAX_RUNTIME
+        config = GradientConfig(**config_data)
+        validate_gradient_config(config)
+
+        animation_name = f"gradient_{config.animation}"
+        run_async(
+            animation_name,
+            animate_gradient,
+            leds,
+            config,
+            duration
+        )
+
+        led_state.update(
+            mode="gradient_animated",
+            gradient_config=config.dict(),
+            active_animation=animation_name,
+            brightness=config.brightness
         )
-        pump_automation.start()
-        logger.info("Pump automation started")
     except Exception as e:
-        logger.error(f"Failed to initialize pump automation: {e}", exc_info=True)
-        pump_automation = None
-elif PUMP_AUTOMATION_ENABLED:
-    if not relay_manager:
-        logger.warning("PUMP_AUTOMATION_ENABLED=true but relay manager not initialized")
-    if not water_sensor:
-        logger.warning("PUMP_AUTOMATION_ENABLED=true but water level sensor not initialized")
+        logger.error(f"Failed to start animated gradient: {e}")
 
 
-# ============================================================================
-# MQTT Command Bridge
-# ============================================================================
+async def _gradient_save_preset(command: dict):
+    """Gradient action: save custom gradient as preset from MQTT."""
+    preset_name = command.get("preset_name")
+    config_data = command.get("config", {})
+    description = command.get("description", "")
+    logger.info("MQTT command: Save gradient preset '%s'", preset_name)
+
+    try:
+        config = GradientConfig(**config_data)
+        validate_gradient_config(config)
+
+        preset = GradientPreset(
+            name=preset_name,
+            description=description,
+            config=config
+        )
+        await asyncio.to_thread(save_preset, preset)
+        logger.info("Saved gradient preset '%s' via MQTT", preset_name)
+
+    except Exception as e:
+        logger.error(f"Failed to save gradient preset: {e}")
+
+
+# MQTT gradient command action -> handler
+GRADIENT_ACTIONS = {
+    "load_preset": _gradient_load_preset,
+    "static": _gradient_static,
+    "animated": _gradient_animated,
+    "save_preset": _gradient_save_preset,
+}
+
 
 async def execute_command_bridge(command: dict):
     """
@@ -198,222 +473,14 @@ async def execute_command_bridge(command: dict):
     try:
         # HA Light command
         if "state" in command:
-            state = command.get("state")
-
-            if state == "OFF":
-                # Turn off LEDs
-                logger.info("MQTT command: Turn off")
-                await asyncio.to_thread(_off_sync)
-                led_state.update(mode="off", rgb=(0, 0, 0), brightness=0.0)
-
-            elif state == "ON":
-                # Get parameters
-                brightness = command.get("brightness", 255) / 255.0  # HA uses 0-255
-                color = command.get("color", {})
-                effect = command.get("effect", "none")
-
-                # Handle effects first
-                if effect and effect != "none":
-                    logger.info(f"MQTT command: Effect {effect}")
-
-                    if effect == "gradient_shift":
-                        # Load rainbow preset with shift animation
-                        preset = get_preset("rainbow")
-                        if preset:
-                            preset.config.animation = "shift"
-                            preset.config.brightness = brightness
-                            await asyncio.to_thread(
-                                run_async,
-                                "gradient_shift",
-                                animate_gradient,
-                                leds,
-                                preset.config,
-                                0
-                            )
-                            led_state.update(
-                                mode="gradient_animated",
-                                gradient_config=preset.config.dict(),
-                                active_animation="gradient_shift",
-                                brightness=brightness
-                            )
-
-                    elif effect == "gradient_pulse":
-                        # Load aurora preset (has pulse animation)
-                        preset = get_preset("aurora")
-                        if preset:
-                            preset.config.brightness = brightness
-                            await asyncio.to_thread(
-                                run_async,
-                                "gradient_pulse",
-                                animate_gradient,
-                                leds,
-                                preset.config,
-                                0
-                            )
-                            led_state.update(
-                                mode="gradient_animated",
-                                gradient_config=preset.config.dict(),
-                                active_animation="gradient_pulse",
-                                brightness=brightness
-                            )
-
-                    elif effect == "rainbow":
-                        # Load rainbow preset
-                        preset = get_preset("rainbow")
-                        if preset:
-                            preset.config.brightness = brightness
-                            await asyncio.to_thread(
-                                run_async,
-                                "gradient_rainbow",
-                                animate_gradient,
-                                leds,
-                                preset.config,
-                                0
-                            )
-                            led_state.update(
-                                mode="gradient_animated",
-                                gradient_config=preset.config.dict(),
-                                active_animation="gradient_rainbow",
-                                brightness=brightness
-                            )
-
-                # Handle RGB color
-                elif color and "r" in color:
-                    r = color.get("r", 0)
-                    g = color.get("g", 0)
-                    b = color.get("b", 0)
-
-                    logger.info(f"MQTT command: RGB ({r}, {g}, {b}), brightness={brightness}")
-                    await asyncio.to_thread(leds.set_brightness, brightness)
-                    await asyncio.to_thread(leds.set_rgb, r, g, b)
-
-                    led_state.update(
-                        mode="rgb",
-                        rgb=(r, g, b),
-                        brightness=brightness
-                    )
-
-                # Just brightness change (no color or effect)
-                else:
-                    logger.info(f"MQTT command: Brightness {brightness}")
-                    await asyncio.to_thread(leds.set_brightness, brightness)
-
-                    # Re-apply current color with new brightness
-                    # (brightness is global multiplier, need to refresh LEDs)
-                    current_rgb = led_state.rgb
-                    await asyncio.to_thread(leds.set_rgb, current_rgb[0], current_rgb[1], current_rgb[2])
-
-                    led_state.update(brightness=brightness)
+            await _handle_light_command(command)
 
         # Gradient-specific command
         elif command.get("type") == "gradient":
             action = command.get("action")
-
-            if action == "load_preset":
-                preset_name = command.get("preset_name")
-                logger.info(f"MQTT command: Load gradient preset {preset_name}")
-
-                preset = get_preset(preset_name)
-                if preset:
-                    if preset.config.animation:
-                        await asyncio.to_thread(
-                            run_async,
-                            f"gradient_{preset.config.animation}",
-                            animate_gradient,
-                            leds,
-                            preset.config,
-                            0
-                        )
-                        led_state.update(
-                            mode="gradient_animated",
-                            gradient_config=preset.config.dict(),
-                            active_animation=f"gradient_{preset.config.animation}",
-                            brightness=preset.config.brightness
-                        )
-                    else:
-                        colors = await asyncio.to_thread(render_gradient, preset.config.stops, LED_COUNT)
-                        await asyncio.to_thread(leds.set_brightness, preset.config.brightness)
-                        await asyncio.to_thread(leds.set_pixel_array, colors)
-                        led_state.update(
-                            mode="gradient_static",
-                            gradient_config=preset.config.dict(),
-                            brightness=preset.config.brightness,
-                            rgb=colors[0] if colors else (0, 0, 0)
-                        )
-
-            elif action == "static":
-                # Apply static gradient from MQTT
-                config_data = command.get("config", {})
-                logger.info(f"MQTT command: Static gradient with {len(config_data.get('stops', []))} stops")
-
-                try:
-                    config = GradientConfig(**config_data)
-                    validate_gradient_config(config)
-
-                    colors = await asyncio.to_thread(render_gradient, config.stops, LED_COUNT)
-                    await asyncio.to_thread(leds.set_brightness, config.brightness)
-                    await asyncio.to_thread(leds.set_pixel_array, colors)
-
-                    led_state.update(
-                        mode="gradient_static",
-                        gradient_config=config.dict(),
-                        brightness=config.brightness,
-                        rgb=colors[0] if colors else (0, 0, 0)
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to apply static gradient: {e}")
-
-            elif action == "animated":
-                # Start animated gradient from MQTT
-                config_data = command.get("config", {})
-                duration = command.get("duration", 0)
-                logger.info(f"MQTT command: Animated gradient ({config_data.get('animation')}), duration={duration}s")
-
-                try:
-                    config = GradientConfig(**config_data)
-                    validate_gradient_config(config)
-
-                    animation_name = f"gradient_{config.animation}"
-                    await asyncio.to_thread(
-                        run_async,
-                        animation_name,
-                        animate_gradient,
-                        leds,
-                        config,
-                        duration
-                    )
-
-                    led_state.update(
-                        mode="gradient_animated",
-                        gradient_config=config.dict(),
-                        active_animation=animation_name,
-                        brightness=config.brightness
-                    )
-                except Exception as e:
-                    logger.error(f"Failed to start animated gradient: {e}")
-
-            elif action == "save_preset":
-                # Save custom gradient as preset from MQTT
-                preset_name = command.get("preset_name")
-                config_data = command.get("config", {})
-                description = command.get("description", "")
-                logger.info(f"MQTT command: Save gradient preset '{preset_name}'")
-
-                try:
-                    config = GradientConfig(**config_data)
-                    validate_gradient_config(config)
-
-                    preset = GradientPreset(
-                        name=preset_name,
-                        description=description,
-                        config=config
-                    )
-                    await asyncio.to_thread(save_preset, preset)
-                    logger.info(f"Saved gradient preset '{preset_name}' via MQTT")
-
-                except Exception as e:
-                    logger.error(f"Failed to save gradient preset: {e}")
-
+            handler = GRADIENT_ACTIONS.get(action)
+            if handler:
+                await handler(command)
             else:
                 logger.warning(f"Unknown gradient action: {action}")
 
@@ -426,21 +493,40 @@ async def execute_command_bridge(command: dict):
 
 def _off_sync():
     """Synchronous helper for turning off LEDs (for asyncio.to_thread)."""
-    # Cancel all animations
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        logger.info(f"Cancelling animation: {name}")
-        cancel_event.set()
-
-    # Wait briefly for animations to stop
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        thread.join(timeout=2.0)
-        if thread.is_alive():
-            logger.warning(f"Animation {name} did not stop within timeout")
+    # Cancel all animations and wait briefly for them to stop
+    cancel_animations(timeout=2.0)
 
     # Turn off LEDs
     leds.off()
 
 
+def supervise_background_tasks(tasks: dict[str, asyncio.Task]) -> None:
+    """
+    Cancel sibling background tasks when one of them crashes.
+
+    Gives TaskGroup-style failure handling without tying the tasks to the
+    lifespan coroutine, so a crash doesn't abort the app and shutdown can
+    still use its own timeout.
+
+    Args:
+        tasks: Background tasks by display name
+    """
+    def on_done(task: asyncio.Task) -> None:
+        if task.cancelled() or task.exception() is None:
+            return
+        name = next(name for name, t in tasks.items() if t is task)
+        logger.error(
+            "Background task %s crashed, cancelling the others",
+            name, exc_info=task.exception(),
+        )
+        for other in tasks.values():
+            if other is not task:
+                other.cancel()
+
+    for task in tasks.values():
+        task.add_done_callback(on_done)
+
+
 # ============================================================================
 # FastAPI Lifespan (MQTT background task)
 # ============================================================================
@@ -450,17 +536,24 @@ async def lifespan(app: FastAPI):
     """
     FastAPI lifespan context manager.
 
-    Starts MQTT service as background task on startup.
+    Initializes hardware and starts MQTT service as background task on startup.
     Stops MQTT service on shutdown.
     """
-    global main_event_loop
+    global main_event_loop, temp_wake
     main_event_loop = asyncio.get_running_loop()
 
-    logger.info("HydroSense starting up")
-    logger.info(f"Configuration: LED_COUNT={LED_COUNT}, LED_PIN={LED_PIN}, LOG_LEVEL={LOG_LEVEL}")
-    logger.info(f"MQTT enabled: {MQTT_ENABLED}")
+    logger.info(
+        "HydroSense starting up | LED_COUNT=%s LED_PIN=%s LOG_LEVEL=%s MQTT_ENABLED=%s",
+        LED_COUNT, LED_PIN, LOG_LEVEL, MQTT_ENABLED,
+    )
+
+    initialize_hardware(app)
+
+    # Compile the gradient kernel before the first gradient request
+    await asyncio.to_thread(warm_up_gradient)
 
     # Start MQTT service if enabled
+    mqtt_service = None
     mqtt_task = None
     if MQTT_ENABLED:
         mqtt_service = init_mqtt_service(execute_command_bridge)
@@ -469,40 +562,80 @@ async def lifespan(app: FastAPI):
 
     # Start temperature polling if enabled
     temp_task = None
+    temp_publish_task = None
     if TEMP_ENABLED and temp_manager:
+        temp_wake = asyncio.Event()
+
+        # Await a native async reader directly; blocking (1-Wire) readers go
+        # through the thread pool
+        if inspect.iscoroutinefunction(temp_manager.read_all):
+            read_temperatures = temp_manager.read_all
+        else:
+            def read_temperatures():
+                return asyncio.to_thread(temp_manager.read_all)
+
+        # Latest readings waiting to be published; a reading that hasn't been
+        # picked up yet is replaced, so a slow broker never delays the next read
+        publish_queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
         async def poll_temperature():
             """Background task to poll temperature sensors."""
+            loop = asyncio.get_running_loop()
             while True:
+                # Interval is measured start to start, so slow reads don't add drift
+                cycle_start = loop.time()
+                # Clear before reading: a refresh requested during the read
+                # wakes the next wait instead of being lost
+                temp_wake.clear()
                 try:
-                    readings = await asyncio.to_thread(temp_manager.read_all)
-                    sensors_data = {
-                        sensor_id: {
-                            "celsius": reading.celsius,
-                            "fahrenheit": reading.fahrenheit,
-                            "timestamp": reading.timestamp,
-                            "valid": reading.valid,
-                            "error": reading.error
-                        }
-                        for sensor_id, reading in readings.items()
-                    }
-
+                    readings = await read_temperatures()
+                except Exception:
+                    logger.exception("Temperature read failed")
+                else:
+                    # Store raw readings right away (get_snapshot() serializes on
+                    # demand), so /state stays current however slow the broker is
                     led_state.update(
-                        temperature_readings=sensors_data,
-                        last_temp_update=datetime.now()
+                        temperature_readings=readings,
+                        last_temp_update=time.time()
                     )
-
-                    # Publish to MQTT
                     if mqtt_service:
-                        for sensor_id, reading_dict in sensors_data.items():
-                            await mqtt_service.publish_temperature_state(sensor_id, reading_dict)
+                        if publish_queue.full():
+                            publish_queue.get_nowait()
+                        publish_queue.put_nowait(readings)
+
+                # Wait for the next interval, or less if a refresh was requested
+                remaining = TEMP_UPDATE_INTERVAL - (loop.time() - cycle_start)
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(temp_wake.wait(), timeout=max(0.0, remaining))
+
+        async def publish_temperature():
+            """Background task to publish polled temperatures to MQTT."""
+            # One payload dict per sensor, updated in place every cycle
+            sensors_data: dict[str, dict] = {}
+            while True:
+                readings = await publish_queue.get()
 
-                except Exception as e:
-                    logger.error("Temperature polling error", exc_info=True)
+                # Sensor set only changes on refresh: drop removed sensors
+                for sensor_id in sensors_data.keys() - readings.keys():
+                    del sensors_data[sensor_id]
+                for sensor_id, reading in readings.items():
+                    sensors_data[sensor_id] = reading.as_dict(sensors_data.get(sensor_id))
 
-                await asyncio.sleep(TEMP_UPDATE_INTERVAL)
+                # Logs its own failures, never raises
+                await mqtt_service.publish_temperature_states(sensors_data)
 
         temp_task = asyncio.create_task(poll_temperature())
-        logger.info(f"Temperature polling started (interval: {TEMP_UPDATE_INTERVAL}s)")
+        if mqtt_service:
+            temp_publish_task = asyncio.create_task(publish_temperature())
+        logger.info("Temperature polling started (interval: %ss)", TEMP_UPDATE_INTERVAL)
+
+    background_tasks = {
+        "temperature polling": temp_task,
+        "temperature publishing": temp_publish_task,
+        "MQTT service": mqtt_task,
+    }
+    background_tasks = {name: task for name, task in background_tasks.items() if task}
+    supervise_background_tasks(background_tasks)
 
     # App is running
     yield
@@ -510,65 +643,40 @@ async def lifespan(app: FastAPI):
     # Shutdown sequence
     logger.info("Starting graceful shutdown...")
 
-    # 1. Cancel all running animations
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        logger.info(f"Cancelling animation: {name}")
+    # 1. Cancel all running animations (one snapshot for cancel and join)
+    animations = active_threads.copy()
+    for name, (thread, cancel_event) in animations.items():
+        logger.info("Cancelling animation: %s", name)
         cancel_event.set()
 
-    # 2. Wait briefly for animations to stop
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        thread.join(timeout=2.0)
+    # 2. Wait briefly for animations to stop (joined in parallel, off the event loop)
+    await asyncio.gather(
+        *(asyncio.to_thread(thread.join, 2.0) for thread, _ in animations.values())
+    )
+    for name, (thread, cancel_event) in animations.items():
         if thread.is_alive():
             logger.warning(f"Animation {name} did not stop within timeout")
 
-    # 3. Stop temperature polling
-    if temp_task:
-        logger.info("Stopping temperature polling...")
-        temp_task.cancel()
-        try:
-            await temp_task
-        except asyncio.CancelledError:
-            logger.info("Temperature polling stopped")
-
-    # 4. Stop MQTT
-    if mqtt_task:
-        logger.info("Stopping MQTT service...")
-        mqtt_task.cancel()
-        try:
-            await mqtt_task
-        except asyncio.CancelledError:
-            logger.info("MQTT service stopped")
+    # 3-4. Stop temperature polling and MQTT (cancelled together, drained in parallel)
+    if background_tasks:
+        for name, task in background_tasks.items():
+            logger.info("Stopping %s...", name)
+            task.cancel()
 
-    # 5. Stop pump automation
-    if pump_automation:
-        try:
-            logger.info("Stopping pump automation")
-            await asyncio.to_thread(pump_automation.stop)
-        except Exception as e:
-            logger.error("Failed to stop pump automation during shutdown", exc_info=True)
-
-    # 6. Cleanup water level sensor
-    if water_sensor:
-        try:
-            logger.info("Cleaning up water level sensor")
-            await asyncio.to_thread(water_sensor.cleanup)
-        except Exception as e:
-            logger.error("Failed to cleanup water sensor during shutdown", exc_info=True)
+        done, pending = await asyncio.wait(
+            background_tasks.values(), timeout=BACKGROUND_TASK_SHUTDOWN_TIMEOUT
+        )
+        for name, task in background_tasks.items():
+            if task in pending:
+                logger.warning(f"Timed out stopping {name} after {BACKGROUND_TASK_SHUTDOWN_TIMEOUT}s")
+            else:
+                logger.info("Stopped %s", name)
 
-    # 7. Cleanup relays
-    if relay_manager:
-        try:
-            logger.info("Cleaning up relays")
-            await asyncio.to_thread(relay_manager.cleanup)
-        except Exception as e:
-            logger.error("Failed to cleanup relays during shutdown", exc_info=True)
+    # Queued MQTT publishes would otherwise never be awaited
+    discard_mqtt_publishes()
 
-    # 8. Turn off LEDs
-    try:
-        logger.info("Turning off LEDs")
-        leds.off()
-    except Exception as e:
-        logger.error("Failed to turn off LEDs during shutdown", exc_info=True)
+    # 5-8. Stop pump automation, cleanup sensors and relays, turn off LEDs
+    await asyncio.to_thread(release_hardware)
 
     logger.info("Shutdown complete")
 
@@ -614,6 +722,10 @@ class SolarRequest(BaseModel):
     duration_override: int | None = Field(None, description="Override duration in seconds")
 
 
+# Valid seasons for error messages (joined once, not per invalid request)
+SEASON_NAMES = ", ".join(SEASONS)
+
+
 class GradientStaticRequest(BaseModel):
     stops: list[ColorStop] = Field(..., min_items=2, description="Color stops (at least 2 required)")
     brightness: float = Field(1.0, ge=0.0, le=1.0, description="Global brightness (0.0-1.0)")
@@ -629,97 +741,268 @@ class GradientAnimatedRequest(BaseModel):
 
 
 def run_async(name: str, fn, *args):
-    """Run animation in managed background thread with cancellation support."""
-
-    # Cancel existing animation with same name
-    if name in active_threads:
-        logger.info(f"Cancelling existing animation: {name}")
-        thread, cancel_event = active_threads[name]
-        cancel_event.set()
-        thread.join(timeout=2.0)
+    """
+    Run animation in managed background thread with cancellation support.
 
+    Returns immediately: an animation already running under the same name
+    is cancelled, and the new thread (not the caller, usually a request
+    handler on the event loop) waits for it to exit before starting.
+    Safe to call from several threads: replacing the registered animation
+    is atomic, so two concurrent calls can't both keep running.
+    """
     cancel_event = threading.Event()
 
     def wrapper():
         try:
-            logger.info(f"Starting animation thread: {name}")
+            if previous:
+                previous[0].join(timeout=2.0)
+            logger.info("Starting animation thread: %s", name)
             fn(*args, cancel_event)
-            logger.info(f"Animation thread completed: {name}")
+            logger.info("Animation thread completed: %s", name)
         except Exception as e:
             logger.error(f"Animation thread failed: {name}", exc_info=True)
         finally:
-            active_threads.pop(name, None)
+            # Only deregister ourselves, not a newer animation under this name
+            with _active_threads_lock:
+                if active_threads.get(name) is entry:
+                    active_threads.pop(name, None)
 
     thread = threading.Thread(target=wrapper, name=name, daemon=False)
-    active_threads[name] = (thread, cancel_event)
-    thread.start()
+    entry = (thread, cancel_event)
+
+    # Cancel existing animation with same name and register the new one
+    with _active_threads_lock:
+        previous = active_threads.get(name)
+        if previous:
+            logger.info("Cancelling existing animation: %s", name)
+            previous[1].set()
+        active_threads[name] = entry
+        # Started under the lock: a snapshot never sees an unstarted thread
+        thread.start()
+
+
+def cancel_animations(timeout: float) -> list[str]:
+    """
+    Cancel all running animations and wait for their threads to stop.
+
+    Every thread is signalled first, then all joins share one deadline, so
+    the total wait is at most timeout however many animations are running.
+
+    Args:
+        timeout: Max seconds to wait for all threads together
+
+    Returns:
+        Names of the cancelled animations
+    """
+    animations = active_threads.copy()
+    for name, (thread, cancel_event) in animations.items():
+        logger.info("Cancelling animation: %s", name)
+        cancel_event.set()
+
+    deadline = time.monotonic() + timeout
+    for name, (thread, cancel_event) in animations.items():
+        thread.join(timeout=max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            logger.warning(f"Animation {name} did not stop within timeout")
+
+    return list(animations)
 
 
 # Global event loop reference (set during lifespan startup)
 main_event_loop: Optional[asyncio.AbstractEventLoop] = None
 
+# Pending fire-and-forget tasks (strong refs so they aren't GC'd)
+_detached_tasks: set[asyncio.Task] = set()
+
+
+def _spawn(coro):
+    """Start coro as a task on the running loop, referenced until it finishes."""
+    task = asyncio.create_task(coro)
+    _detached_tasks.add(task)
+    task.add_done_callback(_detached_tasks.discard)
+    return task
+
+
+# Latest-wins state publishing: one drain task, re-armed by each request
+_state_publish_pending = False
+_state_publish_task: Optional[asyncio.Task] = None
+
+
+async def _drain_state_publishes():
+    """Publish LED state until no request has changed it since the last publish."""
+    global _state_publish_pending
+    while _state_publish_pending:
+        _state_publish_pending = False
+        await publish_state_to_mqtt()
+        await asyncio.sleep(STATE_PUBLISH_MIN_INTERVAL)
+
+
+# Batched MQTT state publishes: newest pending coroutine per key, one drain task
+_mqtt_publish_pending: dict = {}
+_mqtt_publish_task: Optional[asyncio.Task] = None
+
+
+async def _drain_mqtt_publishes():
+    """Flush pending publishes once per MQTT_PUBLISH_BATCH_WINDOW until none are left."""
+    while _mqtt_publish_pending:
+        await asyncio.sleep(MQTT_PUBLISH_BATCH_WINDOW)
+        pending = list(_mqtt_publish_pending.values())
+        _mqtt_publish_pending.clear()
+        # One failing publish must not kill the drain or the rest of the batch
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error("Queued MQTT publish failed", exc_info=result)
+
+
+def enqueue_mqtt_publish(key, coro):
+    """
+    Queue a state publish coroutine for the next batch.
+
+    Everything queued within one MQTT_PUBLISH_BATCH_WINDOW goes out
+    back to back through a single gather. A newer coroutine for the same
+    key replaces (and closes) the pending one: the topics are retained
+    state, so only the latest value matters. Must be called on the event
+    loop; exceptions the coroutine raises are logged by the drain task.
+
+    Args:
+        key: Identifies the state being published (e.g. ("relay", relay_id))
+        coro: Publish coroutine, not yet awaited
+    """
+    global _mqtt_publish_task
+    replaced = _mqtt_publish_pending.pop(key, None)
+    if replaced is not None:
+        replaced.close()
+    _mqtt_publish_pending[key] = coro
+
+    task = _mqtt_publish_task
+    if task is None or task.done():
+        _mqtt_publish_task = _spawn(_drain_mqtt_publishes())
+
+
+def discard_mqtt_publishes():
+    """Close and drop publishes still waiting for a batch (on shutdown)."""
+    for coro in _mqtt_publish_pending.values():
+        coro.close()
+    _mqtt_publish_pending.clear()
+
+
+def publish_state_in_background():
+    """
+    Publish LED state to MQTT without waiting for the broker.
+
+    For request handlers: the response doesn't depend on the publish,
+    which logs its own failures. Must be called on the event loop.
+    No task is created at all when MQTT is disabled.
+
+    Publishes are latest-wins: at most one per STATE_PUBLISH_MIN_INTERVAL,
+    each carrying the state current when it runs, so a burst of requests
+    ends in one publish of the final state.
+    """
+    global _state_publish_pending, _state_publish_task
+    if not MQTT_ENABLED:
+        return
+
+    _state_publish_pending = True
+    task = _state_publish_task
+    if task is None or task.done():
+        _state_publish_task = _spawn(_drain_state_publishes())
+
 
 def schedule_async_task(coro):
     """
     Schedule an async coroutine from a synchronous context (e.g., thread callback).
 
-    Uses asyncio.run_coroutine_threadsafe() to schedule the coroutine in the main event loop.
+    Fire-and-forget: the task is started on the main event loop with
+    call_soon_threadsafe(), without a concurrent.futures.Future to carry
+    back a result nobody reads.
     """
-    if main_event_loop:
+    loop = main_event_loop
+    if loop:
         try:
-            asyncio.run_coroutine_threadsafe(coro, main_event_loop)
+            loop.call_soon_threadsafe(_spawn, coro)
         except Exception as e:
+            coro.close()
             logger.error(f"Failed to schedule async task: {e}")
     else:
+        coro.close()
         logger.warning("Cannot schedule async task: main event loop not set")
 
 
-def shutdown_handler(signum, frame):
-    """Handle SIGTERM/SIGINT for graceful shutdown."""
-    logger.info(f"Received signal {signum}, initiating graceful shutdown")
-    shutdown_event.set()
+# Wakes the temperature poller early (created during lifespan startup)
+temp_wake: Optional[asyncio.Event] = None
 
-    # Cancel all running animations
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        logger.info(f"Cancelling animation: {name}")
-        cancel_event.set()
 
-    # Wait for threads to finish (with timeout)
-    for name, (thread, cancel_event) in list(active_threads.items()):
-        thread.join(timeout=5.0)
-        if thread.is_alive():
-            logger.warning(f"Thread {name} did not stop within timeout")
+def request_temperature_refresh():
+    """
+    Ask the temperature poller to read sensors now instead of at the next interval.
 
-    # Turn off LEDs
-    try:
-        logger.info("Turning off LEDs")
-        leds.off()
-    except Exception as e:
-        logger.error("Failed to turn off LEDs during shutdown", exc_info=True)
+    Safe to call from threads. No-op while temperature polling isn't running.
+    """
+    loop, wake = main_event_loop, temp_wake
+    if wake is not None and loop:
+        loop.call_soon_threadsafe(wake.set)
 
-    # Stop pump automation
-    if pump_automation:
-        try:
-            logger.info("Stopping pump automation")
-            pump_automation.stop()
-        except Exception as e:
-            logger.error("Failed to stop pump automation during shutdown", exc_info=True)
 
-    # Cleanup water level sensor
-    if water_sensor:
-        try:
-            logger.info("Cleaning up water level sensor")
-            water_sensor.cleanup()
-        except Exception as e:
-            logger.error("Failed to cleanup water sensor during shutdown", exc_info=True)
+def release_hardware():
+    """
+    Stop pump automation, clean up sensors and relays and turn off LEDs.
 
-    # Cleanup relays (turn off and release GPIO)
-    if relay_manager:
-        try:
-            logger.info("Cleaning up relays")
-            relay_manager.cleanup()
-        except Exception as e:
-            logger.error("Failed to cleanup relays during shutdown", exc_info=True)
+    Shared by the lifespan shutdown and the signal handler. Runs once per
+    initialize_hardware(); later calls return immediately.
+    """
+    with _release_lock:
+        if hardware_released.is_set():
+            return
+
+        # Stop pump automation
+        if pump_automation:
+            try:
+                logger.info("Stopping pump automation")
+                pump_automation.stop()
+            except Exception as e:
+                logger.error("Failed to stop pump automation during shutdown", exc_info=True)
+
+        # Cleanup water level sensor
+        if water_sensor:
+            try:
+                logger.info("Cleaning up water level sensor")
+                water_sensor.cleanup()
+            except Exception as e:
+                logger.error("Failed to cleanup water sensor during shutdown", exc_info=True)
+
+        # Cleanup relays (turn off and release GPIO)
+        if relay_manager:
+            try:
+                logger.info("Cleaning up relays")
+                relay_manager.cleanup()
+            except Exception as e:
+                logger.error("Failed to cleanup relays during shutdown", exc_info=True)
+
+        # Turn off LEDs (not created yet if shutdown comes before startup)
+        if leds:
+            try:
+                logger.info("Turning off LEDs")
+                leds.off()
+            except Exception as e:
+                logger.error("Failed to turn off LEDs during shutdown", exc_info=True)
+
+        hardware_released.set()
+
+
+def shutdown_handler(signum, frame):
+    """Handle SIGTERM/SIGINT for graceful shutdown."""
+    logger.info(f"Received signal {signum}, initiating graceful shutdown")
+    shutdown_event.set()
+
+    # Under uvicorn the lifespan shutdown has already released everything
+    # (uvicorn re-raises the signal after it), so there is nothing to block on
+    if hardware_released.is_set():
+        logger.info("Hardware already released by application shutdown")
+        return
+
+    # Cancel all running animations and wait for them (5s in total)
+    cancel_animations(timeout=5.0)
+    release_hardware()
 
     logger.info("Shutdown complete")
     # Note: Don't call sys.exit() here - let uvicorn handle shutdown gracefully
@@ -738,7 +1021,7 @@ logger.info("Registered signal handlers for graceful shutdown")
 @backlight_router.post("/rgb")
 async def set_rgb(req: RGBRequest):
     try:
-        logger.debug(f"RGB request: r={req.r}, g={req.g}, b={req.b}, brightness={req.brightness}")
+        logger.debug("RGB request: r=%s, g=%s, b=%s, brightness=%s", req.r, req.g, req.b, req.brightness)
         leds.set_brightness(req.brightness)
         leds.set_rgb(req.r, req.g, req.b)
 
@@ -750,7 +1033,7 @@ async def set_rgb(req: RGBRequest):
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {"status": "ok"}
     except Exception as e:
@@ -761,26 +1044,22 @@ async def set_rgb(req: RGBRequest):
 @backlight_router.post("/hsv")
 async def set_hsv(req: HSVRequest):
     try:
-        logger.debug(f"HSV request: h={req.h}, s={req.s}, v={req.v}, brightness={req.brightness}")
+        logger.debug("HSV request: h=%s, s=%s, v=%s, brightness=%s", req.h, req.s, req.v, req.brightness)
         leds.set_brightness(req.brightness)
         leds.set_hsv(req.h, req.s, req.v)
 
-        # Convert HSV to RGB for state
-        import colorsys
-        h_normalized = (req.h % 360) / 360.0
-        s_normalized = max(0.0, min(1.0, req.s))
-        v_normalized = max(0.0, min(1.0, req.v))
-        r, g, b = colorsys.hsv_to_rgb(h_normalized, s_normalized, v_normalized)
+        # Convert HSV to RGB for state (s and v are range-checked by HSVRequest)
+        rgb = hsv_to_rgb8(req.h, req.s, req.v)
 
         # Update state
         led_state.update(
             mode="hsv",
-            rgb=(int(r * 255), int(g * 255), int(b * 255)),
+            rgb=rgb,
             brightness=req.brightness
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {"status": "ok"}
     except Exception as e:
@@ -791,18 +1070,8 @@ async def set_hsv(req: HSVRequest):
 @backlight_router.post("/off")
 async def off():
     try:
-        # Cancel all running animations first
-        cancelled_animations = []
-        for name, (thread, cancel_event) in list(active_threads.items()):
-            logger.info(f"Cancelling animation: {name}")
-            cancel_event.set()
-            cancelled_animations.append(name)
-
-        # Wait briefly for animations to stop (max 2 seconds)
-        for name, (thread, cancel_event) in list(active_threads.items()):
-            thread.join(timeout=2.0)
-            if thread.is_alive():
-                logger.warning(f"Animation {name} did not stop within timeout")
+        # Cancel all running animations first (max 2 seconds in total)
+        cancelled_animations = cancel_animations(timeout=2.0)
 
         # Now turn off LEDs
         logger.info("Turning off LEDs")
@@ -818,7 +1087,7 @@ async def off():
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {
             "status": "off",
@@ -840,18 +1109,16 @@ async def sunrise_auto(req: SolarRequest):
         if req.season not in SEASONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid season: {req.season}. Must be one of: {', '.join(SEASONS.keys())}"
+                detail=f"Invalid season: {req.season}. Must be one of: {SEASON_NAMES}"
             )
 
         sunrise, _ = get_sun_times(req.latitude, req.longitude)
-        now = datetime.now(sunrise.tzinfo)
-
-        duration = int((sunrise - now).total_seconds())
+        duration = int(sunrise.timestamp() - time.time())
         if req.duration_override:
             duration = req.duration_override
         duration = max(300, duration)
 
-        logger.info(f"Starting sunrise animation: duration={duration}s, season={req.season}, lat={req.latitude}, lon={req.longitude}")
+        logger.info("Starting sunrise animation: duration=%ss, season=%s, lat=%s, lon=%s", duration, req.season, req.latitude, req.longitude)
         run_async("sunrise", cloudy_sunrise, leds, duration, req.season)
 
         # Update state
@@ -861,7 +1128,7 @@ async def sunrise_auto(req: SolarRequest):
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {"mode": "cloudy_sunrise", "duration": duration}
 
@@ -893,18 +1160,16 @@ async def sunset_auto(req: SolarRequest):
         if req.season not in SEASONS:
             raise HTTPException(
                 status_code=400,
-                detail=f"Invalid season: {req.season}. Must be one of: {', '.join(SEASONS.keys())}"
+                detail=f"Invalid season: {req.season}. Must be one of: {SEASON_NAMES}"
             )
 
         _, sunset = get_sun_times(req.latitude, req.longitude)
-        now = datetime.now(sunset.tzinfo)
-
-        duration = int((sunset - now).total_seconds())
+        duration = int(sunset.timestamp() - time.time())
         if req.duration_override:
             duration = req.duration_override
         duration = max(300, duration)
 
-        logger.info(f"Starting sunset animation: duration={duration}s, season={req.season}, lat={req.latitude}, lon={req.longitude}")
+        logger.info("Starting sunset animation: duration=%ss, season=%s, lat=%s, lon=%s", duration, req.season, req.latitude, req.longitude)
         run_async("sunset", cloudy_sunset, leds, duration, req.season)
 
         # Update state
@@ -914,7 +1179,7 @@ async def sunset_auto(req: SolarRequest):
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {"mode": "cloudy_sunset", "duration": duration}
 
@@ -969,24 +1234,24 @@ async def set_gradient_static(req: GradientStaticRequest):
         validate_gradient_config(config)
 
         # Render gradient to pixel array
-        colors = render_gradient(config.stops, LED_COUNT)
+        frame = render_gradient_frame(config.stops, LED_COUNT)
 
         # Apply to LEDs
         leds.set_brightness(config.brightness)
-        leds.set_pixel_array(colors)
+        leds.set_pixel_ndarray(frame)
 
         # Update state
         led_state.update(
             mode="gradient_static",
             gradient_config=config.dict(),
             brightness=config.brightness,
-            rgb=colors[0] if colors else (0, 0, 0)  # First pixel color
+            rgb=tuple(frame[0].tolist()) if len(frame) else (0, 0, 0)  # First pixel color
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
-        logger.info(f"Applied static gradient: {len(req.stops)} stops, brightness={req.brightness}")
+        logger.info("Applied static gradient: %s stops, brightness=%s", len(req.stops), req.brightness)
         return {
             "status": "ok",
             "mode": "gradient_static",
@@ -1055,9 +1320,9 @@ async def set_gradient_animated(req: GradientAnimatedRequest):
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
-        logger.info(f"Started gradient animation: type={req.animation}, duration={req.duration}s, stops={len(req.stops)}")
+        logger.info("Started gradient animation: type=%s, duration=%ss, stops=%s", req.animation, req.duration, len(req.stops))
         return {
             "status": "ok",
             "mode": "gradient_animated",
@@ -1096,7 +1361,7 @@ async def save_gradient_preset_endpoint(preset: GradientPreset):
         validate_gradient_config(preset.config)
         save_preset(preset)
 
-        logger.info(f"Saved gradient preset: {preset.name}")
+        logger.info("Saved gradient preset: %s", preset.name)
         return {
             "status": "ok",
             "name": preset.name,
@@ -1137,15 +1402,15 @@ async def load_gradient_preset_endpoint(name: str):
 
             led_state.update(
                 mode="gradient_animated",
-                gradient_config=preset.config.dict(),
+                gradient_config=preset.config_dict(),
                 active_animation=animation_name,
                 brightness=preset.config.brightness
             )
 
             # Publish to MQTT
-            await publish_state_to_mqtt()
+            publish_state_in_background()
 
-            logger.info(f"Applied animated preset: {name} ({preset.config.animation})")
+            logger.info("Applied animated preset: %s (%s)", name, preset.config.animation)
             return {
                 "status": "ok",
                 "preset": name,
@@ -1154,21 +1419,21 @@ async def load_gradient_preset_endpoint(name: str):
             }
         else:
             # Apply static gradient
-            colors = render_gradient(preset.config.stops, LED_COUNT)
+            frame = render_gradient_frame(preset.config.stops, LED_COUNT)
             leds.set_brightness(preset.config.brightness)
-            leds.set_pixel_array(colors)
+            leds.set_pixel_ndarray(frame)
 
             led_state.update(
                 mode="gradient_static",
-                gradient_config=preset.config.dict(),
+                gradient_config=preset.config_dict(),
                 brightness=preset.config.brightness,
-                rgb=colors[0] if colors else (0, 0, 0)
+                rgb=tuple(frame[0].tolist()) if len(frame) else (0, 0, 0)
             )
 
             # Publish to MQTT
-            await publish_state_to_mqtt()
+            publish_state_in_background()
 
-            logger.info(f"Applied static preset: {name}")
+            logger.info("Applied static preset: %s", name)
             return {
                 "status": "ok",
                 "preset": name,
@@ -1195,7 +1460,7 @@ async def delete_gradient_preset_endpoint(name: str):
                 detail=f"Preset '{name}' not found"
             )
 
-        logger.info(f"Deleted gradient preset: {name}")
+        logger.info("Deleted gradient preset: %s", name)
         return {
             "status": "ok",
             "deleted": name
@@ -1263,24 +1528,19 @@ async def get_all_temperatures():
         readings = await asyncio.to_thread(temp_manager.read_all)
 
         # Convert to JSON-serializable format
-        sensors_data = {}
-        for sensor_id, reading in readings.items():
-            sensors_data[sensor_id] = {
-                "celsius": reading.celsius,
-                "fahrenheit": reading.fahrenheit,
-                "timestamp": reading.timestamp,
-                "valid": reading.valid,
-                "error": reading.error
-            }
+        sensors_data = {
+            sensor_id: reading.as_dict()
+            for sensor_id, reading in readings.items()
+        }
 
         # Update state
         led_state.update(
             temperature_readings=sensors_data,
-            last_temp_update=datetime.now()
+            last_temp_update=time.time()
         )
 
         # Publish to MQTT
-        await publish_state_to_mqtt()
+        publish_state_in_background()
 
         return {
             "sensors": sensors_data,
@@ -1322,11 +1582,7 @@ async def get_sensor_temperature(sensor_id: str):
 
         return {
             "sensor_id": reading.sensor_id,
-            "celsius": reading.celsius,
-            "fahrenheit": reading.fahrenheit,
-            "timestamp": reading.timestamp,
-            "valid": reading.valid,
-            "error": reading.error,
+            **reading.as_dict(),
             "unit": TEMP_UNIT
         }
 
@@ -1491,14 +1747,13 @@ async def turn_relay_on(relay_id: str):
         raise HTTPException(status_code=503, detail="Relay control not enabled")
 
     try:
-        changed = await asyncio.to_thread(relay_manager.turn_on, relay_id)
+        # GPIO write under a short lock: cheaper inline than a thread hop
+        changed = relay_manager.turn_on(relay_id)
         new_state = relay_manager.get_state(relay_id)
 
-        # Publish state to MQTT if enabled
+        # Publish state to MQTT if enabled (in the background, latest state wins)
         if MQTT_ENABLED and RELAY_ENABLED:
-            from app.mqtt_client import publish_relay_state_to_mqtt
-            from app.relay import RelayState
-            await publish_relay_state_to_mqtt(relay_id, new_state)
+            enqueue_relay_publish(relay_id, new_state)
 
         return {
             "relay_id": relay_id,
@@ -1533,14 +1788,13 @@ async def turn_relay_off(relay_id: str):
         raise HTTPException(status_code=503, detail="Relay control not enabled")
 
     try:
-        changed = await asyncio.to_thread(relay_manager.turn_off, relay_id)
+        # GPIO write under a short lock: cheaper inline than a thread hop
+        changed = relay_manager.turn_off(relay_id)
         new_state = relay_manager.get_state(relay_id)
 
-        # Publish state to MQTT if enabled
+        # Publish state to MQTT if enabled (in the background, latest state wins)
         if MQTT_ENABLED and RELAY_ENABLED:
-            from app.mqtt_client import publish_relay_state_to_mqtt
-            from app.relay import RelayState
-            await publish_relay_state_to_mqtt(relay_id, new_state)
+            enqueue_relay_publish(relay_id, new_state)
 
         return {
             "relay_id": relay_id,
@@ -1576,13 +1830,12 @@ async def toggle_relay(relay_id: str):
 
     try:
         previous_state = relay_manager.get_state(relay_id)
-        new_state = await asyncio.to_thread(relay_manager.toggle, relay_id)
+        # GPIO write under a short lock: cheaper inline than a thread hop
+        new_state = relay_manager.toggle(relay_id)
 
-        # Publish state to MQTT if enabled
+        # Publish state to MQTT if enabled (in the background, latest state wins)
         if MQTT_ENABLED and RELAY_ENABLED:
-            from app.mqtt_client import publish_relay_state_to_mqtt
-            from app.relay import RelayState
-            await publish_relay_state_to_mqtt(relay_id, new_state)
+            enqueue_relay_publish(relay_id, new_state)
 
         return {
             "relay_id": relay_id,
@@ -1618,16 +1871,14 @@ async def set_relay_state(relay_id: str, request: RelayStateRequest):
         raise HTTPException(status_code=503, detail="Relay control not enabled")
 
     try:
-        from app.relay import RelayState
-
         target_state = RelayState.ON if request.state == "ON" else RelayState.OFF
-        changed = await asyncio.to_thread(relay_manager.set_state, relay_id, target_state)
+        # GPIO write under a short lock: cheaper inline than a thread hop
+        changed = relay_manager.set_state(relay_id, target_state)
         new_state = relay_manager.get_state(relay_id)
 
-        # Publish state to MQTT if enabled
+        # Publish state to MQTT if enabled (in the background, latest state wins)
         if MQTT_ENABLED and RELAY_ENABLED:
-            from app.mqtt_client import publish_relay_state_to_mqtt
-            await publish_relay_state_to_mqtt(relay_id, new_state)
+            enqueue_relay_publish(relay_id, new_state)
 
         return {
             "relay_id": relay_id,
@@ -1641,24 +1892,19 @@ async def set_relay_state(relay_id: str, request: RelayStateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def publish_relay_state_to_mqtt(relay_id: str, state):
+def enqueue_relay_publish(relay_id: str, state):
     """
-    Publish relay state to MQTT (Home Assistant).
+    Publish relay state to MQTT in the next batch, without waiting for the broker.
+
+    Replaces any state still pending for the same relay, so a burst of
+    toggles ends in one publish of the final state. Must be called on
+    the event loop.
 
     Args:
         relay_id: Relay identifier
         state: Relay state (RelayState.ON or RelayState.OFF)
     """
-    try:
-        from app.mqtt_client import mqtt_service
-        if mqtt_service and mqtt_service.client:
-            from app.relay import RelayState
-            topic = f"homeassistant/switch/{relay_id}/state"
-            payload = "ON" if state == RelayState.ON else "OFF"
-            await mqtt_service.client.publish(topic, payload, retain=True)
-            logger.debug(f"Published relay state to MQTT: {topic} = {payload}")
-    except Exception as e:
-        logger.error(f"Failed to publish relay state to MQTT: {e}")
+    enqueue_mqtt_publish(("relay", relay_id), publish_relay_state_to_mqtt(relay_id, state))
 
 
 # ------------------------------------------------------------------
@@ -1751,11 +1997,10 @@ async def set_pump_automation_mode(request: AutomationModeRequest):
         mode = AutomationMode(request.mode)
         await asyncio.to_thread(pump_automation.set_mode, mode)
 
-        # Publish updated state to MQTT
+        # Publish updated state to MQTT (in the next batch)
         if MQTT_ENABLED and PUMP_AUTOMATION_ENABLED:
-            from app.mqtt_client import publish_pump_automation_to_mqtt
             pump_status = pump_automation.get_status()
-            await publish_pump_automation_to_mqtt(pump_status)
+            enqueue_mqtt_publish("pump_automation", publish_pump_automation_to_mqtt(pump_status))
 
         return {
             "mode": request.mode,
@@ -1782,11 +2027,10 @@ async def reset_pump_automation_stats():
     try:
         await asyncio.to_thread(pump_automation.reset_statistics)
 
-        # Publish updated state to MQTT
+        # Publish updated state to MQTT (in the next batch)
         if MQTT_ENABLED and PUMP_AUTOMATION_ENABLED:
-            from app.mqtt_client import publish_pump_automation_to_mqtt
             pump_status = pump_automation.get_status()
-            await publish_pump_automation_to_mqtt(pump_status)
+            enqueue_mqtt_publish("pump_automation", publish_pump_automation_to_mqtt(pump_status))
 
         return {"message": "Pump automation statistics reset"}
     except Exception as e:
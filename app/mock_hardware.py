@@ -16,6 +16,10 @@ from typing import Optional, Dict, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
+import numpy as np
+
+from app.lighting_math import build_gamma_table, hsv_to_rgb8
+from app.led_kernels import pack_frame
 from app.logger import logger
 
 
@@ -79,6 +83,9 @@ class MockLedStrip:
         self.count = count
         self.brightness = 1.0
         self.gamma = self._build_gamma_table(2.2)
+        self._build_lut()
+        self._pixel_scratch = np.empty((count, 3), dtype=np.uint8)
+        self._packed_scratch = np.empty(count, dtype=np.uint32)
 
         # Use mock hardware
         self.strip = MockPixelStrip(
@@ -88,74 +95,97 @@ class MockLedStrip:
 
         # Thread safety locks (same as real implementation)
         self.lock = threading.Lock()
+        self.anim_active = threading.Lock()
         self.anim_lock = threading.Lock()
 
         logger.info("[MOCK] LED strip ready (mock mode)")
 
     def _build_gamma_table(self, gamma: float):
         """Generate gamma correction lookup table"""
-        return [int(pow(i / 255.0, gamma) * 255.0 + 0.5) for i in range(256)]
+        return build_gamma_table(gamma)
 
     def set_brightness(self, level: float):
         """Set global brightness"""
         with self.lock:
             self.brightness = max(0.0, min(1.0, level))
-            logger.debug(f"[MOCK] Brightness set to {self.brightness:.2f}")
+            self._build_lut()
+            logger.debug("[MOCK] Brightness set to %.2f", self.brightness)
+
+    def _build_lut(self):
+        """Fuse brightness and gamma into one 256-entry lookup table"""
+        self._lut = self.gamma[(np.arange(256) * self.brightness).astype(np.intp)]
+        self._lut_list = self._lut.tolist()
 
     def _apply_pipeline(self, r: int, g: int, b: int):
         """Apply brightness and gamma correction"""
-        r = self.gamma[int(r * self.brightness)]
-        g = self.gamma[int(g * self.brightness)]
-        b = self.gamma[int(b * self.brightness)]
-        return Color(r, g, b)
+        lut = self._lut_list
+        return Color(lut[r], lut[g], lut[b])
+
+    def _write_pixels(self, colors: np.ndarray):
+        """Apply LUT to (N, 3) uint8 pixels and push them (caller holds lock)"""
+        n = min(len(colors), self.count)
+        packed = self._packed_scratch[:n]
+        pack_frame(colors[:n], self._lut, packed, self._pixel_scratch[:n])
+        for i, color in enumerate(packed.tolist()):
+            self.strip.setPixelColor(i, color)
+        self.strip.show()
 
     def set_rgb(self, r: int, g: int, b: int):
         """Set all pixels to RGB color"""
         with self.lock:
             color = self._apply_pipeline(r, g, b)
-            for i in range(self.strip.numPixels()):
+            for i in range(self.count):
                 self.strip.setPixelColor(i, color)
             self.strip.show()
             logger.info(f"[MOCK] Set RGB: ({r}, {g}, {b})")
 
     def set_hsv(self, h: float, s: float, v: float):
         """Set all pixels to HSV color"""
-        import colorsys
-        h = (h % 360) / 360.0
         s = max(0.0, min(1.0, s))
         v = max(0.0, min(1.0, v))
-
-        r, g, b = colorsys.hsv_to_rgb(h, s, v)
-        self.set_rgb(int(r * 255), int(g * 255), int(b * 255))
+        self.set_rgb(*hsv_to_rgb8(h, s, v))
 
     def off(self):
         """Turn off all LEDs"""
         with self.lock:
-            for i in range(self.strip.numPixels()):
+            for i in range(self.count):
                 self.strip.setPixelColor(i, Color(0, 0, 0))
             self.strip.show()
             logger.info("[MOCK] LEDs turned off")
 
+    def flush(self, timeout: float | None = None) -> bool:
+        """No writer thread in the mock: every update is shown immediately"""
+        return True
+
+    def close(self):
+        """No writer thread to stop in the mock"""
+
     def set_pixel_array(self, colors: list[tuple[int, int, int]]):
         """Set individual pixel colors from array"""
         with self.lock:
-            for i, (r, g, b) in enumerate(colors):
-                if i >= self.strip.numPixels():
-                    break
-                color = self._apply_pipeline(r, g, b)
-                self.strip.setPixelColor(i, color)
-            self.strip.show()
+            self._write_pixels(np.asarray(colors, dtype=np.uint8).reshape(-1, 3))
+
+    def set_pixel_ndarray(self, colors: np.ndarray):
+        """Set individual pixel colors from an (N, 3) uint8 array"""
+        with self.lock:
+            self._write_pixels(colors)
+
+    def set_pixel_bytes(self, buf: bytes | bytearray):
+        """Set individual pixel colors from a packed RGB byte buffer"""
+        pixels = np.frombuffer(buf, dtype=np.uint8, count=len(buf) // 3 * 3).reshape(-1, 3)
+        with self.lock:
+            self._write_pixels(pixels)
 
     def set_pixel(self, index: int, r: int, g: int, b: int):
         """Set single pixel color"""
         with self.lock:
-            if 0 <= index < self.strip.numPixels():
+            if 0 <= index < self.count:
                 color = self._apply_pipeline(r, g, b)
                 self.strip.setPixelColor(index, color)
                 self.strip.show()
 
 
-@dataclass
+@dataclass(slots=True)
 class MockTemperatureReading:
     """Mock temperature reading"""
     sensor_id: str
@@ -165,6 +195,16 @@ class MockTemperatureReading:
     valid: bool
     error: Optional[str] = None
 
+    def as_dict(self, into: Optional[dict] = None) -> dict:
+        """JSON-serializable reading (same format as TemperatureReading.as_dict)"""
+        payload = {} if into is None else into
+        payload["celsius"] = self.celsius
+        payload["fahrenheit"] = self.fahrenheit
+        payload["timestamp"] = self.timestamp
+        payload["valid"] = self.valid
+        payload["error"] = self.error
+        return payload
+
 
 class MockDS18B20Sensor:
     """
@@ -185,7 +225,7 @@ class MockDS18B20Sensor:
         self.base_temp = base_temp
         # Add small random offset per sensor for variety
         self.offset = random.uniform(-1.0, 1.0)
-        logger.debug(f"[MOCK] Created temperature sensor: {sensor_id} (base: {base_temp}°C)")
+        logger.debug("[MOCK] Created temperature sensor: %s (base: %s°C)", sensor_id, base_temp)
 
     def read_temperature(self):
         """
@@ -258,7 +298,7 @@ class MockTemperatureSensorManager:
             for sensor_id, sensor in self.sensors.items():
                 reading = sensor.read_temperature()
                 readings[sensor_id] = reading
-                logger.debug(f"[MOCK] Sensor {sensor_id}: {reading.celsius:.2f}°C")
+                logger.debug("[MOCK] Sensor %s: %.2f°C", sensor_id, reading.celsius)
             return readings
 
     def read_sensor(self, sensor_id: str) -> Optional[MockTemperatureReading]:
@@ -10,12 +10,12 @@ Features:
 """
 
 import asyncio
-import json
 import threading
 from typing import Optional, Callable
 from contextlib import AsyncExitStack
 
 import aiomqtt
+import orjson
 from app.config import (
     MQTT_ENABLED,
     MQTT_BROKER,
@@ -23,9 +23,11 @@ from app.config import (
     MQTT_USERNAME,
     MQTT_PASSWORD,
     MQTT_CLIENT_ID,
+    TEMP_PUBLISH_EPSILON,
     TEMP_UNIT,
 )
 from app.logger import logger
+from app.relay import RelayState
 from app.state import led_state
 
 
@@ -303,6 +305,10 @@ class MQTTService:
         self.running = False
         self._last_published_state: Optional[dict] = None
         self._state_publish_lock = asyncio.Lock()
+        # Sensor ID -> (celsius, valid) last published (cleared on reconnect)
+        self._last_temp_published: dict[str, tuple[float, bool]] = {}
+        # Topic -> last retained state payload published (cleared on reconnect)
+        self._last_published: dict[str, str | bytes] = {}
 
     async def start(self):
         """Start MQTT service (runs until cancelled)."""
@@ -340,6 +346,10 @@ class MQTTService:
                     await stack.enter_async_context(self.client)
                     logger.info("Connected to MQTT broker")
 
+                    # Republish every retained state after (re)connecting
+                    self._last_temp_published.clear()
+                    self._last_published.clear()
+
                     # Publish availability (online)
                     await self.client.publish(
                         TOPIC_AVAILABILITY,
@@ -351,30 +361,8 @@ class MQTTService:
                     # Publish Home Assistant Discovery config
                     await self._publish_ha_discovery()
 
-                    # Subscribe to command topics
-                    await self.client.subscribe(TOPIC_HA_COMMAND, qos=1)
-                    await self.client.subscribe(TOPIC_GRADIENT_COMMAND, qos=1)
-
-                    # Subscribe to relay command topics
-                    from app.config import RELAY_ENABLED
-                    if RELAY_ENABLED:
-                        from app.main import relay_manager
-                        if relay_manager:
-                            relay_ids = relay_manager.get_relay_ids()
-                            for relay_id in relay_ids:
-                                relay_command_topic = f"homeassistant/switch/{relay_id}/set"
-                                await self.client.subscribe(relay_command_topic, qos=1)
-                                logger.info(f"Subscribed to relay command topic: {relay_command_topic}")
-
-                    # Subscribe to pump automation command topics
-                    from app.config import PUMP_AUTOMATION_ENABLED
-                    if PUMP_AUTOMATION_ENABLED:
-                        from app.main import pump_automation
-                        if pump_automation:
-                            pump_mode_command_topic = f"hydrosense/{MQTT_CLIENT_ID}/pump_automation/mode/set"
-                            await self.client.subscribe(pump_mode_command_topic, qos=1)
-                            logger.info(f"Subscribed to pump automation mode command topic: {pump_mode_command_topic}")
-
+                    # Subscribe to all command topics (one SUBSCRIBE packet)
+                    await self.client.subscribe(self._command_subscriptions())
                     logger.info("Subscribed to all command topics")
 
                     # Publish initial state
@@ -422,6 +410,36 @@ class MQTTService:
         logger.info("Stopping MQTT service...")
         self.running = False
 
+    def _command_subscriptions(self) -> list[tuple[str, int]]:
+        """
+        Command topics to subscribe to, as (topic, qos) pairs.
+
+        Subscribed with a single SUBSCRIBE, so connecting costs one broker
+        round trip however many relays are configured.
+        """
+        subscriptions = [(TOPIC_HA_COMMAND, 1), (TOPIC_GRADIENT_COMMAND, 1)]
+
+        # Relay command topics
+        from app.config import RELAY_ENABLED
+        if RELAY_ENABLED:
+            from app.main import relay_manager
+            if relay_manager:
+                for relay_id in relay_manager.get_relay_ids():
+                    relay_command_topic = f"homeassistant/switch/{relay_id}/set"
+                    subscriptions.append((relay_command_topic, 1))
+                    logger.info("Subscribing to relay command topic: %s", relay_command_topic)
+
+        # Pump automation command topic
+        from app.config import PUMP_AUTOMATION_ENABLED
+        if PUMP_AUTOMATION_ENABLED:
+            from app.main import pump_automation
+            if pump_automation:
+                pump_mode_command_topic = f"hydrosense/{MQTT_CLIENT_ID}/pump_automation/mode/set"
+                subscriptions.append((pump_mode_command_topic, 1))
+                logger.info("Subscribing to pump automation mode command topic: %s", pump_mode_command_topic)
+
+        return subscriptions
+
     # ------------------------------------------------------------------------
     # Discovery
     # ------------------------------------------------------------------------
@@ -433,7 +451,7 @@ class MQTTService:
             config = get_ha_discovery_config()
             await self.client.publish(
                 TOPIC_HA_CONFIG,
-                payload=json.dumps(config),
+                payload=orjson.dumps(config),
                 qos=1,
                 retain=True,
             )
@@ -446,16 +464,16 @@ class MQTTService:
                 from app.main import temp_manager
                 if temp_manager:
                     sensor_ids = temp_manager.get_sensor_ids()
-                    for sensor_id in sensor_ids:
-                        topic = f"homeassistant/sensor/{MQTT_CLIENT_ID}_{sensor_id}/config"
-                        temp_config = get_temp_sensor_discovery_config(sensor_id)
-
-                        await self.client.publish(
-                            topic,
-                            payload=json.dumps(temp_config),
+                    await asyncio.gather(*(
+                        self.client.publish(
+                            f"homeassistant/sensor/{MQTT_CLIENT_ID}_{sensor_id}/config",
+                            payload=orjson.dumps(get_temp_sensor_discovery_config(sensor_id)),
                             qos=1,
                             retain=True,
                         )
+                        for sensor_id in sensor_ids
+                    ))
+                    for sensor_id in sensor_ids:
                         logger.info(f"Published HA discovery config for temperature sensor {sensor_id}")
 
             # Publish relay switch discovery
@@ -465,29 +483,28 @@ class MQTTService:
                 from app.main import relay_manager
                 if relay_manager:
                     relay_ids = relay_manager.get_relay_ids()
+                    publishes = []
                     for relay_id in relay_ids:
                         relay_info = relay_manager.get_relay_info(relay_id)
-                        topic = f"homeassistant/switch/{relay_id}/config"
                         relay_config = get_relay_discovery_config(relay_id, relay_info['name'])
-
-                        await self.client.publish(
-                            topic,
-                            payload=json.dumps(relay_config),
+                        publishes.append(self.client.publish(
+                            f"homeassistant/switch/{relay_id}/config",
+                            payload=orjson.dumps(relay_config),
                             qos=1,
                             retain=True,
-                        )
-                        logger.info(f"Published HA discovery config for relay switch {relay_id}")
+                        ))
 
-                        # Publish initial state
-                        state_topic = f"homeassistant/switch/{relay_id}/state"
-                        from app.relay import RelayState
+                        # Initial state
                         state_payload = "ON" if relay_info['state'] == RelayState.ON else "OFF"
-                        await self.client.publish(
-                            state_topic,
-                            payload=state_payload,
-                            qos=1,
-                            retain=True,
-                        )
+                        publishes.append(self._publish_retained(
+                            f"homeassistant/switch/{relay_id}/state",
+                            state_payload,
+                            force=True,
+                        ))
+
+                    await asyncio.gather(*publishes)
+                    for relay_id in relay_ids:
+                        logger.info(f"Published HA discovery config for relay switch {relay_id}")
 
             # Publish water level sensor discovery
             from app.config import WATER_LEVEL_ENABLED
@@ -500,7 +517,7 @@ class MQTTService:
 
                     await self.client.publish(
                         topic,
-                        payload=json.dumps(water_config),
+                        payload=orjson.dumps(water_config),
                         qos=1,
                         retain=True,
                     )
@@ -521,7 +538,7 @@ class MQTTService:
                     mode_config = get_pump_mode_sensor_discovery_config()
                     await self.client.publish(
                         mode_topic,
-                        payload=json.dumps(mode_config),
+                        payload=orjson.dumps(mode_config),
                         qos=1,
                         retain=True,
                     )
@@ -532,22 +549,24 @@ class MQTTService:
                     runtime_config = get_pump_runtime_sensor_discovery_config()
                     await self.client.publish(
                         runtime_topic,
-                        payload=json.dumps(runtime_config),
+                        payload=orjson.dumps(runtime_config),
                         qos=1,
                         retain=True,
                     )
                     logger.info(f"Published HA discovery config for pump runtime sensor")
 
                     # Publish pump mode buttons (AUTO, MANUAL, DISABLED)
-                    for mode in ["AUTO", "MANUAL", "DISABLED"]:
-                        button_topic = f"homeassistant/button/pump_mode_{mode.lower()}_{MQTT_CLIENT_ID}/config"
-                        button_config = get_pump_mode_button_discovery_config(mode)
-                        await self.client.publish(
-                            button_topic,
-                            payload=json.dumps(button_config),
+                    modes = ["AUTO", "MANUAL", "DISABLED"]
+                    await asyncio.gather(*(
+                        self.client.publish(
+                            f"homeassistant/button/pump_mode_{mode.lower()}_{MQTT_CLIENT_ID}/config",
+                            payload=orjson.dumps(get_pump_mode_button_discovery_config(mode)),
                             qos=1,
                             retain=True,
                         )
+                        for mode in modes
+                    ))
+                    for mode in modes:
                         logger.info(f"Published HA discovery config for pump mode button: {mode}")
 
                     # Publish initial state
@@ -572,7 +591,7 @@ class MQTTService:
             topic = str(message.topic)
             payload = message.payload.decode()
 
-            logger.debug(f"MQTT message received: topic={topic}, payload={payload}")
+            logger.debug("MQTT message received: topic=%s, payload=%s", topic, payload)
 
             if topic == TOPIC_HA_COMMAND:
                 await self._handle_ha_command(payload)
@@ -606,7 +625,7 @@ class MQTTService:
             payload: JSON string from HA
         """
         try:
-            command = json.loads(payload)
+            command = orjson.loads(payload)
             logger.info(f"HA command received: {command}")
 
             # Execute command (calls REST API logic)
@@ -615,7 +634,7 @@ class MQTTService:
             # Publish updated state back to HA
             await self.publish_state()
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in HA command: {e}")
         except Exception as e:
             logger.error(f"Error executing HA command: {e}", exc_info=True)
@@ -635,7 +654,7 @@ class MQTTService:
             payload: JSON string
         """
         try:
-            command = json.loads(payload)
+            command = orjson.loads(payload)
             logger.info(f"Gradient command received: {command}")
 
             # Execute gradient command
@@ -644,7 +663,7 @@ class MQTTService:
             # Publish updated state
             await self.publish_state()
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Invalid JSON in gradient command: {e}")
         except Exception as e:
             logger.error(f"Error executing gradient command: {e}", exc_info=True)
@@ -672,30 +691,17 @@ class MQTTService:
                 logger.warning("Relay command received but relay_manager not initialized")
                 return
 
-            from app.relay import RelayState
-            import asyncio
-
-            # Execute relay command
+            # Execute relay command (a GPIO write under a short lock, no thread hop needed)
             if payload == "ON":
-                await asyncio.to_thread(relay_manager.turn_on, relay_id)
+                relay_manager.turn_on(relay_id)
             elif payload == "OFF":
-                await asyncio.to_thread(relay_manager.turn_off, relay_id)
+                relay_manager.turn_off(relay_id)
             else:
                 logger.warning(f"Unknown relay command: {payload}")
                 return
 
             # Publish updated state back to MQTT
-            new_state = relay_manager.get_state(relay_id)
-            state_topic = f"homeassistant/switch/{relay_id}/state"
-            state_payload = "ON" if new_state == RelayState.ON else "OFF"
-
-            await self.client.publish(
-                state_topic,
-                payload=state_payload,
-                qos=1,
-                retain=True,
-            )
-            logger.info(f"Published relay state for '{relay_id}': {state_payload}")
+            await self.publish_relay_state(relay_id, relay_manager.get_state(relay_id))
 
         except KeyError:
             logger.error(f"Relay '{relay_id}' not found")
@@ -747,6 +753,29 @@ class MQTTService:
     # State Publishing
     # ------------------------------------------------------------------------
 
+    async def _publish_retained(self, topic: str, payload: str | bytes, force: bool = False) -> bool:
+        """
+        Publish a retained state payload unless the broker already holds it.
+
+        The last payload sent to each topic is remembered; publishing the
+        same payload again would only make the broker re-store and fan out
+        an identical retained message.
+
+        Args:
+            topic: State topic
+            payload: Serialized payload
+            force: Publish even if the payload hasn't changed
+
+        Returns:
+            True if the payload was published
+        """
+        if not force and self._last_published.get(topic) == payload:
+            return False
+
+        await self.client.publish(topic, payload=payload, qos=1, retain=True)
+        self._last_published[topic] = payload
+        return True
+
     async def publish_state(self, force: bool = False):
         """
         Publish current LED state to MQTT.
@@ -774,7 +803,7 @@ class MQTTService:
                 # Publish to HA state topic
                 await self.client.publish(
                     TOPIC_HA_STATE,
-                    payload=json.dumps(state_payload),
+                    payload=orjson.dumps(state_payload),
                     qos=1,
                     retain=True,
                 )
@@ -786,29 +815,32 @@ class MQTTService:
                         "config": led_state.gradient_config,
                         "animation": led_state.active_animation,
                     }
-                    await self.client.publish(
+                    # Brightness/color-only changes leave the gradient state as is
+                    await self._publish_retained(
                         TOPIC_GRADIENT_STATE,
-                        payload=json.dumps(gradient_payload),
-                        qos=1,
-                        retain=True,
+                        orjson.dumps(gradient_payload),
+                        force=force,
                     )
 
                 self._last_published_state = state_payload
-                logger.debug(f"Published state to MQTT: {state_payload}")
+                logger.debug("Published state to MQTT: %s", state_payload)
 
             except Exception as e:
                 logger.error(f"Failed to publish state: {e}", exc_info=True)
 
-    async def publish_temperature_state(self, sensor_id: str, reading: dict):
+    async def publish_temperature_state(self, sensor_id: str, reading: dict) -> bool:
         """
         Publish temperature reading to MQTT.
 
         Args:
             sensor_id: Sensor ID
             reading: Temperature reading dict
+
+        Returns:
+            True if the reading was published
         """
         if not self.client:
-            return
+            return False
 
         try:
             topic = f"hydrosense/{MQTT_CLIENT_ID}/temperature/{sensor_id}/state"
@@ -827,22 +859,90 @@ class MQTTService:
 
             await self.client.publish(
                 topic,
-                payload=json.dumps(payload),
+                payload=orjson.dumps(payload),
                 qos=1,
                 retain=True,
             )
 
-            logger.debug(f"Published temperature for {sensor_id}: {temp_value}°")
+            logger.debug("Published temperature for %s: %s°", sensor_id, temp_value)
+            return True
 
         except Exception as e:
             logger.error(f"Failed to publish temperature for {sensor_id}: {e}", exc_info=True)
+            return False
+
+    async def publish_temperature_states(self, sensors_data: dict):
+        """
+        Publish readings of all temperature sensors concurrently.
 
-    async def publish_water_level_state(self, water_level_info: dict):
+        One publish per sensor, gathered instead of awaited one by one,
+        so a poll cycle costs about one broker round trip instead of N.
+        Sensors whose reading moved less than TEMP_PUBLISH_EPSILON (and
+        kept the same valid flag) since their last publish are skipped;
+        the retained message on the broker is still current for them.
+
+        Args:
+            sensors_data: Sensor ID -> temperature reading dict
+        """
+        if not self.client or not sensors_data:
+            return
+
+        last_published = self._last_temp_published
+        changed = {}
+        for sensor_id, reading in sensors_data.items():
+            current = (reading["celsius"], reading["valid"])
+            last = last_published.get(sensor_id)
+            if (
+                last is None
+                or current[1] != last[1]
+                or abs(current[0] - last[0]) >= TEMP_PUBLISH_EPSILON
+            ):
+                changed[sensor_id] = current
+
+        if not changed:
+            return
+
+        publish = self.publish_temperature_state
+        results = await asyncio.gather(
+            *(publish(sensor_id, sensors_data[sensor_id]) for sensor_id in changed),
+            return_exceptions=True,
+        )
+        for (sensor_id, current), published in zip(changed.items(), results):
+            if published is True:
+                last_published[sensor_id] = current
+
+    async def publish_relay_state(self, relay_id: str, state: RelayState, force: bool = False):
+        """
+        Publish relay switch state to MQTT.
+
+        Args:
+            relay_id: Relay identifier
+            state: Relay state (RelayState.ON or RelayState.OFF)
+            force: Publish even if state hasn't changed
+        """
+        if not self.client:
+            return
+
+        try:
+            topic = f"homeassistant/switch/{relay_id}/state"
+            payload = "ON" if state == RelayState.ON else "OFF"
+
+            if not await self._publish_retained(topic, payload, force=force):
+                logger.debug("Relay %s state unchanged, skipping publish", relay_id)
+                return
+
+            logger.debug("Published relay state to MQTT: %s = %s", topic, payload)
+
+        except Exception as e:
+            logger.error(f"Failed to publish relay state for '{relay_id}': {e}", exc_info=True)
+
+    async def publish_water_level_state(self, water_level_info: dict, force: bool = False):
         """
         Publish water level sensor state to MQTT.
 
         Args:
             water_level_info: Water level sensor info dict from get_info()
+            force: Publish even if the payload hasn't changed
         """
         if not self.client:
             return
@@ -859,24 +959,22 @@ class MQTTService:
                 "active_high": water_level_info["active_high"]
             }
 
-            await self.client.publish(
-                topic,
-                payload=json.dumps(payload),
-                qos=1,
-                retain=True,
-            )
+            if not await self._publish_retained(topic, orjson.dumps(payload), force=force):
+                logger.debug("Water level state unchanged, skipping publish")
+                return
 
-            logger.debug(f"Published water level state: {water_level_info['current_level']}")
+            logger.debug("Published water level state: %s", water_level_info['current_level'])
 
         except Exception as e:
             logger.error(f"Failed to publish water level state: {e}", exc_info=True)
 
-    async def publish_pump_automation_state(self, pump_status: dict):
+    async def publish_pump_automation_state(self, pump_status: dict, force: bool = False):
         """
         Publish pump automation state to MQTT.
 
         Args:
             pump_status: Pump automation status dict from get_status()
+            force: Publish even if the payload hasn't changed
         """
         if not self.client:
             return
@@ -885,7 +983,6 @@ class MQTTService:
             topic = f"hydrosense/{MQTT_CLIENT_ID}/pump_automation/state"
 
             # Format payload for HA (convert enum to string)
-            from app.relay import RelayState
             payload = {
                 "mode": pump_status["mode"],
                 "water_level": pump_status["water_level"],
@@ -907,14 +1004,11 @@ class MQTTService:
                 payload["current_runtime"] = pump_status["current_runtime"]
                 payload["runtime_remaining"] = pump_status["runtime_remaining"]
 
-            await self.client.publish(
-                topic,
-                payload=json.dumps(payload),
-                qos=1,
-                retain=True,
-            )
+            if not await self._publish_retained(topic, orjson.dumps(payload), force=force):
+                logger.debug("Pump automation state unchanged, skipping publish")
+                return
 
-            logger.debug(f"Published pump automation state: mode={pump_status['mode']}, pump={payload['pump_state']}")
+            logger.debug("Published pump automation state: mode=%s, pump=%s", pump_status['mode'], payload['pump_state'])
 
         except Exception as e:
             logger.error(f"Failed to publish pump automation state: {e}", exc_info=True)
@@ -953,23 +1047,38 @@ async def publish_state_to_mqtt(force: bool = False):
         await mqtt_service.publish_state(force=force)
 
 
-async def publish_water_level_to_mqtt(water_level_info: dict):
+async def publish_relay_state_to_mqtt(relay_id: str, state: RelayState, force: bool = False):
+    """
+    Publish relay switch state to MQTT (convenience function).
+
+    Args:
+        relay_id: Relay identifier
+        state: Relay state (RelayState.ON or RelayState.OFF)
+        force: Publish even if state hasn't changed
+    """
+    if mqtt_service:
+        await mqtt_service.publish_relay_state(relay_id, state, force=force)
+
+
+async def publish_water_level_to_mqtt(water_level_info: dict, force: bool = False):
     """
     Publish water level sensor state to MQTT (convenience function).
 
     Args:
         water_level_info: Water level sensor info dict from get_info()
+        force: Publish even if the payload hasn't changed
     """
     if mqtt_service:
-        await mqtt_service.publish_water_level_state(water_level_info)
+        await mqtt_service.publish_water_level_state(water_level_info, force=force)
 
 
-async def publish_pump_automation_to_mqtt(pump_status: dict):
+async def publish_pump_automation_to_mqtt(pump_status: dict, force: bool = False):
     """
     Publish pump automation state to MQTT (convenience function).
 
     Args:
         pump_status: Pump automation status dict from get_status()
+        force: Publish even if the payload hasn't changed
     """
     if mqtt_service:
-        await mqtt_service.publish_pump_automation_state(pump_status)
+        await mqtt_service.publish_pump_automation_state(pump_status, force=force)
@@ -2,14 +2,27 @@
 Astronomical sunrise/sunset calculation using Astral.
 """
 
+from functools import lru_cache
+from datetime import date, datetime, timezone
+
 from astral import LocationInfo
 from astral.sun import sun
-from datetime import datetime, timezone
 
 
 def get_sun_times(latitude: float, longitude: float):
+    """
+    Today's (UTC) sunrise and sunset at a location.
+
+    Cached per location (rounded to 4 decimals, about 11 m) and day, so
+    repeated automation requests for the same place skip the solar math.
+    """
+    today = datetime.now(timezone.utc).date()
+    return _sun_times(round(latitude, 4), round(longitude, 4), today)
+
+
+@lru_cache(maxsize=256)
+def _sun_times(latitude: float, longitude: float, day: date):
+    """Cached body of get_sun_times() (the day in the key expires entries at rollover)."""
     location = LocationInfo(latitude=latitude, longitude=longitude)
-    today = datetime.now(timezone.utc)
-    s = sun(location.observer, date=today)
+    s = sun(location.observer, date=day)
     return s["sunrise"], s["sunset"]
-
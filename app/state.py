@@ -42,11 +42,12 @@ class LEDState:
     # Active animation name (if any)
     active_animation: Optional[str] = None
 
-    # Temperature sensor data (sensor_id -> reading dict)
+    # Temperature sensor data (sensor_id -> reading dict, or reading object
+    # with as_dict() when nothing consumes the serialized form per cycle)
     temperature_readings: Optional[dict[str, Any]] = None
 
-    # Last temperature update timestamp
-    last_temp_update: Optional[datetime] = None
+    # Last temperature update (Unix epoch seconds, rendered only in snapshots)
+    last_temp_update: Optional[float] = None
 
     # Last update timestamp
     last_updated: datetime = field(default_factory=datetime.now)
@@ -117,8 +118,14 @@ class LEDState:
 
             # Add temperature data if available
             if self.temperature_readings:
-                snapshot["temperature_readings"] = self.temperature_readings
-                snapshot["last_temp_update"] = self.last_temp_update.isoformat() if self.last_temp_update else None
+                snapshot["temperature_readings"] = {
+                    sensor_id: reading.as_dict() if hasattr(reading, "as_dict") else reading
+                    for sensor_id, reading in self.temperature_readings.items()
+                }
+                snapshot["last_temp_update"] = (
+                    datetime.fromtimestamp(self.last_temp_update).isoformat()
+                    if self.last_temp_update is not None else None
+                )
 
             return snapshot
 
@@ -13,14 +13,21 @@ import os
 import glob
 import time
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 from dataclasses import dataclass
 
 from app.config import TEMP_W1_BASE_DIR, TEMP_UNIT
 from app.logger import logger
 
+# Max seconds to wait for a bus-wide conversion (DS18B20 at 12 bit: 750 ms)
+BULK_CONVERSION_TIMEOUT = 1.0
 
-@dataclass
+# Max sensors read concurrently when the bus has no bulk conversion
+MAX_CONCURRENT_READS = 8
+
+
+@dataclass(slots=True)
 class TemperatureReading:
     """Single temperature reading from DS18B20."""
     sensor_id: str
@@ -30,6 +37,22 @@ class TemperatureReading:
     valid: bool
     error: Optional[str] = None
 
+    def as_dict(self, into: Optional[dict] = None) -> dict:
+        """
+        JSON-serializable reading (state, API and MQTT payload format).
+
+        Args:
+            into: Existing payload dict to update in place and return
+                  (lets pollers reuse one dict per sensor across cycles)
+        """
+        payload = {} if into is None else into
+        payload["celsius"] = self.celsius
+        payload["fahrenheit"] = self.fahrenheit
+        payload["timestamp"] = self.timestamp
+        payload["valid"] = self.valid
+        payload["error"] = self.error
+        return payload
+
 
 class DS18B20Sensor:
     """Single DS18B20 sensor interface."""
@@ -135,6 +158,12 @@ class TemperatureSensorManager:
         self.lock = threading.Lock()
         self.sensors: Dict[str, DS18B20Sensor] = {}
 
+        # therm_bulk_read files of the 1-Wire bus masters (found on first read)
+        self._bulk_read_files: Optional[List[str]] = None
+
+        # Worker pool for concurrent reads (created on first use, reused across polls)
+        self._read_pool: Optional[ThreadPoolExecutor] = None
+
         # Load kernel modules
         self._load_kernel_modules()
 
@@ -189,22 +218,79 @@ class TemperatureSensorManager:
         """
         Read temperature from all configured sensors.
 
+        Several sensors are converted together with a bus-wide bulk
+        conversion, or read concurrently when the kernel lacks one.
+
         Returns:
             Dictionary mapping sensor_id to TemperatureReading
         """
         with self.lock:
+            sensors = self.sensors
+            if len(sensors) < 2 or self._trigger_bulk_conversion():
+                results = [sensor.read_temperature() for sensor in sensors.values()]
+            else:
+                # Each read runs its own ~750 ms conversion; overlap them
+                if self._read_pool is None:
+                    self._read_pool = ThreadPoolExecutor(
+                        max_workers=MAX_CONCURRENT_READS, thread_name_prefix="ds18b20"
+                    )
+                results = list(self._read_pool.map(DS18B20Sensor.read_temperature, sensors.values()))
+
             readings = {}
-            for sensor_id, sensor in self.sensors.items():
-                reading = sensor.read_temperature()
+            for sensor_id, reading in zip(sensors, results):
                 readings[sensor_id] = reading
 
                 if reading.valid:
-                    logger.debug(f"Sensor {sensor_id}: {reading.celsius:.2f}°C")
+                    logger.debug("Sensor %s: %.2f°C", sensor_id, reading.celsius)
                 else:
                     logger.warning(f"Sensor {sensor_id} read failed: {reading.error}")
 
             return readings
 
+    def _trigger_bulk_conversion(self):
+        """
+        Start the temperature conversion of all sensors on the bus at once.
+
+        Uses the w1_therm therm_bulk_read attribute (Linux 5.10+): one
+        bus-wide Convert T, after which every w1_slave read returns the
+        stored result instead of running its own ~750 ms conversion.
+
+        On kernels without it read_all() reads the sensors concurrently.
+        For externally powered sensors w1_therm releases the bus mutex while
+        it sleeps through the conversion, so those reads overlap. Parasite
+        powered sensors hold it (strong pull-up) for the whole conversion,
+        so their reads still run one after another.
+
+        Returns:
+            True if a bulk conversion was started on at least one bus
+        """
+        if len(self.sensors) < 2:
+            return False
+
+        if self._bulk_read_files is None:
+            self._bulk_read_files = glob.glob(
+                os.path.join(TEMP_W1_BASE_DIR, 'w1_bus_master*', 'therm_bulk_read')
+            )
+
+        triggered = False
+        for path in self._bulk_read_files:
+            try:
+                with open(path, 'w') as f:
+                    f.write('trigger\n')
+                triggered = True
+
+                # Reads -1 while any sensor is still converting
+                deadline = time.monotonic() + BULK_CONVERSION_TIMEOUT
+                while time.monotonic() < deadline:
+                    with open(path, 'r') as f:
+                        if f.read().strip() != '-1':
+                            break
+                    time.sleep(0.05)
+            except OSError as e:
+                logger.debug("Bulk temperature conversion failed on %s: %s", path, e)
+
+        return triggered
+
     def read_sensor(self, sensor_id: str) -> Optional[TemperatureReading]:
         """
         Read temperature from specific sensor.
@@ -231,4 +317,5 @@ class TemperatureSensorManager:
         """Re-discover sensors (useful for hot-plug support)."""
         with self.lock:
             self.sensors.clear()
+            self._bulk_read_files = None
             return self.discover_sensors()
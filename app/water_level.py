@@ -139,10 +139,10 @@ class WaterLevelSensor:
 
                 # Call callback if registered
                 if self.on_state_change:
-                    logger.debug(f"Calling water level callback with {new_level}")
+                    logger.debug("Calling water level callback with %s", new_level)
                     try:
                         self.on_state_change(new_level, water_info)
-                        logger.debug(f"Water level callback completed")
+                        logger.debug("Water level callback completed")
                     except Exception as e:
                         logger.error(f"Error in water level callback: {e}", exc_info=True)
                 else:
@@ -11,6 +11,7 @@ from app.animations import cloudy_sunrise, cloudy_sunset
 def mock_led_strip():
     """Create mock LED strip for animation testing."""
     mock = MagicMock()
+    mock.anim_active = threading.Lock()
     mock.anim_lock = threading.Lock()
     mock.set_hsv = Mock()
     return mock
@@ -101,6 +102,26 @@ class TestCloudySunrise:
         # Now should have made calls
         assert mock_led_strip.set_hsv.call_count > 0
 
+    def test_sunrise_releases_anim_lock_between_frames(self, mock_led_strip, cancel_event):
+        """Should hold anim_lock only while writing a frame."""
+        thread = threading.Thread(
+            target=cloudy_sunrise,
+            args=(mock_led_strip, 2, "spring", cancel_event)
+        )
+        thread.start()
+        time.sleep(0.1)
+
+        try:
+            # Frame lock is free while the animation sleeps between frames
+            assert mock_led_strip.anim_lock.acquire(timeout=0.5)
+            mock_led_strip.anim_lock.release()
+
+            # Animation itself stays exclusive for its whole run
+            assert mock_led_strip.anim_active.locked()
+        finally:
+            cancel_event.set()
+            thread.join(timeout=2)
+
     def test_sunrise_different_seasons(self, mock_led_strip):
         """Should work with different seasons."""
         seasons = ["spring", "summer", "autumn", "winter"]
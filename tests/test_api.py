@@ -2,7 +2,7 @@
 
 import pytest
 from fastapi.testclient import TestClient
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 import threading
 
 
@@ -26,6 +26,9 @@ def test_client(disable_mqtt, disable_temperature, disable_relay, disable_water_
     mock_led_instance.off = MagicMock()
     mock_led_instance.set_brightness = MagicMock()
     mock_led_instance.set_pixel_array = MagicMock()
+    mock_led_instance.set_pixel_ndarray = MagicMock()
+    mock_led_instance.set_pixel_bytes = MagicMock()
+    mock_led_instance.anim_active = threading.Lock()
     mock_led_instance.anim_lock = threading.Lock()
 
     try:
@@ -95,6 +98,18 @@ class TestHSVEndpoint:
         response = test_client.post("/backlight/hsv", json=payload)
         assert response.status_code == 200
 
+    def test_set_hsv_updates_state_rgb(self, test_client):
+        """Should store the converted RGB color in the LED state."""
+        from app.state import led_state
+
+        payload = {"h": 120, "s": 1.0, "v": 0.5}
+
+        response = test_client.post("/backlight/hsv", json=payload)
+
+        assert response.status_code == 200
+        assert led_state.mode == "hsv"
+        assert led_state.rgb == (0, 127, 0)
+
     def test_set_hsv_invalid_hue(self, test_client):
         """Should reject invalid hue values."""
         payload = {"h": 400, "s": 1.0, "v": 1.0}
@@ -113,6 +128,125 @@ class TestOffEndpoint:
         assert response.status_code == 200
 
 
+class TestCancelAnimations:
+    """Tests for cancelling all animation threads."""
+
+    def test_joins_share_one_deadline(self, test_client):
+        """Should wait at most the timeout in total, not per thread."""
+        import time
+        from app import main
+
+        stuck = {}
+        for name in ("a", "b", "c"):
+            thread = MagicMock()
+            thread.join.side_effect = lambda timeout: time.sleep(timeout)
+            thread.is_alive.return_value = True
+            stuck[name] = (thread, threading.Event())
+
+        with patch.dict(main.active_threads, stuck, clear=True):
+            start = time.monotonic()
+            cancelled = main.cancel_animations(timeout=0.2)
+            elapsed = time.monotonic() - start
+
+        assert cancelled == ["a", "b", "c"]
+        assert all(event.is_set() for _, event in stuck.values())
+        assert elapsed < 0.4
+
+
+class TestShutdown:
+    """Tests for hardware release on shutdown."""
+
+    def test_release_hardware_runs_once(self, test_client):
+        """Should release hardware once, later calls are no-ops."""
+        from app import main
+
+        leds = MagicMock()
+        relays = MagicMock()
+        with patch('app.main.leds', leds), \
+             patch('app.main.relay_manager', relays), \
+             patch('app.main.hardware_released', threading.Event()):
+            main.release_hardware()
+            main.release_hardware()
+
+        leds.off.assert_called_once()
+        relays.cleanup.assert_called_once()
+
+    def test_signal_after_release_does_not_block(self, test_client):
+        """Should return at once when the lifespan already released hardware."""
+        from app import main
+
+        released = threading.Event()
+        released.set()
+        with patch('app.main.hardware_released', released), \
+             patch('app.main.cancel_animations') as mock_cancel, \
+             patch('app.main.release_hardware') as mock_release:
+            main.shutdown_handler(15, None)
+
+        mock_cancel.assert_not_called()
+        mock_release.assert_not_called()
+
+
+class TestRunAsync:
+    """Tests for managed animation threads."""
+
+    def test_restart_does_not_block_caller(self, test_client):
+        """Should return at once and start the new animation after the old one exits."""
+        import time
+        from app import main
+
+        release = threading.Event()
+        order = []
+
+        def old_animation(cancel_event):
+            cancel_event.wait()
+            release.wait(timeout=2.0)
+            order.append("old done")
+
+        def new_animation(cancel_event):
+            order.append("new started")
+
+        with patch.dict(main.active_threads, clear=True):
+            main.run_async("test", old_animation)
+            old_thread, old_event = main.active_threads["test"]
+
+            start = time.monotonic()
+            main.run_async("test", new_animation)
+            assert time.monotonic() - start < 0.5
+            assert old_event.is_set()
+
+            new_thread, _ = main.active_threads["test"]
+            release.set()
+            new_thread.join(timeout=2.0)
+
+            assert order == ["old done", "new started"]
+            assert "test" not in main.active_threads
+
+    def test_concurrent_starts_leave_one_animation(self, test_client):
+        """Should cancel every animation but the last registered one."""
+        from app import main
+
+        cancelled = []
+        barrier = threading.Barrier(8)
+
+        def animation(cancel_event):
+            cancelled.append(cancel_event.wait(timeout=1.0))
+
+        def start():
+            barrier.wait()
+            main.run_async("test", animation)
+
+        with patch.dict(main.active_threads, clear=True):
+            callers = [threading.Thread(target=start) for _ in range(8)]
+            for caller in callers:
+                caller.start()
+            for caller in callers:
+                caller.join()
+
+            main.cancel_animations(timeout=5.0)
+
+        assert cancelled == [True] * 8
+
+
 class TestGradientEndpoints:
     """Tests for gradient control endpoints."""
 
@@ -226,6 +360,21 @@ class TestSunriseEndpoint:
         response = test_client.post("/backlight/sunrise/auto", json=payload)
         assert response.status_code == 200
 
+    @patch('app.main.run_async')
+    @patch('app.main.get_sun_times')
+    def test_sunrise_auto_duration_until_sunrise(self, mock_get_sun_times, mock_run_async, test_client):
+        """Should run the animation until the computed sunrise time."""
+        from datetime import datetime, timedelta, timezone
+
+        sunrise = datetime.now(timezone.utc) + timedelta(hours=1)
+        mock_get_sun_times.return_value = (sunrise, sunrise + timedelta(hours=12))
+
+        payload = {"latitude": 53.0, "longitude": 18.0, "season": "spring"}
+        response = test_client.post("/backlight/sunrise/auto", json=payload)
+
+        assert response.status_code == 200
+        assert 3590 <= response.json()["duration"] <= 3600
+
 
 class TestSunsetEndpoint:
     """Tests for sunset animation endpoint."""
@@ -288,6 +437,7 @@ class TestSolarEndpointsErrorHandling:
         response = test_client.post("/backlight/sunrise/auto", json=payload)
         assert response.status_code == 400
         assert "Invalid season" in response.json()["detail"]
+        assert response.json()["detail"].endswith("winter, spring, summer, autumn")
 
     def test_sunset_auto_invalid_season(self, test_client):
         """Should reject invalid season for sunset."""
@@ -536,6 +686,41 @@ class TestRelayEndpoints:
         assert data["relay_id"] == "pump"
         assert data["state"] == "ON"
 
+    @patch('app.main.RELAY_ENABLED', True)
+    @patch('app.main.MQTT_ENABLED', True)
+    @patch('app.main.enqueue_relay_publish')
+    @patch('app.main.relay_manager')
+    def test_toggle_relay_enqueues_mqtt_publish(self, mock_relay_manager, mock_enqueue, test_client):
+        """Should hand the new state to the background publisher."""
+        from app.relay import RelayState
+        mock_relay_manager.toggle.return_value = RelayState.ON
+        response = test_client.post("/relay/pump/toggle")
+        assert response.status_code == 200
+        mock_enqueue.assert_called_once_with("pump", RelayState.ON)
+
+    def test_relay_publishes_coalesce_per_relay(self, test_client):
+        """Should publish only the latest pending state of each relay."""
+        import asyncio
+        from app import main
+        from app.relay import RelayState
+
+        async def scenario():
+            published = []
+
+            async def fake_publish(relay_id, state):
+                published.append((relay_id, state))
+
+            with patch('app.main.publish_relay_state_to_mqtt', fake_publish), \
+                 patch('app.main.MQTT_PUBLISH_BATCH_WINDOW', 0.01):
+                main.enqueue_relay_publish("pump", RelayState.ON)
+                main.enqueue_relay_publish("heater", RelayState.ON)
+                main.enqueue_relay_publish("pump", RelayState.OFF)
+                await asyncio.wait_for(main._mqtt_publish_task, timeout=1.0)
+
+            return sorted(published)
+
+        assert asyncio.run(scenario()) == [("heater", RelayState.ON), ("pump", RelayState.OFF)]
+
 
 # --- Tests for Relay endpoint error handling ---
 class TestRelayEndpointsErrorHandling:
@@ -725,3 +910,336 @@ class TestWaterPumpEndpointsErrorHandling:
         """Should return 503 if pump automation is disabled."""
         response = test_client.post("/pump-automation/reset-stats")
         assert response.status_code == 503
+
+
+class TestMqttCommandBridge:
+    """Tests for MQTT command dispatch."""
+
+    @patch('app.main.run_async')
+    def test_effect_starts_mapped_preset_animation(self, mock_run_async, test_client):
+        """Should start the preset animation from EFFECT_TABLE without modifying the preset."""
+        import asyncio
+        from app import main
+        from app.gradient_presets import get_preset
+
+        preset_before = get_preset("rainbow").config.copy()
+
+        asyncio.run(main.execute_command_bridge({"state": "ON", "brightness": 128, "effect": "gradient_shift"}))
+
+        name, _, _, config, duration = mock_run_async.call_args.args
+        assert name == "gradient_shift"
+        assert config.animation == "shift"
+        assert config.brightness == pytest.approx(128 / 255)
+        assert duration == 0
+        assert get_preset("rainbow").config == preset_before
+
+    @patch('app.main.run_async')
+    def test_unknown_effect_ignored(self, mock_run_async, test_client):
+        """Should ignore effects missing from EFFECT_TABLE."""
+        import asyncio
+        from app import main
+
+        asyncio.run(main.execute_command_bridge({"state": "ON", "effect": "strobe"}))
+
+        mock_run_async.assert_not_called()
+
+    def test_gradient_action_dispatch(self, test_client):
+        """Should route gradient actions through GRADIENT_ACTIONS."""
+        import asyncio
+        from app import main
+
+        handler = MagicMock(side_effect=lambda command: asyncio.sleep(0))
+        with patch.dict(main.GRADIENT_ACTIONS, {"static": handler}):
+            command = {"type": "gradient", "action": "static", "config": {}}
+            asyncio.run(main.execute_command_bridge(command))
+
+        handler.assert_called_once_with(command)
+
+
+class TestPublishStateInBackground:
+    """Tests for fire-and-forget MQTT state publishing."""
+
+    def test_publish_runs_after_caller_returns(self, test_client):
+        """Should schedule the publish and keep a reference until it finishes."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            done = asyncio.Event()
+
+            async def fake_publish():
+                done.set()
+
+            with patch('app.main.publish_state_to_mqtt', fake_publish), \
+                 patch('app.main.MQTT_ENABLED', True), \
+                 patch('app.main.STATE_PUBLISH_MIN_INTERVAL', 0):
+                main.publish_state_in_background()
+                assert len(main._detached_tasks) == 1
+                await asyncio.wait_for(done.wait(), timeout=1.0)
+                await asyncio.sleep(0)
+                await asyncio.sleep(0)
+
+            return len(main._detached_tasks)
+
+        assert asyncio.run(scenario()) == 0
+
+    def test_burst_coalesces_to_latest_state(self, test_client):
+        """Should publish once for a burst, then once more for later changes."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            original_rgb = main.led_state.rgb
+            published = []
+
+            async def fake_publish():
+                published.append(main.led_state.rgb)
+
+            with patch('app.main.publish_state_to_mqtt', fake_publish), \
+                 patch('app.main.MQTT_ENABLED', True), \
+                 patch('app.main.STATE_PUBLISH_MIN_INTERVAL', 0.05):
+                for value in range(10):
+                    main.led_state.update(rgb=(value, 0, 0))
+                    main.publish_state_in_background()
+                await asyncio.sleep(0.01)
+
+                # Changes during the rate-limit window collapse into one publish
+                for value in range(10, 20):
+                    main.led_state.update(rgb=(value, 0, 0))
+                    main.publish_state_in_background()
+                await asyncio.wait_for(main._state_publish_task, timeout=1.0)
+
+            main.led_state.update(rgb=original_rgb)
+            return published
+
+        assert asyncio.run(scenario()) == [(9, 0, 0), (19, 0, 0)]
+
+    def test_no_task_when_mqtt_disabled(self, test_client):
+        """Should not schedule anything while MQTT is disabled."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            with patch('app.main.MQTT_ENABLED', False), \
+                 patch('app.main.publish_state_to_mqtt') as mock_publish:
+                main.publish_state_in_background()
+            return mock_publish.called, len(main._detached_tasks)
+
+        assert asyncio.run(scenario()) == (False, 0)
+
+
+class TestEnqueueMqttPublish:
+    """Tests for batched MQTT state publishing."""
+
+    def test_batch_flushes_together_latest_per_key(self, test_client):
+        """Should publish every key once per window and drop superseded publishes."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            published = []
+
+            async def publish(value):
+                published.append(value)
+
+            with patch('app.main.MQTT_PUBLISH_BATCH_WINDOW', 0.01):
+                superseded = publish("relay old")
+                main.enqueue_mqtt_publish("relay", superseded)
+                main.enqueue_mqtt_publish("pump_automation", publish("pump"))
+                main.enqueue_mqtt_publish("relay", publish("relay new"))
+                assert superseded.cr_frame is None
+                await asyncio.wait_for(main._mqtt_publish_task, timeout=1.0)
+
+            return sorted(published)
+
+        assert asyncio.run(scenario()) == ["pump", "relay new"]
+
+    def test_failing_publish_does_not_drop_batch(self, test_client):
+        """Should log a raising publish and still run the rest of the batch."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            published = []
+
+            async def publish(value):
+                published.append(value)
+
+            async def broken():
+                raise RuntimeError("broker gone")
+
+            with patch('app.main.MQTT_PUBLISH_BATCH_WINDOW', 0.01), \
+                 patch('app.main.logger') as mock_logger:
+                main.enqueue_mqtt_publish("relay", broken())
+                main.enqueue_mqtt_publish("pump_automation", publish("pump"))
+                await asyncio.wait_for(main._mqtt_publish_task, timeout=1.0)
+
+            return published, mock_logger.error.call_count
+
+        assert asyncio.run(scenario()) == (["pump"], 1)
+
+    def test_discard_closes_pending(self, test_client):
+        """Should close queued publishes instead of leaving them never awaited."""
+        from app import main
+
+        async def publish():
+            pass
+
+        coro = publish()
+        main._mqtt_publish_pending["relay"] = coro
+
+        main.discard_mqtt_publishes()
+
+        assert main._mqtt_publish_pending == {}
+        assert coro.cr_frame is None
+
+
+class TestScheduleAsyncTask:
+    """Tests for scheduling coroutines from threads."""
+
+    def test_runs_coroutine_on_main_loop(self, test_client):
+        """Should run the coroutine on the main loop when called from a thread."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            loop = asyncio.get_running_loop()
+            ran_on = []
+            done = asyncio.Event()
+
+            async def job():
+                ran_on.append(asyncio.get_running_loop())
+                done.set()
+
+            with patch('app.main.main_event_loop', loop):
+                await asyncio.to_thread(main.schedule_async_task, job())
+                await asyncio.wait_for(done.wait(), timeout=1.0)
+
+            return ran_on == [loop]
+
+        assert asyncio.run(scenario()) is True
+
+    @patch('app.main.main_event_loop', None)
+    def test_without_loop_closes_coroutine(self, test_client):
+        """Should close the coroutine instead of leaving it never awaited."""
+        from app import main
+
+        async def job():
+            pass
+
+        coro = job()
+        main.schedule_async_task(coro)
+
+        assert coro.cr_frame is None
+
+
+class TestBackgroundTaskSupervision:
+    """Tests for crash handling of lifespan background tasks."""
+
+    def test_crash_cancels_siblings(self, test_client):
+        """Should cancel the other tasks when one of them raises."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            async def crash():
+                raise RuntimeError("boom")
+
+            sibling = asyncio.create_task(asyncio.sleep(10))
+            crashed = asyncio.create_task(crash())
+            main.supervise_background_tasks({"crash": crashed, "sibling": sibling})
+
+            await asyncio.wait([crashed, sibling], timeout=1.0)
+            return sibling.cancelled()
+
+        assert asyncio.run(scenario()) is True
+
+    def test_clean_exit_leaves_siblings_running(self, test_client):
+        """Should not cancel siblings when a task returns normally."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            async def finish():
+                return None
+
+            sibling = asyncio.create_task(asyncio.sleep(10))
+            finished = asyncio.create_task(finish())
+            main.supervise_background_tasks({"finish": finished, "sibling": sibling})
+
+            await finished
+            await asyncio.sleep(0)
+            running = not sibling.done()
+            sibling.cancel()
+            return running
+
+        assert asyncio.run(scenario()) is True
+
+
+class TestTemperatureRefresh:
+    """Tests for on-demand temperature poller wakeup."""
+
+    def test_request_refresh_wakes_poller(self, test_client):
+        """Should set the poller's wake event from any thread."""
+        import asyncio
+        from app import main
+
+        async def scenario():
+            wake = asyncio.Event()
+            with patch('app.main.temp_wake', wake), \
+                 patch('app.main.main_event_loop', asyncio.get_running_loop()):
+                await asyncio.to_thread(main.request_temperature_refresh)
+                await asyncio.wait_for(wake.wait(), timeout=1.0)
+
+        asyncio.run(scenario())
+
+    @patch('app.main.temp_wake', None)
+    def test_request_refresh_without_polling(self, test_client):
+        """Should do nothing when temperature polling isn't running."""
+        from app import main
+
+        main.request_temperature_refresh()
+
+    def test_slow_broker_does_not_delay_state(self, test_client):
+        """Should store new readings even while an MQTT publish is stuck."""
+        import asyncio
+        from app import main
+        from app.temperature import TemperatureReading
+
+        async def scenario():
+            broker = asyncio.Event()
+
+            async def stuck_publish(sensors_data):
+                await broker.wait()
+
+            async def serve():
+                await asyncio.sleep(3600)
+
+            service = MagicMock()
+            service.start = serve
+            service.publish_temperature_states = AsyncMock(side_effect=stuck_publish)
+
+            reads = iter(range(1000))
+            manager = MagicMock()
+            manager.read_all = lambda: {
+                "28-a": TemperatureReading("28-a", 20.0 + next(reads), 68.0, 1.0, True)
+            }
+
+            def init_hardware(app):
+                main.temp_manager = manager
+
+            with patch('app.main.MQTT_ENABLED', True), \
+                 patch('app.main.TEMP_ENABLED', True), \
+                 patch('app.main.TEMP_UPDATE_INTERVAL', 0.02), \
+                 patch('app.main.init_mqtt_service', return_value=service), \
+                 patch('app.main.initialize_hardware', init_hardware), \
+                 patch('app.main.temp_manager', None):
+                async with main.lifespan(main.app):
+                    await asyncio.sleep(0.2)
+                    latest = main.led_state.temperature_readings["28-a"].celsius
+
+            return service.publish_temperature_states.await_count, latest
+
+        publishes, latest = asyncio.run(scenario())
+        assert publishes == 1
+        assert latest > 21.0
@@ -155,3 +155,46 @@ class TestConfigConstants:
         """Should have correct animation FPS."""
         from app.config import ANIMATION_FPS
         assert ANIMATION_FPS == 25
+
+
+class TestConfigObject:
+    """Tests for the frozen Config object."""
+
+    def test_module_constants_match_config(self):
+        """Module-level names should mirror the parsed Config."""
+        with patch.dict(os.environ, {"LED_COUNT": "42", "MQTT_ENABLED": "true"}, clear=True):
+            from importlib import reload
+            import app.config as config
+            reload(config)
+            assert config.CONFIG.led_count == config.LED_COUNT == 42
+            assert config.CONFIG.mqtt_enabled is config.MQTT_ENABLED is True
+
+    def test_config_is_frozen(self):
+        """Should not allow mutating settings after startup."""
+        from dataclasses import FrozenInstanceError
+        from app.config import CONFIG
+
+        with pytest.raises(FrozenInstanceError):
+            CONFIG.led_count = 1
+
+    def test_invalid_number_fails_at_load(self):
+        """Should raise on malformed numeric values when config is built."""
+        from app.config import Config
+
+        with patch.dict(os.environ, {"LED_COUNT": "thirty"}, clear=True):
+            with pytest.raises(ValueError):
+                Config.from_env()
+
+    def test_relay_configs_parsed_once(self):
+        """Should parse RELAY_CONFIG once per value."""
+        env = {"RELAY_CONFIG": "pump:Aquarium Pump:17:true:OFF:60,heater:Heater:27:true:OFF"}
+        with patch.dict(os.environ, env, clear=True):
+            from app.config import Config
+
+            config = Config.from_env()
+            relays = config.relay_configs()
+
+            assert [r.id for r in relays] == ["pump", "heater"]
+            assert relays[0].max_on_time == 60
+            assert relays[1].max_on_time == 0
+            assert config.relay_configs()[0] is relays[0]
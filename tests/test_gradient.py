@@ -3,16 +3,59 @@
 import pytest
 import threading
 import time
+import math
+import numpy as np
 from unittest.mock import Mock, MagicMock, patch
 from app.gradient import (
     ColorStop,
     GradientConfig,
     render_gradient,
+    render_gradient_array,
+    render_gradient_frame,
     validate_gradient_config,
-    animate_gradient
+    animate_gradient,
+    OFFSET_RATE,
 )
 
 
+def _reference_render(stops, pixel_count, offset=0.0):
+    """Original per-pixel render_gradient loop, kept as an independent reference."""
+    sorted_stops = sorted(stops, key=lambda s: s.position)
+    colors = []
+
+    for i in range(pixel_count):
+        if pixel_count == 1:
+            t = 0.0
+        else:
+            t = i / (pixel_count - 1) + offset
+            if offset != 0.0:
+                t = t % 1.0
+
+        left_stop = sorted_stops[0]
+        right_stop = sorted_stops[-1]
+        for j in range(len(sorted_stops) - 1):
+            if sorted_stops[j].position <= t <= sorted_stops[j + 1].position:
+                left_stop = sorted_stops[j]
+                right_stop = sorted_stops[j + 1]
+                break
+
+        if right_stop.position == left_stop.position:
+            factor = 0.0
+        else:
+            factor = (t - left_stop.position) / (right_stop.position - left_stop.position)
+
+        colors.append(tuple(
+            max(0, min(255, int(a + (b - a) * factor)))
+            for a, b in (
+                (left_stop.r, right_stop.r),
+                (left_stop.g, right_stop.g),
+                (left_stop.b, right_stop.b),
+            )
+        ))
+
+    return colors
+
+
 class TestColorStop:
     """Tests for ColorStop model."""
 
@@ -237,6 +280,314 @@ class TestRenderGradient:
         with pytest.raises(ValueError, match="At least 2 color stops required"):
             render_gradient(stops, pixel_count=10)
 
+    def test_repeat_render_is_cached(self):
+        """Should render a stop set once and serve repeats from the cache."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        first = render_gradient(stops, pixel_count=10)
+        with patch('app.gradient.render_gradient_array') as mock_render:
+            second = render_gradient(list(stops), pixel_count=10)
+
+        mock_render.assert_not_called()
+        assert second == first
+
+    def test_cached_result_is_not_shared(self):
+        """Should return a fresh list so callers can't corrupt the cache."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        colors = render_gradient(stops, pixel_count=5)
+        colors[0] = (1, 2, 3)
+
+        assert render_gradient(stops, pixel_count=5)[0] == (255, 0, 0)
+
+
+class TestRenderGradientFrame:
+    """Tests for cached static gradient frames."""
+
+    def test_frame_matches_render_gradient(self):
+        """Should hold the same pixels as render_gradient()."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        frame = render_gradient_frame(stops, pixel_count=10)
+
+        assert frame.shape == (10, 3)
+        assert frame.dtype == np.uint8
+        assert list(map(tuple, frame.tolist())) == render_gradient(stops, pixel_count=10)
+
+    def test_frame_is_shared_and_read_only(self):
+        """Should return the cached frame, protected against writes."""
+        stops = [
+            ColorStop(position=0.0, r=0, g=255, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        frame = render_gradient_frame(stops, pixel_count=8)
+
+        assert render_gradient_frame(list(stops), pixel_count=8) is frame
+        with pytest.raises(ValueError):
+            frame[0] = (1, 2, 3)
+
+
+class TestWarmUp:
+    """Tests for ahead-of-time gradient kernel compilation."""
+
+    def test_warm_up_compiles_numba_kernel(self):
+        """Should run the Numba kernel once when it is the active backend."""
+        from app import gradient
+
+        kernel = MagicMock()
+        with patch.object(gradient, 'NUMBA_AVAILABLE', True), \
+             patch.object(gradient, 'CYTHON_AVAILABLE', False), \
+             patch.object(gradient, '_interpolate_stops_nb', kernel, create=True):
+            gradient.warm_up()
+
+        kernel.assert_called_once()
+
+    def test_warm_up_matches_stop_array_signature(self):
+        """Should compile the signature real renders use (read-only stop arrays)."""
+        from app import gradient
+        if not gradient.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+
+        with patch.object(gradient, 'CYTHON_AVAILABLE', False):
+            gradient.warm_up()
+
+        assert any(
+            not sig[0].mutable and not sig[1].mutable
+            for sig in gradient._interpolate_stops_nb.signatures
+        )
+
+    def test_warm_up_skipped_with_cython(self):
+        """Should not compile anything when the Cython kernel is used."""
+        from app import gradient
+
+        kernel = MagicMock()
+        with patch.object(gradient, 'NUMBA_AVAILABLE', True), \
+             patch.object(gradient, 'CYTHON_AVAILABLE', True), \
+             patch.object(gradient, '_interpolate_stops_nb', kernel, create=True):
+            gradient.warm_up()
+
+        kernel.assert_not_called()
+
+
+class TestRenderGradientArray:
+    """Tests for vectorized gradient rendering."""
+
+    def test_shape_and_dtype(self):
+        """Should return (N, 3) uint8 array."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        colors = render_gradient_array(stops, pixel_count=30)
+
+        assert colors.shape == (30, 3)
+        assert colors.dtype == np.uint8
+
+    def test_matches_reference_loop(self):
+        """Should produce the same pixels as the original per-pixel loop."""
+        stop_sets = [
+            # Stops inside (0, 1): pixels outside them extrapolate and clamp
+            [
+                ColorStop(position=0.2, r=255, g=0, b=0),
+                ColorStop(position=0.5, r=0, g=255, b=0),
+                ColorStop(position=0.8, r=0, g=0, b=255)
+            ],
+            # Two stops, unsorted
+            [
+                ColorStop(position=1.0, r=0, g=0, b=255),
+                ColorStop(position=0.0, r=255, g=128, b=7)
+            ],
+            # Shared position
+            [
+                ColorStop(position=0.0, r=10, g=20, b=30),
+                ColorStop(position=0.5, r=200, g=0, b=0),
+                ColorStop(position=0.5, r=0, g=200, b=0),
+                ColorStop(position=1.0, r=40, g=50, b=250)
+            ],
+        ]
+
+        from app import gradient
+        for compiled in (False, True):
+            with patch.object(gradient, 'CYTHON_AVAILABLE', False), \
+                 patch.object(gradient, 'NUMBA_AVAILABLE', compiled and gradient.NUMBA_AVAILABLE):
+                for stops in stop_sets:
+                    for pixel_count in [1, 2, 17, 60]:
+                        for offset in [0.0, 0.25, 0.9]:
+                            array = render_gradient_array(stops, pixel_count=pixel_count, offset=offset)
+                            expected = _reference_render(stops, pixel_count, offset)
+                            assert [tuple(p) for p in array.tolist()] == expected
+
+    def test_returns_python_ints(self):
+        """List form should contain plain ints (JSON-serializable)."""
+        stops = [
+            ColorStop(position=0.0, r=10, g=20, b=30),
+            ColorStop(position=1.0, r=40, g=50, b=60)
+        ]
+
+        colors = render_gradient(stops, pixel_count=3)
+
+        assert all(type(c) is int for pixel in colors for c in pixel)
+
+    def test_stop_arrays_cached(self):
+        """Should reuse sorted stop arrays for identical stops."""
+        from app.gradient import _stop_arrays
+
+        stops = [
+            ColorStop(position=1.0, r=0, g=0, b=255),
+            ColorStop(position=0.0, r=255, g=0, b=0)
+        ]
+
+        positions, rgb = _stop_arrays(tuple(stops))
+
+        assert positions.tolist() == [0.0, 1.0]
+        assert rgb.tolist() == [[255, 0, 0], [0, 0, 255]]
+        assert _stop_arrays(tuple(stops))[0] is positions
+        assert not positions.flags.writeable
+
+    def test_zero_pixels(self):
+        """Should return empty (0, 3) array for zero pixels."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+
+        assert render_gradient_array(stops, pixel_count=0).shape == (0, 3)
+
+    def test_render_into_out(self):
+        """Should render into the given array in place on every kernel path."""
+        from app import gradient
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=0.5, r=0, g=255, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255)
+        ]
+        expected = render_gradient_array(stops, 30, offset=0.2)
+
+        for compiled in (False, True):
+            out = np.zeros((30, 3), dtype=np.uint8)
+            with patch.object(gradient, 'CYTHON_AVAILABLE', False), \
+                 patch.object(gradient, 'NUMBA_AVAILABLE', compiled and gradient.NUMBA_AVAILABLE):
+                result = render_gradient_array(stops, 30, offset=0.2, out=out)
+
+            assert result is out
+            np.testing.assert_array_equal(out, expected)
+
+    def test_numba_kernel_matches_numpy(self):
+        """Compiled kernel should produce identical output to the NumPy path."""
+        from app import gradient
+        if not gradient.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+
+        positions = np.array([0.0, 0.25, 0.25, 0.8, 1.0])
+        rgb = np.array([[255, 0, 0], [0, 255, 0], [10, 20, 30], [0, 0, 255], [255, 255, 255]], dtype=np.float64)
+        t = np.concatenate([np.linspace(-0.2, 1.2, 301), positions])
+        out = np.empty((len(t), 3), dtype=np.uint8)
+
+        gradient._interpolate_stops_nb(positions, rgb, t, out)
+
+        np.testing.assert_array_equal(out, gradient._interpolate_stops_np(positions, rgb, t))
+
+    def test_two_stop_path_matches_general_numpy(self):
+        """Two-stop fast path should match the general NumPy interpolation."""
+        from app import gradient
+
+        # A duplicate end stop leaves the colors unchanged but forces the general path
+        positions = np.array([0.2, 0.7])
+        rgb = np.array([[255, 10, 0], [3, 128, 255]], dtype=np.float64)
+        t = np.concatenate([np.linspace(-0.2, 1.2, 301), positions])
+
+        general = gradient._interpolate_stops_np(
+            np.array([0.2, 0.7, 0.7]), np.vstack([rgb, rgb[1:]]), t
+        )
+
+        np.testing.assert_array_equal(gradient._interpolate_stops_np(positions, rgb, t), general)
+
+    def test_cython_kernel_matches_numpy(self):
+        """Cython extension (when built) should produce identical output to the NumPy path."""
+        from app import gradient
+        if not gradient.CYTHON_AVAILABLE:
+            pytest.skip("Cython extension not built")
+
+        positions = np.array([0.0, 0.25, 0.25, 0.8, 1.0])
+        rgb = np.array([[255, 0, 0], [0, 255, 0], [10, 20, 30], [0, 0, 255], [255, 255, 255]], dtype=np.float64)
+        t = np.concatenate([np.linspace(-0.2, 1.2, 301), positions])
+        out = np.empty((len(t), 3), dtype=np.uint8)
+
+        gradient._interpolate_stops_c(positions, rgb, t, out)
+
+        np.testing.assert_array_equal(out, gradient._interpolate_stops_np(positions, rgb, t))
+
+
+class TestHueToRgbArray:
+    """Tests for vectorized rainbow hue conversion."""
+
+    def test_matches_colorsys(self):
+        """Should match colorsys.hsv_to_rgb at full saturation/value."""
+        import colorsys
+        from app.gradient import _hue_to_rgb_array
+
+        hues = [i / 97 for i in range(97)] + [1.0, 1 / 6, 0.5, 5 / 6]
+
+        colors = _hue_to_rgb_array(np.array(hues))
+
+        expected = [
+            [int(c * 255) for c in colorsys.hsv_to_rgb(h, 1.0, 1.0)]
+            for h in hues
+        ]
+        assert colors.tolist() == expected
+
+
+    def test_hue_lut(self):
+        """Should precompute one RGB row per hue step."""
+        from app.gradient import HUE_LUT, HUE_LUT_SIZE
+
+        assert HUE_LUT.shape == (HUE_LUT_SIZE, 3)
+        assert HUE_LUT[0].tolist() == [255, 0, 0]
+        assert HUE_LUT[HUE_LUT_SIZE // 3].tolist()[1] == 255  # Green sector
+        assert not HUE_LUT.flags.writeable
+
+    def test_rainbow_frame_close_to_colorsys(self):
+        """Rainbow frames should be within LUT quantization of exact conversion."""
+        import colorsys
+
+        frames = []
+        cancel_event = threading.Event()
+
+        def capture(buf):
+            frames.append(np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3).tolist())
+            cancel_event.set()
+
+        mock_leds = Mock()
+        mock_leds.count = 30
+        mock_leds.anim_active = threading.Lock()
+        mock_leds.anim_lock = threading.Lock()
+        mock_leds.set_pixel_bytes.side_effect = capture
+
+        config = GradientConfig(
+            stops=[
+                ColorStop(position=0.0, r=255, g=0, b=0),
+                ColorStop(position=1.0, r=0, g=0, b=255),
+            ],
+            animation="rainbow",
+            direction="backward"
+        )
+
+        animate_gradient(mock_leds, config, 0, cancel_event)
+
+        for i, pixel in enumerate(frames[0]):
+            expected = [int(c * 255) for c in colorsys.hsv_to_rgb(1.0 - i / 30, 1.0, 1.0)]
+            assert all(abs(a - b) <= 1 for a, b in zip(pixel, expected))
 
 class TestValidateGradientConfig:
     """Tests for gradient configuration validation."""
@@ -307,6 +658,7 @@ class TestAnimateGradient:
         # Create mock LED strip
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -333,12 +685,13 @@ class TestAnimateGradient:
 
         # Verify LED methods were called
         assert mock_leds.set_brightness.called
-        assert mock_leds.set_pixel_array.called
+        assert mock_leds.set_pixel_bytes.called
 
     def test_animate_gradient_pulse(self):
         """Should animate gradient with pulse animation."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -362,12 +715,13 @@ class TestAnimateGradient:
             thread.join(timeout=1.0)
 
         assert mock_leds.set_brightness.called
-        assert mock_leds.set_pixel_array.called
+        assert mock_leds.set_pixel_bytes.called
 
     def test_animate_gradient_rainbow(self):
         """Should animate gradient with rainbow animation."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -391,12 +745,13 @@ class TestAnimateGradient:
             thread.join(timeout=1.0)
 
         assert mock_leds.set_brightness.called
-        assert mock_leds.set_pixel_array.called
+        assert mock_leds.set_pixel_bytes.called
 
     def test_animate_gradient_cancellation(self):
         """Should respect cancellation event."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -422,6 +777,7 @@ class TestAnimateGradient:
         """Should stop after specified duration."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -448,6 +804,7 @@ class TestAnimateGradient:
         """Should animate gradient in backward direction."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -471,7 +828,81 @@ class TestAnimateGradient:
             thread.start()
             thread.join(timeout=1.0)
 
-        assert mock_leds.set_pixel_array.called
+        assert mock_leds.set_pixel_bytes.called
+
+    def test_animate_gradient_shift_frame_matches_render(self):
+        """Shift frames should match render_gradient at the elapsed-time offset."""
+        stops = [
+            ColorStop(position=0.0, r=255, g=0, b=0),
+            ColorStop(position=0.5, r=0, g=255, b=0),
+            ColorStop(position=1.0, r=0, g=0, b=255),
+        ]
+        mock_leds = Mock()
+        mock_leds.count = 10
+
+        config = GradientConfig(stops=stops, animation="shift", speed=5.0, direction="backward")
+
+        with patch('app.gradient._run_frames') as run_frames:
+            animate_gradient(mock_leds, config, 0, threading.Event())
+        render_frame = run_frames.call_args.args[4]
+
+        # Frame offsets are quantized to the oversampled ring (1 / (9 * 16) here)
+        for elapsed in (0.0, 0.08, 1.3):
+            brightness, colors = render_frame(elapsed)
+            offset = 1.0 - (elapsed * 5.0 * OFFSET_RATE) % 1.0
+            expected = render_gradient_array(stops, 10, offset)
+            assert brightness == config.brightness
+            assert np.abs(colors.astype(int) - expected).max() <= 2
+
+    def test_identical_frames_not_rewritten(self):
+        """Should skip the LED write when a frame repeats the previous one."""
+        cancel_event = threading.Event()
+        frames = []
+
+        def next_frame():
+            frames.append(None)
+            if len(frames) == 5:
+                cancel_event.set()
+
+        mock_leds = Mock()
+        mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
+        mock_leds.anim_lock = threading.Lock()
+
+        config = GradientConfig(
+            stops=[ColorStop(position=0.0, r=255, g=0, b=0), ColorStop(position=1.0, r=0, g=0, b=255)],
+            animation="pulse",
+        )
+
+        # Frozen clock: every frame renders the same pixels and brightness
+        with patch('app.gradient.FrameClock') as frame_clock, \
+             patch('app.gradient.time.monotonic', return_value=100.0):
+            frame_clock.return_value.sleep.side_effect = next_frame
+            animate_gradient(mock_leds, config, 0, cancel_event)
+
+        assert len(frames) == 5
+        assert mock_leds.set_pixel_bytes.call_count == 1
+        assert mock_leds.set_brightness.call_count == 1
+
+    def test_animation_speed_driven_by_elapsed_time(self):
+        """Animations should advance by elapsed seconds, not frame count."""
+        config = GradientConfig(
+            stops=[ColorStop(position=0.0, r=255, g=0, b=0), ColorStop(position=1.0, r=0, g=0, b=255)],
+            animation="pulse",
+            speed=1.0,
+        )
+        mock_leds = Mock()
+        mock_leds.count = 5
+
+        with patch('app.gradient._run_frames') as run_frames:
+            animate_gradient(mock_leds, config, 0, threading.Event())
+        render_frame = run_frames.call_args.args[4]
+
+        # 25 frames at 0.05 rad/frame == 1 second at PULSE_RATE
+        # (within half a sample of the 256-entry period table)
+        brightness, _ = render_frame(1.0)
+        expected = config.brightness * (0.3 + 0.7 * (math.sin(25 * 0.05) * 0.5 + 0.5))
+        assert brightness == pytest.approx(expected, abs=0.01)
 
     def test_animate_gradient_unknown_animation(self):
         """Should reject unknown animation type at validation time."""
@@ -496,6 +927,7 @@ class TestAnimateGradient:
         """Should acquire animation lock."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         config = GradientConfig(
@@ -529,6 +961,7 @@ class TestAnimateGradient:
         """Should respect different speed values."""
         mock_leds = Mock()
         mock_leds.count = 10
+        mock_leds.anim_active = threading.Lock()
         mock_leds.anim_lock = threading.Lock()
 
         for speed in [0.5, 1.0, 2.0, 5.0]:
@@ -553,5 +986,5 @@ class TestAnimateGradient:
                 thread.join(timeout=1.0)
 
             # Should have animated
-            assert mock_leds.set_pixel_array.called
+            assert mock_leds.set_pixel_bytes.called
             mock_leds.reset_mock()
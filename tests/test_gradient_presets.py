@@ -3,6 +3,7 @@
 import pytest
 import json
 import tempfile
+import orjson
 from pathlib import Path
 from unittest.mock import patch, mock_open
 from app.gradient_presets import (
@@ -61,6 +62,20 @@ class TestGradientPreset:
 
         assert preset.description == ""
 
+    def test_config_dict_serialized_once(self):
+        """Should return config.dict(), reusing it on later calls."""
+        config = GradientConfig(
+            stops=[
+                ColorStop(position=0.0, r=255, g=0, b=0),
+                ColorStop(position=1.0, r=0, g=0, b=255)
+            ]
+        )
+        preset = GradientPreset(name="test", config=config)
+
+        assert preset.config_dict() == config.dict()
+        assert preset.config_dict() is preset.config_dict()
+        assert "_config_dict" not in preset.dict()
+
 
 class TestDefaultPresets:
     """Tests for built-in default presets."""
@@ -104,6 +119,29 @@ class TestLoadPresets:
             assert len(presets) > 0
             assert "sunset" in presets
 
+    def test_load_presets_default_file_not_writable(self):
+        """Should warn and still return defaults when the defaults file can't be written."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)), \
+                 patch('app.gradient_presets.save_all_presets', side_effect=PermissionError("read-only")), \
+                 patch('app.gradient_presets.logger') as mock_logger:
+                presets = load_presets()
+
+            assert "sunset" in presets
+            mock_logger.warning.assert_called_once()
+
+    def test_load_presets_default_file_unexpected_error(self):
+        """Should not swallow errors other than OSError when creating the defaults file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)), \
+                 patch('app.gradient_presets.save_all_presets', side_effect=TypeError("bug")):
+                with pytest.raises(TypeError):
+                    load_presets()
+
     def test_load_presets_valid_file(self):
         """Should load presets from valid JSON file."""
         preset_data = {
@@ -136,6 +174,45 @@ class TestLoadPresets:
         finally:
             Path(temp_path).unlink()
 
+    def test_load_presets_cached_until_file_changes(self):
+        """Should parse the file once and re-read only after it changes."""
+        import os
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({"sunset": DEFAULT_PRESETS["sunset"].dict()}, f)
+            temp_path = f.name
+
+        try:
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', temp_path), \
+                 patch('app.gradient_presets.orjson.loads', wraps=orjson.loads) as loads:
+                assert list(load_presets()) == ["sunset"]
+                assert list(load_presets()) == ["sunset"]
+                assert loads.call_count == 1
+
+                # External edit (newer mtime) invalidates the cache
+                with open(temp_path, 'w') as f:
+                    json.dump({"ocean": DEFAULT_PRESETS["ocean"].dict()}, f)
+                stat = os.stat(temp_path)
+                os.utime(temp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+                assert list(load_presets()) == ["ocean"]
+                assert loads.call_count == 2
+        finally:
+            Path(temp_path).unlink()
+
+    def test_load_presets_returns_copy(self):
+        """Mutating the returned dict should not affect the cache."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+            json.dump({"sunset": DEFAULT_PRESETS["sunset"].dict()}, f)
+            temp_path = f.name
+
+        try:
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', temp_path):
+                load_presets().clear()
+                assert "sunset" in load_presets()
+        finally:
+            Path(temp_path).unlink()
+
     def test_load_presets_invalid_json(self):
         """Should return default presets when JSON is invalid."""
         with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
@@ -212,6 +289,84 @@ class TestSavePreset:
             Path(temp_path).unlink()
 
 
+class TestSaveAllPresets:
+    """Tests for atomic preset file writes."""
+
+    def test_writes_atomically_and_leaves_no_temp_file(self):
+        """Should replace the file in one step and clean up the temp file."""
+        from app.gradient_presets import save_all_presets
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)), \
+                 patch('app.gradient_presets.os.replace', wraps=__import__('os').replace) as replace:
+                save_all_presets({"sunset": DEFAULT_PRESETS["sunset"]})
+
+            replace.assert_called_once()
+            assert json.loads(temp_path.read_text()) == {"sunset": DEFAULT_PRESETS["sunset"].dict()}
+            assert list(Path(temp_dir).iterdir()) == [temp_path]
+
+    def test_skips_write_when_unchanged(self):
+        """Should not rewrite the file when content is identical."""
+        from app.gradient_presets import save_all_presets
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)):
+                save_all_presets({"sunset": DEFAULT_PRESETS["sunset"]})
+                with patch('app.gradient_presets.os.replace') as replace:
+                    save_all_presets({"sunset": DEFAULT_PRESETS["sunset"]})
+
+            replace.assert_not_called()
+
+
+class TestRawPresetUpdates:
+    """Tests for save/delete updating the file without rebuilding every preset."""
+
+    def test_save_and_delete_do_not_reload_presets(self):
+        """Should update raw file data without load_presets round trips."""
+        config = GradientConfig(
+            stops=[
+                ColorStop(position=0.0, r=255, g=0, b=0),
+                ColorStop(position=1.0, r=0, g=0, b=255)
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+            temp_path.write_text(json.dumps({"sunset": DEFAULT_PRESETS["sunset"].dict()}))
+
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)), \
+                 patch('app.gradient_presets.load_presets') as mock_load:
+                save_preset(GradientPreset(name="custom", config=config))
+                assert delete_preset("sunset") is True
+                mock_load.assert_not_called()
+
+            assert list(json.loads(temp_path.read_text())) == ["custom"]
+
+    def test_cache_follows_save_and_delete(self):
+        """Cached presets should reflect save/delete without re-parsing the file."""
+        config = GradientConfig(
+            stops=[
+                ColorStop(position=0.0, r=255, g=0, b=0),
+                ColorStop(position=1.0, r=0, g=0, b=255)
+            ]
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            temp_path = Path(temp_dir) / "presets.json"
+            temp_path.write_text(json.dumps({"sunset": DEFAULT_PRESETS["sunset"].dict()}))
+
+            with patch('app.gradient_presets.GRADIENT_PRESETS_FILE', str(temp_path)):
+                load_presets()
+                with patch('app.gradient_presets.orjson.loads', wraps=orjson.loads) as loads:
+                    save_preset(GradientPreset(name="custom", config=config))
+                    delete_preset("sunset")
+                    parsed = loads.call_count
+                    assert list(load_presets()) == ["custom"]
+                    assert loads.call_count == parsed
+
+
 class TestGetPreset:
     """Tests for retrieving presets."""
 
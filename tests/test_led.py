@@ -2,6 +2,7 @@
 
 import pytest
 import threading
+import numpy as np
 from unittest.mock import Mock, MagicMock, patch
 
 
@@ -19,7 +20,9 @@ def mock_pixel_strip():
 def led_strip(mock_pixel_strip):
     """Create LedStrip instance with mocked hardware."""
     from app.led import LedStrip
-    return LedStrip(count=30)
+    strip = LedStrip(count=30)
+    yield strip
+    strip.close()
 
 
 class TestLedStripInitialization:
@@ -62,6 +65,14 @@ class TestGammaTable:
         # Gamma should be non-linear
         assert table[128] < 128
 
+    def test_matches_scalar_formula(self):
+        """Vectorized table should equal int(pow(i / 255, gamma) * 255 + 0.5)."""
+        from app.led import build_gamma_table
+
+        for gamma in (1.0, 1.8, 2.2, 2.8):
+            expected = [int(pow(i / 255.0, gamma) * 255.0 + 0.5) for i in range(256)]
+            assert build_gamma_table(gamma).tolist() == expected
+
     def test_gamma_monotonic(self):
         """Should produce monotonically increasing values."""
         from app.led import build_gamma_table
@@ -139,17 +150,30 @@ class TestRGBControl:
     def test_set_rgb(self, led_strip):
         """Should set all pixels to RGB color."""
         led_strip.set_rgb(255, 128, 64)
+        led_strip.flush()
 
         # Verify setPixelColor called for each pixel
         assert led_strip.strip.setPixelColor.call_count == 30
         led_strip.strip.show.assert_called()
 
+    def test_set_rgb_fills_direct_buffer(self, led_strip):
+        """Should fill the mapped driver buffer in one pass when available."""
+        led_strip._led_buffer = np.zeros(30, dtype=np.uint32)
+
+        led_strip.set_rgb(255, 0, 255)
+        led_strip.flush()
+
+        assert led_strip._led_buffer.tolist() == [0xFF00FF] * 30
+        led_strip.strip.setPixelColor.assert_not_called()
+        led_strip.strip.show.assert_called_once()
+
     def test_set_rgb_with_brightness(self, led_strip):
         """Should apply brightness to RGB values."""
         led_strip.set_brightness(0.5)
         led_strip.set_rgb(255, 128, 64)
 
         # Colors should be affected by brightness and gamma
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
     def test_set_rgb_thread_safe(self, led_strip):
@@ -183,27 +207,33 @@ class TestHSVControl:
     def test_set_hsv(self, led_strip):
         """Should convert HSV to RGB and set color."""
         led_strip.set_hsv(0, 1.0, 1.0)  # Red
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
     def test_set_hsv_hue_wrapping(self, led_strip):
         """Should wrap hue values > 360."""
         led_strip.set_hsv(370, 1.0, 1.0)
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
     def test_set_hsv_saturation_clamping(self, led_strip):
         """Should clamp saturation to [0.0, 1.0]."""
         led_strip.set_hsv(180, 1.5, 1.0)
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
         led_strip.set_hsv(180, -0.5, 1.0)
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
     def test_set_hsv_value_clamping(self, led_strip):
         """Should clamp value to [0.0, 1.0]."""
         led_strip.set_hsv(180, 1.0, 1.5)
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
         led_strip.set_hsv(180, 1.0, -0.5)
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
 
@@ -219,6 +249,7 @@ class TestPixelArray:
         ]
 
         led_strip.set_pixel_array(colors)
+        led_strip.flush()
 
         assert led_strip.strip.setPixelColor.call_count == 3
         led_strip.strip.show.assert_called()
@@ -228,6 +259,7 @@ class TestPixelArray:
         colors = [(255, 0, 0)] * 100  # More than 30 pixels
 
         led_strip.set_pixel_array(colors)
+        led_strip.flush()
 
         # Should only set 30 pixels
         assert led_strip.strip.setPixelColor.call_count == 30
@@ -236,8 +268,95 @@ class TestPixelArray:
         """Should handle empty array."""
         led_strip.set_pixel_array([])
 
+        led_strip.flush()
+
         led_strip.strip.show.assert_called()
 
+    def test_set_pixel_ndarray(self, led_strip):
+        """Should set pixel colors from (N, 3) uint8 array like set_pixel_array."""
+        colors = np.array([(255, 0, 0), (0, 255, 0), (0, 0, 255)], dtype=np.uint8)
+
+        led_strip.set_pixel_ndarray(colors)
+        led_strip.flush()
+
+        assert led_strip.strip.setPixelColor.call_count == 3
+        assert led_strip.strip.setPixelColor.call_args_list[1].args == (1, 0x00FF00)
+        led_strip.strip.show.assert_called()
+
+    def test_set_pixel_bytes_applies_pipeline(self, led_strip):
+        """Should apply brightness and gamma like set_pixel_array."""
+        led_strip.set_brightness(0.5)
+        colors = [(255, 0, 0), (10, 128, 200)]
+
+        led_strip.set_pixel_bytes(bytes([c for rgb in colors for c in rgb]))
+        led_strip.flush()
+        from_bytes = [call.args for call in led_strip.strip.setPixelColor.call_args_list]
+        led_strip.strip.setPixelColor.reset_mock()
+        led_strip.set_pixel_array(colors)
+        led_strip.flush()
+        from_tuples = [call.args for call in led_strip.strip.setPixelColor.call_args_list]
+
+        assert from_bytes == from_tuples
+        assert len(from_bytes) == 2
+
+    def test_pixel_pipeline_matches_gamma_of_scaled_channels(self, led_strip):
+        """Fused LUT should equal gamma[int(c * brightness)] per channel, packed as 0xRRGGBB."""
+        from app.led import build_gamma_table
+
+        gamma = build_gamma_table(2.2).tolist()
+        led_strip.set_brightness(0.37)
+        colors = [(255, 0, 0), (10, 128, 200), (1, 2, 3)]
+
+        led_strip.set_pixel_array(colors)
+        led_strip.flush()
+
+        expected = [
+            (gamma[int(r * 0.37)] << 16) | (gamma[int(g * 0.37)] << 8) | gamma[int(b * 0.37)]
+            for r, g, b in colors
+        ]
+        assert [call.args[1] for call in led_strip.strip.setPixelColor.call_args_list] == expected
+
+    def test_set_pixel_bytes_truncation(self, led_strip):
+        """Should not exceed strip length."""
+        led_strip.set_pixel_bytes(bytearray(3 * 100))
+        led_strip.flush()
+
+        assert led_strip.strip.setPixelColor.call_count == 30
+
+    def test_direct_buffer_unavailable_with_mock_driver(self, led_strip):
+        """Should fall back to setPixelColor when the driver buffer can't be mapped."""
+        assert led_strip._led_buffer is None
+
+    def test_set_pixel_array_writes_direct_buffer(self, led_strip):
+        """Should copy packed pixels into the mapped driver buffer when available."""
+        led_strip._led_buffer = np.zeros(30, dtype=np.uint32)
+
+        led_strip.set_pixel_array([(255, 0, 0), (0, 255, 0), (0, 0, 255)])
+        led_strip.flush()
+
+        assert led_strip._led_buffer[:4].tolist() == [0xFF0000, 0x00FF00, 0x0000FF, 0]
+        led_strip.strip.setPixelColor.assert_not_called()
+        led_strip.strip.show.assert_called_once()
+
+    def test_frame_scratch_reused_across_writes(self, led_strip):
+        """Should pack each frame into the same preallocated staging frame."""
+        led_strip._led_buffer = np.zeros(30, dtype=np.uint32)
+        front = led_strip._front
+
+        led_strip.set_pixel_ndarray(np.full((30, 3), 255, dtype=np.uint8))
+        led_strip.set_pixel_ndarray(np.array([[0, 0, 255], [0, 255, 0]], dtype=np.uint8))
+        led_strip.flush()
+
+        assert led_strip._front is front
+        assert led_strip._led_buffer[:3].tolist() == [0x0000FF, 0x00FF00, 0xFFFFFF]
+
+    def test_set_pixel_ndarray_truncation(self, led_strip):
+        """Should not exceed strip length."""
+        led_strip.set_pixel_ndarray(np.full((100, 3), 255, dtype=np.uint8))
+        led_strip.flush()
+
+        assert led_strip.strip.setPixelColor.call_count == 30
+
 
 class TestSinglePixel:
     """Tests for single pixel operations."""
@@ -245,6 +364,7 @@ class TestSinglePixel:
     def test_set_pixel_valid(self, led_strip):
         """Should set single pixel color."""
         led_strip.set_pixel(0, 255, 0, 0)
+        led_strip.flush()
 
         led_strip.strip.setPixelColor.assert_called_once()
         led_strip.strip.show.assert_called()
@@ -272,8 +392,18 @@ class TestTurnOff:
 
         # Should set all pixels to black
         assert led_strip.strip.setPixelColor.call_count == 30
+        led_strip.flush()
         led_strip.strip.show.assert_called()
 
+    def test_off_clears_direct_buffer(self, led_strip):
+        """Should zero the mapped driver buffer when available."""
+        led_strip._led_buffer = np.full(30, 0xFFFFFF, dtype=np.uint32)
+
+        led_strip.off()
+
+        assert not led_strip._led_buffer.any()
+        led_strip.strip.setPixelColor.assert_not_called()
+
 
 class TestAnimationLock:
     """Tests for animation mutex."""
@@ -283,6 +413,11 @@ class TestAnimationLock:
         assert led_strip.anim_lock is not None
         assert isinstance(led_strip.anim_lock, type(threading.Lock()))
 
+    def test_anim_active_exists(self, led_strip):
+        """Should have separate lock marking a running animation."""
+        assert isinstance(led_strip.anim_active, type(threading.Lock()))
+        assert led_strip.anim_active is not led_strip.anim_lock
+
     def test_anim_lock_prevents_concurrent_animations(self, led_strip):
         """Should prevent multiple animations from running simultaneously."""
         acquired = []
@@ -309,3 +444,63 @@ class TestAnimationLock:
         # One should succeed, one should fail
         assert True in acquired
         assert False in acquired
+
+
+class TestWriterThread:
+    """Tests for the background show() writer."""
+
+    def test_flush_waits_for_show(self, led_strip):
+        """Should return once the staged frame has been shown."""
+        led_strip.set_rgb(255, 0, 0)
+
+        assert led_strip.flush(timeout=1.0)
+        led_strip.strip.show.assert_called()
+
+    def test_staged_updates_coalesce(self, led_strip):
+        """Should push several updates staged back to back with one show()."""
+        led_strip.flush(timeout=1.0)
+
+        # Stage a burst while holding the lock, as concurrent callers would
+        with led_strip.lock:
+            for i in range(5):
+                led_strip._fill_pixels(i, i, i)
+
+        assert led_strip.flush(timeout=1.0)
+        led_strip.strip.show.assert_called_once()
+
+    def test_staging_does_not_wait_for_show(self, led_strip):
+        """Should stage new pixels while a show() is still in progress."""
+        in_show = threading.Event()
+        release = threading.Event()
+
+        def slow_show():
+            in_show.set()
+            release.wait(1.0)
+
+        led_strip._led_buffer = np.zeros(30, dtype=np.uint32)
+        led_strip.strip.show.side_effect = slow_show
+        led_strip.set_rgb(255, 0, 0)
+        assert in_show.wait(1.0)
+
+        staged = threading.Thread(target=led_strip.set_pixel_array, args=([(0, 0, 255)],))
+        staged.start()
+        staged.join(0.5)
+        finished_during_show = not staged.is_alive()
+        release.set()
+        staged.join()
+
+        assert finished_during_show
+        assert led_strip.flush(timeout=1.0)
+        assert led_strip._led_buffer[:2].tolist() == [0x0000FF, 0xFF0000]
+
+    def test_off_is_shown_before_returning(self, led_strip):
+        """Should push the cleared frame before off() returns (shutdown path)."""
+        led_strip.off()
+
+        led_strip.strip.show.assert_called()
+
+    def test_close_stops_writer(self, led_strip):
+        """Should stop the writer thread."""
+        led_strip.close()
+
+        assert not led_strip._writer.is_alive()
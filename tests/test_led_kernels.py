@@ -0,0 +1,71 @@
+"""Tests for led_kernels module."""
+
+import numpy as np
+import pytest
+
+from app import led_kernels
+from app.lighting_math import build_gamma_table
+
+
+def _reference(rgb, lut):
+    """Packed 0xRRGGBB computed one pixel at a time."""
+    return [(lut[r] << 16) | (lut[g] << 8) | lut[b] for r, g, b in rgb.tolist()]
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    rgb = rng.integers(0, 256, size=(300, 3), dtype=np.uint8)
+    lut = build_gamma_table(2.2)
+    return rgb, lut
+
+
+class TestPackFrame:
+    """Tests for fused LUT + pack kernel."""
+
+    def test_pack_frame(self, frame):
+        """Should map every channel through the LUT and pack 0xRRGGBB."""
+        rgb, lut = frame
+        out = np.empty(len(rgb), dtype=np.uint32)
+
+        led_kernels.pack_frame(rgb, lut, out, np.empty_like(rgb))
+
+        assert out.tolist() == _reference(rgb, lut.tolist())
+
+    def test_numpy_path(self, frame):
+        """NumPy fallback should match the reference."""
+        rgb, lut = frame
+        out = np.empty(len(rgb), dtype=np.uint32)
+
+        led_kernels._pack_frame_np(rgb, lut, out, np.empty_like(rgb))
+
+        assert out.tolist() == _reference(rgb, lut.tolist())
+
+    def test_numba_kernel_matches_numpy(self, frame):
+        """Compiled kernel should produce identical output to the NumPy path."""
+        if not led_kernels.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+
+        rgb, lut = frame
+        strided = rgb[::2]
+        out_nb = np.empty(len(strided), dtype=np.uint32)
+        out_np = np.empty(len(strided), dtype=np.uint32)
+
+        led_kernels._pack_frame_nb(strided, lut, out_nb)
+        led_kernels._pack_frame_np(strided, lut, out_np, np.empty_like(strided))
+
+        np.testing.assert_array_equal(out_nb, out_np)
+
+    def test_warm_up(self):
+        """Should run without error whether or not numba is installed."""
+        led_kernels.warm_up()
+
+    def test_warm_up_compiles_read_only_frames(self):
+        """Should compile the kernel for read-only (cached) frames too."""
+        if not led_kernels.NUMBA_AVAILABLE:
+            pytest.skip("numba not installed")
+
+        led_kernels.warm_up()
+
+        readonly = [sig for sig in led_kernels._pack_frame_nb.signatures if not sig[0].mutable]
+        assert readonly
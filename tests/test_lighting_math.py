@@ -2,7 +2,8 @@
 
 import pytest
 import math
-from app.lighting_math import smoothstep, lerp, SmoothNoise
+from unittest.mock import patch
+from app.lighting_math import smoothstep, lerp, SmoothNoise, FrameClock, cloudy_frame, hsv_to_rgb, hsv_to_rgb8
 
 
 class TestSmoothstep:
@@ -118,3 +119,100 @@ class TestSmoothNoise:
         noise = SmoothNoise(intensity=0.0)
         for _ in range(10):
             assert noise.step(1.0) == 0.0
+
+
+class TestHsvToRgb:
+    """Tests for table-driven HSV to RGB conversion."""
+
+    def test_matches_colorsys(self):
+        """Should return exactly what colorsys.hsv_to_rgb returns."""
+        import colorsys
+        import random
+
+        rng = random.Random(42)
+        cases = [(0.0, 0.0, 0.0), (0.0, 0.0, 1.0), (1.0, 1.0, 1.0), (0.5, 0.0, 0.7)]
+        cases += [(i / 6, 1.0, 1.0) for i in range(7)]
+        cases += [(rng.random(), rng.random(), rng.random()) for _ in range(2000)]
+
+        for h, s, v in cases:
+            assert hsv_to_rgb(h, s, v) == colorsys.hsv_to_rgb(h, s, v)
+
+    def test_rgb8_from_degrees(self):
+        """Should take hue in degrees (wrapping) and return int(c * 255) channels."""
+        assert hsv_to_rgb8(0, 1.0, 1.0) == (255, 0, 0)
+        assert hsv_to_rgb8(120, 1.0, 0.5) == (0, 127, 0)
+        assert hsv_to_rgb8(480, 1.0, 0.5) == (0, 127, 0)
+        assert hsv_to_rgb8(200, 0.0, 1.0) == (255, 255, 255)
+
+
+class TestCloudyFrame:
+    """Tests for the fused cloudy_frame routine."""
+
+    def test_matches_reference_composition(self):
+        """Should match smoothstep + lerp + SmoothNoise + clamp frame by frame."""
+        steps, dt, max_v = 250, 0.04, 0.9
+        noise = SmoothNoise(intensity=0.03)
+        phase = 0.0
+
+        for i in range(steps + 1):
+            t = smoothstep(i / steps)
+            base_v = lerp(0.01, max_v, t)
+            v = base_v if base_v < 0.15 else base_v + noise.step(dt)
+            expected = (lerp(10.0, 45.0, t), lerp(1.0, 0.25, t), max(0.01, min(max_v, v)))
+
+            h, s, v, phase = cloudy_frame(i / steps, 10.0, 45.0, 1.0, 0.25, 0.01, max_v, max_v, phase, dt, 0.03)
+
+            assert (h, s, v) == pytest.approx(expected)
+            assert phase == pytest.approx(noise.phase)
+
+    def test_no_noise_when_dark(self):
+        """Should not advance noise phase while base brightness is below 0.15."""
+        _, _, v, phase = cloudy_frame(0.0, 10.0, 45.0, 1.0, 0.25, 0.01, 1.0, 1.0, 0.0, 0.04, 0.5)
+
+        assert v == pytest.approx(0.01)
+        assert phase == 0.0
+
+
+class TestFrameClock:
+    """Tests for FrameClock frame pacing."""
+
+    def test_slotted(self):
+        """Should store state in slots (no per-instance __dict__)."""
+        assert not hasattr(FrameClock(25), "__dict__")
+
+    def test_sleeps_remaining_frame_time(self):
+        """Should subtract render time from the frame sleep."""
+        with patch('app.lighting_math.time') as mock_time:
+            mock_time.monotonic.return_value = 100.0
+            clock = FrameClock(25)
+
+            # Frame took 10ms to render
+            mock_time.monotonic.return_value = 100.01
+            clock.sleep()
+
+            delay = mock_time.sleep.call_args[0][0]
+            assert abs(delay - 0.03) < 1e-9
+
+    def test_no_cumulative_drift(self):
+        """Deadlines should advance by exactly one frame each step."""
+        with patch('app.lighting_math.time') as mock_time:
+            mock_time.monotonic.return_value = 0.0
+            clock = FrameClock(25)
+
+            for _ in range(100):
+                clock.sleep()
+
+            assert abs(clock.deadline - 4.0) < 1e-9
+
+    def test_resync_after_overrun(self):
+        """Should resync to now after overrunning by more than a frame."""
+        with patch('app.lighting_math.time') as mock_time:
+            mock_time.monotonic.return_value = 0.0
+            clock = FrameClock(25)
+
+            # Frame stalled for one second
+            mock_time.monotonic.return_value = 1.0
+            clock.sleep()
+
+            mock_time.sleep.assert_not_called()
+            assert clock.deadline == 1.0
@@ -2,6 +2,7 @@
 
 import pytest
 import time
+import numpy as np
 from app.mock_hardware import (
     MockLedStrip,
     MockTemperatureSensorManager,
@@ -95,6 +96,7 @@ class TestMockLedStrip:
         assert len(strip.gamma) == 256
         assert strip.lock is not None
         assert strip.anim_lock is not None
+        assert strip.anim_active is not None
 
     def test_set_brightness(self):
         """Should set brightness."""
@@ -154,6 +156,18 @@ class TestMockLedStrip:
         strip.set_pixel_array([])
         # Should not raise
 
+    def test_set_pixel_ndarray(self):
+        """Should set pixel colors from (N, 3) uint8 array."""
+        strip = MockLedStrip(count=30)
+        strip.set_pixel_ndarray(np.zeros((30, 3), dtype=np.uint8))
+        # Should not raise
+
+    def test_set_pixel_bytes(self):
+        """Should set pixel colors from packed RGB bytes."""
+        strip = MockLedStrip(count=30)
+        strip.set_pixel_bytes(bytearray(3 * 30))
+        # Should not raise
+
     def test_set_pixel(self):
         """Should set single pixel color."""
         strip = MockLedStrip(count=30)
@@ -1,5 +1,6 @@
 import pytest
 import json
+import orjson
 from unittest.mock import MagicMock, AsyncMock, patch
 from app.mqtt_client import (
     get_ha_discovery_config,
@@ -166,7 +167,7 @@ async def test_publish_ha_discovery_all_enabled(
             # LED Light
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/light/test-client-id/config',
-                payload=json.dumps(get_ha_discovery_config()),
+                payload=orjson.dumps(get_ha_discovery_config()),
                 qos=1,
                 retain=True,
             )
@@ -174,7 +175,7 @@ async def test_publish_ha_discovery_all_enabled(
             # Temp Sensor
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/sensor/test-client-id_28-temp-sensor/config',
-                payload=json.dumps(get_temp_sensor_discovery_config("28-temp-sensor")),
+                payload=orjson.dumps(get_temp_sensor_discovery_config("28-temp-sensor")),
                 qos=1,
                 retain=True,
             )
@@ -182,7 +183,7 @@ async def test_publish_ha_discovery_all_enabled(
             # Relay Switch
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/switch/pump/config',
-                payload=json.dumps(get_relay_discovery_config("pump", "Test Pump")),
+                payload=orjson.dumps(get_relay_discovery_config("pump", "Test Pump")),
                 qos=1,
                 retain=True,
             )
@@ -196,7 +197,7 @@ async def test_publish_ha_discovery_all_enabled(
             # Water Level Sensor
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/binary_sensor/water_level_test-client-id/config',
-                payload=json.dumps(get_water_level_discovery_config()),
+                payload=orjson.dumps(get_water_level_discovery_config()),
                 qos=1,
                 retain=True,
             )
@@ -207,33 +208,33 @@ async def test_publish_ha_discovery_all_enabled(
             # Pump Mode Sensor
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/sensor/pump_mode_test-client-id/config',
-                payload=json.dumps(get_pump_mode_sensor_discovery_config()),
+                payload=orjson.dumps(get_pump_mode_sensor_discovery_config()),
                 qos=1,
                 retain=True,
             )
             # Pump Runtime Sensor
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/sensor/pump_runtime_test-client-id/config',
-                payload=json.dumps(get_pump_runtime_sensor_discovery_config()),
+                payload=orjson.dumps(get_pump_runtime_sensor_discovery_config()),
                 qos=1,
                 retain=True,
             )
             # Pump Mode Buttons
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/button/pump_mode_auto_test-client-id/config',
-                payload=json.dumps(get_pump_mode_button_discovery_config("AUTO")),
+                payload=orjson.dumps(get_pump_mode_button_discovery_config("AUTO")),
                 qos=1,
                 retain=True,
             )
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/button/pump_mode_manual_test-client-id/config',
-                payload=json.dumps(get_pump_mode_button_discovery_config("MANUAL")),
+                payload=orjson.dumps(get_pump_mode_button_discovery_config("MANUAL")),
                 qos=1,
                 retain=True,
             )
             mock_mqtt_client_instance.publish.assert_any_call(
                 'homeassistant/button/pump_mode_disabled_test-client-id/config',
-                payload=json.dumps(get_pump_mode_button_discovery_config("DISABLED")),
+                payload=orjson.dumps(get_pump_mode_button_discovery_config("DISABLED")),
                 qos=1,
                 retain=True,
             )
@@ -241,3 +242,194 @@ async def test_publish_ha_discovery_all_enabled(
             mock_publish_pump_automation_state.assert_called_once_with(
                 {"mode": AutomationMode.AUTO}
             )
+
+
+def test_command_subscriptions_all_enabled(mqtt_service, monkeypatch):
+    """Should list every command topic for one SUBSCRIBE."""
+    mock_app_main = MagicMock()
+    mock_app_main.relay_manager.get_relay_ids.return_value = ["pump", "heater"]
+    monkeypatch.setitem(sys.modules, 'app.main', mock_app_main)
+
+    with patch('app.config.RELAY_ENABLED', True), \
+         patch('app.config.PUMP_AUTOMATION_ENABLED', True):
+        subscriptions = mqtt_service._command_subscriptions()
+
+    assert subscriptions == [
+        ('homeassistant/light/test-client-id/command', 1),
+        ('hydrosense/test-client-id/gradient/command', 1),
+        ('homeassistant/switch/pump/set', 1),
+        ('homeassistant/switch/heater/set', 1),
+        ('hydrosense/test-client-id/pump_automation/mode/set', 1),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_publish_temperature_state_payload(mqtt_service):
+    """Test that a temperature reading is published as a JSON bytes payload."""
+    mqtt_service.client = AsyncMock()
+    reading = {"celsius": 21.5, "fahrenheit": 70.7, "timestamp": 1700000000.0, "valid": True, "error": None}
+
+    with patch('app.mqtt_client.TEMP_UNIT', "celsius"):
+        assert await mqtt_service.publish_temperature_state("28-a", reading) is True
+
+    topic = mqtt_service.client.publish.await_args.args[0]
+    payload = mqtt_service.client.publish.await_args.kwargs["payload"]
+    assert topic.endswith("/temperature/28-a/state")
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == {
+        "temperature": 21.5,
+        "sensor_id": "28-a",
+        "valid": True,
+        "timestamp": 1700000000.0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_publish_relay_state(mqtt_service):
+    """Test that relay state is published retained to the switch state topic."""
+    mqtt_service.client = AsyncMock()
+
+    await mqtt_service.publish_relay_state("pump", RelayState.ON)
+
+    mqtt_service.client.publish.assert_awaited_once_with(
+        'homeassistant/switch/pump/state',
+        payload="ON",
+        qos=1,
+        retain=True,
+    )
+
+
+@pytest.mark.asyncio
+async def test_publish_relay_state_skips_unchanged(mqtt_service):
+    """Test that an unchanged relay state is only republished when forced."""
+    mqtt_service.client = AsyncMock()
+
+    await mqtt_service.publish_relay_state("pump", RelayState.ON)
+    await mqtt_service.publish_relay_state("pump", RelayState.ON)
+    assert mqtt_service.client.publish.await_count == 1
+
+    await mqtt_service.publish_relay_state("pump", RelayState.ON, force=True)
+    await mqtt_service.publish_relay_state("pump", RelayState.OFF)
+    assert mqtt_service.client.publish.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_pump_automation_state_skips_unchanged(mqtt_service):
+    """Test that an identical pump automation payload is not republished."""
+    mqtt_service.client = AsyncMock()
+    status = {
+        "mode": "AUTO", "water_level": "OK", "pump_state": RelayState.OFF,
+        "pump_relay_id": "pump", "on_interval": 60, "off_interval": 300,
+        "max_runtime": 600, "cycle_count": 0, "total_runtime": 0.0,
+        "automation_active": True,
+    }
+
+    await mqtt_service.publish_pump_automation_state(status)
+    await mqtt_service.publish_pump_automation_state(dict(status))
+    assert mqtt_service.client.publish.await_count == 1
+
+    await mqtt_service.publish_pump_automation_state({**status, "cycle_count": 1})
+    assert mqtt_service.client.publish.await_count == 2
+    payload = mqtt_service.client.publish.await_args.kwargs["payload"]
+    assert json.loads(payload)["cycle_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_publish_water_level_state_skips_unchanged(mqtt_service):
+    """Test that an identical water level payload is not republished until reconnect clears it."""
+    mqtt_service.client = AsyncMock()
+    info = {
+        "current_level": "OK", "gpio_pin": 17, "gpio_state": 1,
+        "last_change": 1700000000.0, "active_high": True,
+    }
+
+    await mqtt_service.publish_water_level_state(info)
+    await mqtt_service.publish_water_level_state(dict(info))
+    assert mqtt_service.client.publish.await_count == 1
+
+    await mqtt_service.publish_water_level_state({**info, "current_level": "LOW"})
+    assert mqtt_service.client.publish.await_count == 2
+
+    mqtt_service._last_published.clear()
+    await mqtt_service.publish_water_level_state({**info, "current_level": "LOW"})
+    assert mqtt_service.client.publish.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_state_payload(mqtt_service):
+    """Test that the LED state is published as a JSON bytes payload and debounced."""
+    mqtt_service.client = AsyncMock()
+    state_payload = {"state": "ON", "brightness": 255, "color": {"r": 1, "g": 2, "b": 3}}
+
+    with patch('app.mqtt_client.led_state') as mock_state:
+        mock_state.to_mqtt_payload.return_value = state_payload
+        mock_state.mode = "rgb"
+        await mqtt_service.publish_state()
+        await mqtt_service.publish_state()
+
+    mqtt_service.client.publish.assert_awaited_once()
+    payload = mqtt_service.client.publish.await_args.kwargs["payload"]
+    assert isinstance(payload, bytes)
+    assert json.loads(payload) == state_payload
+
+
+@pytest.mark.asyncio
+async def test_publish_temperature_states_publishes_every_sensor(mqtt_service):
+    """Test that all sensor readings are published in one gathered batch."""
+    mqtt_service.client = AsyncMock()
+    readings = {
+        "28-a": {"celsius": 21.5, "fahrenheit": 70.7, "timestamp": "now", "valid": True, "error": None},
+        "28-b": {"celsius": 22.0, "fahrenheit": 71.6, "timestamp": "now", "valid": True, "error": None},
+    }
+
+    with patch.object(mqtt_service, 'publish_temperature_state', new_callable=AsyncMock) as mock_publish:
+        await mqtt_service.publish_temperature_states(readings)
+
+    assert mock_publish.await_count == 2
+    mock_publish.assert_any_await("28-a", readings["28-a"])
+    mock_publish.assert_any_await("28-b", readings["28-b"])
+
+
+@pytest.mark.asyncio
+async def test_publish_temperature_states_without_client(mqtt_service):
+    """Test that nothing is published while disconnected."""
+    mqtt_service.client = None
+
+    with patch.object(mqtt_service, 'publish_temperature_state', new_callable=AsyncMock) as mock_publish:
+        await mqtt_service.publish_temperature_states({"28-a": {}})
+
+    mock_publish.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_publish_temperature_states_skips_unchanged(mqtt_service):
+    """Test that readings within TEMP_PUBLISH_EPSILON of the last publish are skipped."""
+    mqtt_service.client = AsyncMock()
+    reading = {"celsius": 21.5, "fahrenheit": 70.7, "timestamp": "t0", "valid": True, "error": None}
+
+    with patch('app.mqtt_client.TEMP_PUBLISH_EPSILON', 0.1), \
+         patch.object(mqtt_service, 'publish_temperature_state', new_callable=AsyncMock, return_value=True) as mock_publish:
+        await mqtt_service.publish_temperature_states({"28-a": reading})
+        await mqtt_service.publish_temperature_states({"28-a": {**reading, "celsius": 21.55, "timestamp": "t1"}})
+        assert mock_publish.await_count == 1
+
+        # Moved by at least epsilon
+        await mqtt_service.publish_temperature_states({"28-a": {**reading, "celsius": 21.6}})
+        assert mock_publish.await_count == 2
+
+        # Valid flag flipped
+        await mqtt_service.publish_temperature_states({"28-a": {**reading, "celsius": 21.6, "valid": False}})
+        assert mock_publish.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_publish_temperature_states_retries_failed_publish(mqtt_service):
+    """Test that a failed publish is retried on the next cycle."""
+    mqtt_service.client = AsyncMock()
+    reading = {"celsius": 21.5, "fahrenheit": 70.7, "timestamp": "t0", "valid": True, "error": None}
+
+    with patch.object(mqtt_service, 'publish_temperature_state', new_callable=AsyncMock, side_effect=[False, True]) as mock_publish:
+        await mqtt_service.publish_temperature_states({"28-a": reading})
+        await mqtt_service.publish_temperature_states({"28-a": reading})
+
+    assert mock_publish.await_count == 2
@@ -0,0 +1,36 @@
+"""Tests for sunrise/sunset calculation."""
+
+from unittest.mock import patch
+
+from app import solar_time
+from app.solar_time import get_sun_times
+
+
+class TestGetSunTimes:
+    """Tests for cached sun time lookup."""
+
+    def setup_method(self):
+        solar_time._sun_times.cache_clear()
+
+    def test_returns_sunrise_and_sunset(self):
+        """Should return (sunrise, sunset) with sunrise first."""
+        sunrise, sunset = get_sun_times(52.2297, 21.0122)
+
+        assert sunrise < sunset
+
+    def test_repeat_lookup_is_cached(self):
+        """Should compute a location's times once per day."""
+        with patch.object(solar_time, 'sun', wraps=solar_time.sun) as mock_sun:
+            first = get_sun_times(52.2297, 21.0122)
+            second = get_sun_times(52.22970001, 21.01220001)
+
+        assert mock_sun.call_count == 1
+        assert second == first
+
+    def test_different_locations_not_shared(self):
+        """Should compute separately for locations further apart."""
+        with patch.object(solar_time, 'sun', wraps=solar_time.sun) as mock_sun:
+            get_sun_times(52.2297, 21.0122)
+            get_sun_times(50.0647, 19.9450)
+
+        assert mock_sun.call_count == 2
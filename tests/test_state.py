@@ -146,7 +146,7 @@ class TestLEDState:
         """Should include temperature data in snapshot if available."""
         state = LEDState()
         temp_readings = {"sensor_1": {"celsius": 22.5}}
-        temp_update = datetime.now()
+        temp_update = time.time()
 
         state.update(
             mode="rgb",
@@ -157,7 +157,23 @@ class TestLEDState:
         snapshot = state.get_snapshot()
 
         assert snapshot["temperature_readings"] == temp_readings
-        assert snapshot["last_temp_update"] == temp_update.isoformat()
+        assert snapshot["last_temp_update"] == datetime.fromtimestamp(temp_update).isoformat()
+
+    def test_get_snapshot_serializes_reading_objects(self):
+        """Should convert stored reading objects with as_dict()."""
+        from app.temperature import TemperatureReading
+
+        state = LEDState()
+        reading = TemperatureReading(
+            sensor_id="sensor_1", celsius=22.5, fahrenheit=72.5,
+            timestamp=time.time(), valid=True,
+        )
+
+        state.update(temperature_readings={"sensor_1": reading}, last_temp_update=time.time())
+
+        snapshot = state.get_snapshot()
+
+        assert snapshot["temperature_readings"] == {"sensor_1": reading.as_dict()}
 
     def test_get_snapshot_thread_safe(self):
         """Should provide thread-safe snapshot."""
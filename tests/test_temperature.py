@@ -2,6 +2,7 @@
 
 import pytest
 import os
+import time
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, mock_open
@@ -46,6 +47,38 @@ class TestTemperatureReading:
         assert reading.valid is False
         assert reading.error == 'Sensor disconnected'
 
+    def test_as_dict(self):
+        """Should convert to the JSON payload used by state, API and MQTT."""
+        reading = TemperatureReading(
+            sensor_id='28-test-01',
+            celsius=22.5,
+            fahrenheit=72.5,
+            timestamp=1234567890.0,
+            valid=True
+        )
+
+        assert reading.as_dict() == {
+            "celsius": 22.5,
+            "fahrenheit": 72.5,
+            "timestamp": 1234567890.0,
+            "valid": True,
+            "error": None,
+        }
+
+    def test_as_dict_into_existing(self):
+        """Should update and return the given payload dict in place."""
+        payload = {"celsius": 0.0}
+        reading = TemperatureReading(
+            sensor_id='28-test-01',
+            celsius=22.5,
+            fahrenheit=72.5,
+            timestamp=1234567890.0,
+            valid=True
+        )
+
+        assert reading.as_dict(payload) is payload
+        assert payload == reading.as_dict()
+
 
 class TestDS18B20Sensor:
     """Tests for DS18B20Sensor."""
@@ -273,6 +306,74 @@ class TestTemperatureSensorManager:
             assert '28-test-02' in readings
             assert readings['28-test-01'].valid is True
 
+    @patch('app.temperature.os.system')
+    def test_read_all_triggers_bulk_conversion(self, mock_system, tmp_path):
+        """Should start one bus-wide conversion before reading the sensors."""
+        bulk_file = tmp_path / 'w1_bus_master1' / 'therm_bulk_read'
+        bulk_file.parent.mkdir()
+        bulk_file.write_text('0\n')
+        for sensor_id in ('28-test-01', '28-test-02'):
+            (tmp_path / sensor_id).mkdir()
+            (tmp_path / sensor_id / 'w1_slave').write_text("... YES\n... t=22500\n")
+
+        with patch('app.temperature.TEMP_W1_BASE_DIR', str(tmp_path)):
+            manager = TemperatureSensorManager(sensor_ids=['28-test-01', '28-test-02'])
+            readings = manager.read_all()
+
+        assert bulk_file.read_text() == 'trigger\n'
+        assert all(reading.valid for reading in readings.values())
+
+    @patch('app.temperature.os.system')
+    def test_read_all_single_sensor_skips_bulk_conversion(self, mock_system, tmp_path):
+        """Should not trigger a bulk conversion for a single sensor."""
+        bulk_file = tmp_path / 'w1_bus_master1' / 'therm_bulk_read'
+        bulk_file.parent.mkdir()
+        bulk_file.write_text('0\n')
+        (tmp_path / '28-test-01').mkdir()
+        (tmp_path / '28-test-01' / 'w1_slave').write_text("... YES\n... t=22500\n")
+
+        with patch('app.temperature.TEMP_W1_BASE_DIR', str(tmp_path)):
+            manager = TemperatureSensorManager(sensor_ids=['28-test-01'])
+            readings = manager.read_all()
+
+        assert bulk_file.read_text() == '0\n'
+        assert readings['28-test-01'].valid is True
+
+    @patch('app.temperature.os.system')
+    def test_read_all_without_bulk_conversion_reads_concurrently(self, mock_system, tmp_path):
+        """Should overlap per-sensor conversions when there is no therm_bulk_read."""
+        sensor_ids = ['28-test-01', '28-test-02', '28-test-03']
+
+        def slow_read(sensor):
+            time.sleep(0.2)
+            return TemperatureReading(
+                sensor_id=sensor.sensor_id, celsius=22.5, fahrenheit=72.5,
+                timestamp=time.time(), valid=True,
+            )
+
+        with patch('app.temperature.TEMP_W1_BASE_DIR', str(tmp_path)), \
+             patch.object(DS18B20Sensor, 'read_temperature', slow_read):
+            manager = TemperatureSensorManager(sensor_ids=sensor_ids)
+            start = time.monotonic()
+            readings = manager.read_all()
+            elapsed = time.monotonic() - start
+
+        assert list(readings) == sensor_ids
+        assert all(readings[sensor_id].sensor_id == sensor_id for sensor_id in sensor_ids)
+        assert elapsed < 0.5
+
+    @patch('app.temperature.os.system')
+    def test_read_all_reuses_read_pool(self, mock_system, tmp_path):
+        """Should keep one worker pool across polls instead of one per read_all()."""
+        with patch('app.temperature.TEMP_W1_BASE_DIR', str(tmp_path)):
+            manager = TemperatureSensorManager(sensor_ids=['28-test-01', '28-test-02'])
+            manager.read_all()
+            pool = manager._read_pool
+            manager.read_all()
+
+        assert pool is not None
+        assert manager._read_pool is pool
+
     @patch('app.temperature.os.system')
     def test_read_all_with_errors(self, mock_system):
         """Should handle errors when reading sensors."""